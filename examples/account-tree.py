@@ -27,6 +27,7 @@ from __future__ import absolute_import
 from __future__ import unicode_literals
 import sys
 from performline.client import Client
+from performline.embedded.stdlib.clients.rest.cache import MemoryCache
 
 COLORS = ['black', 'red', 'green', 'yellow', 'blue', 'purple', 'cyan', 'white']
 
@@ -51,13 +52,12 @@ def p(line, color=None, bold=False):
 
 try:
     try:
-        client = Client(sys.argv[1])
+        # traffic sources are shared by many items, so only fetch each one once
+        client = Client(sys.argv[1], cache=MemoryCache(ttl=600))
     except IndexError:
         c('Must specify a valid PerformLine API token as the first parameter.')
         sys.exit(1)
 
-    traffic_sources = dict()
-
     # iterate through all brands
     for brand in client.brands():
         c("Brand: {} (id: {})".format(brand.name, brand.id))
@@ -71,13 +71,7 @@ try:
                 ts_name = ''
 
                 try:
-                    ts_name = traffic_sources[item.traffic_source_id].name
-                except KeyError:
-                    try:
-                        traffic_sources[item.traffic_source_id] = item.traffic_source
-                        ts_name = item.traffic_source.name
-                    except:
-                        pass
+                    ts_name = item.traffic_source.name
                 except:
                     pass
 
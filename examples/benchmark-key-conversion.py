@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# Copyright (c) 2018, PerformLine, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+# * Neither the name of the company nor the
+# names of its contributors may be used to endorse or promote products
+# derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL PERFORMLINE, INC. BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+Measures the time taken to convert the keys of a typical API result between "PascalCase" and
+"snake_case" (as done for every model retrieved), with and without memoized key conversion.
+
+Usage: python examples/benchmark-key-conversion.py [ITERATIONS]
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import sys
+import timeit
+from performline.embedded.stdlib.utils import strings
+from performline.embedded.stdlib.utils.dicts import camelize_dict, underscore_dict
+
+ITEM = {
+    'Id': 12345,
+    'Type': 'web',
+    'BrandId': 7,
+    'CampaignId': 21,
+    'TrafficSourceId': 3,
+    'Score': 85,
+    'CreatedAt': '2020-01-01T00:00:00Z',
+    'LastScoredAt': '2020-01-02T00:00:00Z',
+    'Url': 'https://www.example.com/',
+    'RemediationStatus': 'open',
+    'Meta': {'PageTitle': 'Example', 'Tags': ['a', 'b']},
+    'Rules': [{'RuleId': 1, 'RuleName': 'Disclosure'}],
+}
+
+
+def convert():
+    camelize_dict(underscore_dict(ITEM), upperFirst=True)
+
+
+def measure(iterations):
+    strings._camelized.clear()
+    strings._underscored.clear()
+
+    return min(timeit.repeat(convert, number=iterations, repeat=3)) / iterations * 1e6
+
+
+if __name__ == '__main__':
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    size = strings.CONVERSION_CACHE_SIZE
+
+    try:
+        # a table that is emptied on every insertion never returns a cached conversion
+        strings.CONVERSION_CACHE_SIZE = 0
+        uncached = measure(iterations)
+    finally:
+        strings.CONVERSION_CACHE_SIZE = size
+
+    cached = measure(iterations)
+
+    print('uncached: {0:.1f} us/item'.format(uncached))
+    print('cached:   {0:.1f} us/item ({1:.1f}x)'.format(cached, uncached / cached))
@@ -0,0 +1,68 @@
+# Copyright (c) 2016, PerformLine, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the company nor the
+#       names of its contributors may be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL PERFORMLINE, INC. BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+An asyncio version of :class:`~performline.client.Client` (requires Python 3.6+ and the ``aiohttp``
+package).
+
+Example::
+
+    async with AsyncClient(token) as client:
+        brands = await client.brands()
+
+        async for item in client.iall(Item, params={'limit': 100}):
+            ...
+"""
+from __future__ import absolute_import
+from .client import Client
+from .embedded.stdlib.clients.rest.aio import AsyncRestClient
+from .products.common.aio import AsyncCommonClientMethods
+from .products.web.aio import AsyncWebClientMethods
+from .products.callcenter.aio import AsyncCallCenterClientMethods
+from .products.chatscout.aio import AsyncChatScoutClientMethods
+
+
+class AsyncClient(
+    AsyncChatScoutClientMethods,
+    AsyncCallCenterClientMethods,
+    AsyncWebClientMethods,
+    AsyncCommonClientMethods,
+    AsyncRestClient
+):
+    """
+    PerformLine API Client for use with ``asyncio``.
+
+    Accepts the same arguments as :class:`~performline.client.Client`, plus ``pool_maxsize`` (the
+    maximum number of connections shared by all concurrent requests).  Models are bound to an
+    underlying :class:`~performline.client.Client` (available as the ``client`` attribute), so
+    they behave exactly like those returned by the synchronous client.
+    """
+
+    def __init__(self, token, *args, **kwargs):
+        pool_maxsize = kwargs.pop('pool_maxsize', None)
+
+        super(AsyncClient, self).__init__(
+            Client(token, *args, **kwargs),
+            pool_maxsize=pool_maxsize
+        )
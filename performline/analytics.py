@@ -0,0 +1,595 @@
+# Copyright (c) 2016, PerformLine, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the company nor the
+#       names of its contributors may be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL PERFORMLINE, INC. BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+Aggregation of item scores.
+
+An :class:`ItemFrame` holds the identifying fields and score of a collection of items in typed
+arrays, and computes filters, group-bys, histograms and percentiles over them without creating
+a model per item.  NumPy is used when it is installed; otherwise, the same operations are
+performed over :mod:`array` columns in pure Python.
+
+Example::
+
+    frame = ItemFrame.from_client(client, params={'limit': 1000}, concurrency=4)
+
+    frame.buckets()                               # {'red': ..., 'yellow': ..., 'green': ...}
+    frame.group_by('campaign_id').mean()          # {campaign ID: mean score, ...}
+    frame.filter(brand=11, max_score=30).ids()
+"""
+from __future__ import absolute_import
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+import math
+from six import moves
+from .products.common.models import Item
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+MISSING = -1
+"""int: The value of ID columns for items that do not have that ID."""
+
+NAN = float('nan')
+
+PAGE_SIZE = 1000
+"""int: The number of items requested per page by :func:`ItemFrame.from_client`, unless a
+``limit`` is given."""
+
+# column name, result key, array typecode
+FIELDS = (
+    ('id', 'Id', 'q'),
+    ('brand_id', 'BrandId', 'q'),
+    ('campaign_id', 'CampaignId', 'q'),
+    ('traffic_source_id', 'TrafficSourceId', 'q'),
+    ('score', 'Score', 'd'),
+)
+
+DTYPES = {
+    'q': 'int64',
+    'd': 'float64',
+    'h': 'int16',
+}
+
+COLUMNS = tuple(name for name, _, _ in FIELDS) + ('type',)
+
+
+class ItemFrame(object):
+    """
+    A column-oriented collection of items.
+
+    Args:
+        columns (dict): Maps each of :data:`COLUMNS` to a sequence of values.  ID columns hold
+            integers (:data:`MISSING` where absent), ``score`` holds floats (``nan`` for unscored
+            items) and ``type`` holds indices into ``types``.  Columns are converted to NumPy
+            arrays (when available) without copying.
+
+        types (list): The distinct item types.
+    """
+
+    def __init__(self, columns, types):
+        self.types = list(types)
+        self.columns = {}
+
+        for name, typecode in _typecodes():
+            values = columns[name]
+
+            if numpy is not None:
+                values = numpy.asarray(values, dtype=DTYPES[typecode])
+            elif not isinstance(values, array):
+                values = array(typecode, values)
+
+            self.columns[name] = values
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Builds a frame from models, compact models or result dicts.
+
+        Args:
+            records (iterable): The items.
+
+        Returns:
+            :class:`ItemFrame`
+        """
+        builders = dict((name, array(typecode)) for name, typecode in _typecodes())
+        types = []
+        type_codes = {}
+
+        for record in records:
+            if isinstance(record, dict):
+                values = [record.get(key, record.get(name)) for name, key, _ in FIELDS]
+                item_type = record.get('Type', record.get('type'))
+            else:
+                values = [getattr(record, name) for name, _, _ in FIELDS]
+                item_type = record.type
+
+            for (name, _, typecode), value in zip(FIELDS, values):
+                if typecode == 'd':
+                    builders[name].append(NAN if value is None else float(value))
+                else:
+                    builders[name].append(MISSING if value is None else int(value))
+
+            code = type_codes.get(item_type)
+
+            if code is None:
+                code = type_codes[item_type] = len(types)
+                types.append(item_type)
+
+            builders['type'].append(code)
+
+        return cls(builders, types)
+
+    @classmethod
+    def from_client(cls, client, model=Item, params=None, **kwargs):
+        """
+        Builds a frame from every instance of an item model, read as compact models.
+
+        Args:
+            client (:class:`~performline.client.Client`): The client used to perform requests.
+
+            model (type): :class:`~performline.products.common.models.Item` or one of its
+                subclasses.
+
+            params (dict, optional): Query string parameters for the listing.  Pages of
+                :data:`PAGE_SIZE` items are requested unless a ``limit`` is given.
+
+            **kwargs: Passed to :func:`~performline.clients.rest.models.RestModel.iall`.  Every
+                page is read unless ``max_iterations`` is given.
+
+        Returns:
+            :class:`ItemFrame`
+        """
+        params = dict(params or {})
+        params.setdefault('limit', PAGE_SIZE)
+        kwargs.setdefault('max_iterations', None)
+
+        return cls.from_records(model.iall(client, compact=True, params=params, **kwargs))
+
+    def __len__(self):
+        return len(self.columns['id'])
+
+    def column(self, name):
+        """
+        Returns one of the :data:`COLUMNS`.
+        """
+        return self.columns[name]
+
+    def ids(self):
+        """
+        Returns the IDs of the items in this frame.
+
+        Returns:
+            list of int
+        """
+        return [int(i) for i in self.columns['id']]
+
+    def type_names(self):
+        """
+        Returns the type of each item in this frame.
+
+        Returns:
+            list
+        """
+        return [self.types[code] for code in self.columns['type']]
+
+    def select(self, mask):
+        """
+        Returns a frame containing only the items for which ``mask`` is true.
+
+        Args:
+            mask (sequence of bool): One value per item.
+
+        Returns:
+            :class:`ItemFrame`
+        """
+        if numpy is not None:
+            mask = numpy.asarray(mask, dtype=bool)
+            columns = dict((name, values[mask]) for name, values in self.columns.items())
+        else:
+            columns = dict(
+                (name, array(values.typecode, (v for v, m in zip(values, mask) if m)))
+                for name, values in self.columns.items()
+            )
+
+        return ItemFrame(columns, self.types)
+
+    def filter(
+        self,
+        brand=None,
+        campaign=None,
+        traffic_source=None,
+        type=None,
+        min_score=None,
+        max_score=None,
+        scored=None
+    ):
+        """
+        Returns a frame containing only the items matching all of the given criteria.
+
+        Args:
+            brand (int, optional): A brand ID.
+
+            campaign (int, optional): A campaign ID.
+
+            traffic_source (int, optional): A traffic source ID.
+
+            type (str, optional): An item type.
+
+            min_score (float, optional): The lowest score (inclusive).
+
+            max_score (float, optional): The highest score (inclusive).
+
+            scored (bool, optional): Whether to select only items that do (or do not) have a
+                score.
+
+        Returns:
+            :class:`ItemFrame`
+        """
+        conditions = []
+
+        for column, value in (('brand_id', brand),
+                              ('campaign_id', campaign),
+                              ('traffic_source_id', traffic_source)):
+            if value is not None:
+                conditions.append((column, lambda v, value=value: v == value))
+
+        if type is not None:
+            code = self.types.index(type) if type in self.types else MISSING
+            conditions.append(('type', lambda v: v == code))
+
+        if min_score is not None:
+            conditions.append(('score', lambda v: v >= min_score))
+
+        if max_score is not None:
+            conditions.append(('score', lambda v: v <= max_score))
+
+        if scored is not None:
+            conditions.append(('score', lambda v: _isnan(v) != scored))
+
+        if numpy is not None:
+            mask = numpy.ones(len(self), dtype=bool)
+
+            for column, test in conditions:
+                mask &= test(self.columns[column])
+        else:
+            mask = [True] * len(self)
+
+            for column, test in conditions:
+                mask = [m and test(v) for m, v in zip(mask, self.columns[column])]
+
+        return self.select(mask)
+
+    def scores(self):
+        """
+        Returns the scores of the scored items in this frame.
+
+        Returns:
+            ``numpy.ndarray`` or list of float
+        """
+        scores = self.columns['score']
+
+        if numpy is not None:
+            return scores[~numpy.isnan(scores)]
+
+        return [s for s in scores if not math.isnan(s)]
+
+    def count(self):
+        """
+        Returns the number of scored items.
+        """
+        return len(self.scores())
+
+    def mean(self):
+        """
+        Returns the mean score of the scored items, or `None` if there are none.
+        """
+        scores = self.scores()
+
+        if len(scores) == 0:
+            return None
+
+        if numpy is not None:
+            return float(scores.mean())
+
+        return float(sum(scores)) / len(scores)
+
+    def percentile(self, q):
+        """
+        Returns the ``q``-th percentile(s) of the scores of the scored items, interpolating
+        linearly between them.
+
+        Args:
+            q (float, list): The percentile(s) to compute, between 0 and 100.
+
+        Returns:
+            float or list of float (`None` if there are no scored items)
+        """
+        scores = self.scores()
+        single = not isinstance(q, (list, tuple))
+        qs = [q] if single else list(q)
+
+        if len(scores) == 0:
+            rv = [None] * len(qs)
+        elif numpy is not None:
+            rv = [float(v) for v in numpy.percentile(scores, qs)]
+        else:
+            ordered = sorted(scores)
+            rv = [_interpolate(ordered, p) for p in qs]
+
+        return rv[0] if single else rv
+
+    def histogram(self, bins=10, range=(0, 100)):
+        """
+        Counts the scored items in equal-width score ranges.  Each range includes its lower
+        bound; the last also includes its upper bound.  Scores outside ``range`` are ignored.
+
+        Args:
+            bins (int): The number of ranges.
+
+            range (tuple): The lowest and highest score covered.
+
+        Returns:
+            tuple of (list of counts, list of ``bins + 1`` range edges)
+        """
+        low, high = range
+        edges = [low + (high - low) * float(i) / bins for i in moves.range(bins + 1)]
+        scores = self.scores()
+
+        if numpy is not None:
+            counts, _ = numpy.histogram(scores, bins=bins, range=(low, high))
+            return ([int(c) for c in counts], edges)
+
+        counts = [0] * bins
+
+        for score in scores:
+            if low <= score <= high:
+                index = min(int((score - low) / (high - low) * bins), bins - 1)
+                counts[index] += 1
+
+        return (counts, edges)
+
+    def buckets(self, thresholds=(30, 70), labels=('red', 'yellow', 'green')):
+        """
+        Counts the scored items in each of a number of score ranges.  An item falls into the
+        first range whose threshold its score does not exceed, or into the last range if it
+        exceeds all of them.
+
+        Args:
+            thresholds (tuple): The upper bounds (inclusive) of all but the last range.
+
+            labels (tuple): The names of the ranges; one more than there are thresholds.
+
+        Returns:
+            OrderedDict mapping each label to a count.
+        """
+        if len(labels) != len(thresholds) + 1:
+            raise ValueError('There must be one more label than there are thresholds')
+
+        scores = self.scores()
+
+        if numpy is not None:
+            counts = numpy.bincount(
+                numpy.searchsorted(numpy.asarray(thresholds, dtype=float), scores, side='left'),
+                minlength=len(labels)
+            )
+        else:
+            counts = [0] * len(labels)
+
+            for score in scores:
+                counts[bisect_left(thresholds, score)] += 1
+
+        return OrderedDict((label, int(count)) for label, count in zip(labels, counts))
+
+    def group_by(self, column):
+        """
+        Groups the items by the value of a column.
+
+        Args:
+            column (str): ``brand_id``, ``campaign_id``, ``traffic_source_id`` or ``type``.
+
+        Returns:
+            :class:`GroupBy`
+        """
+        if column not in ('brand_id', 'campaign_id', 'traffic_source_id', 'type'):
+            raise ValueError('Cannot group by {0!r}'.format(column))
+
+        return GroupBy(self, column)
+
+    def to_pandas(self):
+        """
+        Returns this frame as a ``pandas.DataFrame`` with a categorical ``type`` column.
+
+        Returns:
+            ``pandas.DataFrame``
+        """
+        import pandas
+
+        data = OrderedDict((name, self.columns[name]) for name, _, _ in FIELDS)
+        data['type'] = pandas.Categorical.from_codes(self.columns['type'], self.types)
+
+        return pandas.DataFrame(data)
+
+
+class GroupBy(object):
+    """
+    The items of an :class:`ItemFrame` grouped by the value of a column.  Each aggregate returns
+    an OrderedDict mapping each group's key (in ascending order; `None` for items without a
+    value) to the aggregate of the scores of its scored items (`None` for groups with none).
+    """
+
+    def __init__(self, frame, column):
+        self.frame = frame
+        self.column = column
+
+        if numpy is not None:
+            codes, self.inverse = numpy.unique(frame.columns[column], return_inverse=True)
+            self.inverse = self.inverse.reshape(-1)
+            self.scores = frame.columns['score']
+            self.scored = ~numpy.isnan(self.scores)
+        else:
+            codes = sorted(set(frame.columns[column]))
+            index = dict((code, i) for i, code in enumerate(codes))
+            self.inverse = [index[code] for code in frame.columns[column]]
+
+        self.keys = [self._key(code) for code in codes]
+
+    def _key(self, code):
+        code = int(code)
+
+        if self.column == 'type':
+            return self.frame.types[code]
+
+        return None if code == MISSING else code
+
+    def _result(self, values):
+        return OrderedDict(zip(self.keys, values))
+
+    def _groups(self):
+        # pure Python: the scores of each group's scored items
+        groups = [[] for _ in self.keys]
+
+        for i, score in zip(self.inverse, self.frame.columns['score']):
+            if not math.isnan(score):
+                groups[i].append(score)
+
+        return groups
+
+    def size(self):
+        """
+        Returns the number of items (scored or not) in each group.
+        """
+        if numpy is not None:
+            return self._result(
+                int(c) for c in numpy.bincount(self.inverse, minlength=len(self.keys))
+            )
+
+        counts = [0] * len(self.keys)
+
+        for i in self.inverse:
+            counts[i] += 1
+
+        return self._result(counts)
+
+    def count(self):
+        """
+        Returns the number of scored items in each group.
+        """
+        if numpy is not None:
+            return self._result(int(c) for c in self._bincount())
+
+        return self._result(len(g) for g in self._groups())
+
+    def sum(self):
+        """
+        Returns the sum of the scores in each group.
+        """
+        if numpy is not None:
+            return self._result(float(s) for s in self._bincount(self.scores))
+
+        return self._result(float(sum(g)) for g in self._groups())
+
+    def mean(self):
+        """
+        Returns the mean score of each group.
+        """
+        if numpy is not None:
+            counts = self._bincount()
+            sums = self._bincount(self.scores)
+
+            return self._result(
+                float(s) / c if c else None for s, c in zip(sums, counts)
+            )
+
+        return self._result(float(sum(g)) / len(g) if g else None for g in self._groups())
+
+    def min(self):
+        """
+        Returns the lowest score in each group.
+        """
+        return self._extreme(first=True)
+
+    def max(self):
+        """
+        Returns the highest score in each group.
+        """
+        return self._extreme(first=False)
+
+    def _bincount(self, weights=None):
+        if weights is not None:
+            weights = weights[self.scored]
+
+        return numpy.bincount(
+            self.inverse[self.scored],
+            weights=weights,
+            minlength=len(self.keys)
+        )
+
+    def _extreme(self, first):
+        if numpy is None:
+            fn = min if first else max
+            return self._result(fn(g) if g else None for g in self._groups())
+
+        groups = self.inverse[self.scored]
+        scores = self.scores[self.scored]
+        values = [None] * len(self.keys)
+
+        if len(groups):
+            # sort by group, then score; the extremes are at the edges of each group's run
+            order = numpy.lexsort((scores, groups))
+            groups = groups[order]
+            scores = scores[order]
+            edges = numpy.flatnonzero(groups[1:] != groups[:-1])
+
+            if first:
+                positions = numpy.concatenate(([0], edges + 1))
+            else:
+                positions = numpy.concatenate((edges, [len(groups) - 1]))
+
+            for group, score in zip(groups[positions], scores[positions]):
+                values[int(group)] = float(score)
+
+        return self._result(values)
+
+
+def _typecodes():
+    return [(name, typecode) for name, _, typecode in FIELDS] + [('type', 'h')]
+
+
+def _isnan(value):
+    if numpy is not None:
+        return numpy.isnan(value)
+
+    return math.isnan(value)
+
+
+def _interpolate(ordered, q):
+    position = (len(ordered) - 1) * float(q) / 100.0
+    lower = int(math.floor(position))
+    upper = min(lower + 1, len(ordered) - 1)
+
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
@@ -29,6 +29,7 @@ from .embedded.stdlib.clients.rest.exceptions import ErrorResponse
 from .cliutils import errout
 from .products.common.cli.brands import brands
 from .products.common.cli.campaigns import campaigns
+from .products.common.cli.metrics import metrics
 from .products.common.cli.rules import rules
 from .products.common.cli.remediation_statuses import remediation_statuses
 from .products.common.cli.trafficsources import sources
@@ -37,7 +38,7 @@ from .products.web.cli.pages import pages
 from .products.callcenter.cli.calls import calls
 from .products.chatscout.cli.chats import chats
 import click
-import os
+
 
 class State(object):
     def __init__(self, context, options={}):
@@ -114,13 +115,13 @@ def main(ctx,
         'loglevel': log_level,
         'format': format,
     })
-    os.environ["API_KEY"] = api_key
 
 
 main.add_command(brands)
 main.add_command(calls)
 main.add_command(campaigns)
 main.add_command(chats)
+main.add_command(metrics)
 main.add_command(pages)
 main.add_command(rules)
 main.add_command(sources)
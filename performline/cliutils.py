@@ -26,9 +26,9 @@
 from __future__ import absolute_import
 import click
 import sys
-import json
 import yaml
 from inspect import isgeneratorfunction, isgenerator
+from .embedded.stdlib.utils.json import jsonify
 
 
 def normalize(data):
@@ -62,7 +62,7 @@ def out(state, data=None):
         return
 
     if state.fmt == 'json':
-        rv = json.dumps(data, indent=4)
+        rv = jsonify(data, indent=2)
     elif state.fmt == 'yaml':
         rv = yaml.safe_dump(data, default_flow_style=False)
     else:
@@ -9,18 +9,26 @@ import requests_mock
 import requests.exceptions
 import time
 import re
+from contextlib import contextmanager
 from datetime import datetime
 import yaml
 import uuid
 from .responses import SuccessResponse
 from .exceptions import ErrorResponse, AuthenticationFailed, NotFound, ServiceUnavailable, \
     DeprecatedEndpoint, BadGateway, TooManyIterations
+from .retry import RetryPolicy, error_status
+from .hooks import RequestEvent, PagesEvent, current_pages, pages_scope
+from .loader import Loader
+from .metrics import RequestMetrics
+from .timing import PhaseTimer, TimedHTTPAdapter, pop_connect_time
 from .utils import autopage_fn
 from ...utils.json import jsonify
+from ...utils.threading import imap_bounded
 from ...utils import stats
 
 
 ALLOWED_METHODS = ['get', 'post', 'put', 'delete', 'options', 'head']
+SAFE_METHODS = ('get', 'options', 'head')
 RX_TRIM_SLASH = re.compile('(?:^/*|/*$)')
 
 
@@ -32,6 +40,7 @@ class RequestContext(object):
         self.data = data
         self.params = params
         self.headers = headers
+        self.event = None
 
 
 class StandardRestClient(object):
@@ -60,6 +69,55 @@ class StandardRestClient(object):
         params (dict): A dictionary of query string parameters that should
         be included in every request.  For example, `{'format': 'json'}` (
         which would include '?format=json' in the request URLs).
+
+        page_concurrency (int): The default number of pages that
+        :func:`request_until` will fetch in parallel once the size of a
+        paginated result set is known.  A value of 1 fetches pages one at a
+        time.
+
+        session (:class:`requests.Session`): The session used to perform all
+        requests.  If not given, one is created with :func:`make_session`.
+
+        pool_connections (int): The number of per-host connection pools the
+        default session will cache.
+
+        pool_maxsize (int): The maximum number of connections the default
+        session will keep open to a single host.  This is raised to at least
+        ``page_concurrency`` so that parallel page fetches can all reuse
+        connections.
+
+        pool_block (bool): Whether requests should wait for a free
+        connection when ``pool_maxsize`` connections are already in use,
+        rather than opening (and then discarding) an additional one.
+
+        keep_alive (bool): Whether connections in the default session should
+        be kept open and reused between requests.
+
+        retry_policy (:class:`~performline.clients.rest.retry.RetryPolicy`):
+        Determines which failed requests are attempted again, and when.  By
+        default, idempotent requests failing with a 429 or 5xx response (or
+        failing to connect) are attempted up to 3 times.  Use
+        ``RetryPolicy(max_attempts=1)`` to disable retries.
+
+        rate_limiter (:class:`~performline.utils.threading.TokenBucket`):
+        If given, every request (including each page of a paginated request
+        and each retry) waits for a token from this limiter before being
+        sent.  A single limiter may be shared by several clients, threads,
+        and (if created before forking) processes.
+
+        cache (:class:`~performline.clients.rest.cache.ResponseCache`): If
+        given, successful GET responses are stored in (and served from) this
+        cache.
+
+        metrics (:class:`~performline.clients.rest.metrics.RequestMetrics`):
+        Where the latency of every request is recorded (see
+        :func:`metrics_snapshot`).  If not given, each client creates its
+        own; `False` disables recording.
+
+        hooks (:class:`~performline.clients.rest.hooks.RequestHooks`): If
+        given, is called before and after every attempt of every request,
+        and around every paginated result set (see
+        :mod:`~performline.clients.rest.hooks`).
     """
 
     url = None
@@ -70,6 +128,17 @@ class StandardRestClient(object):
     implemented_by = None
     request_options = {}
     session = None
+    page_concurrency = 1
+    pool_connections = 10
+    pool_maxsize = 10
+    pool_block = False
+    keep_alive = True
+    retry_policy = RetryPolicy()
+    rate_limiter = None
+    cache = None
+    metrics = None
+    hooks = None
+    loader = None
     models = dict()
 
     def __init__(
@@ -82,7 +151,17 @@ class StandardRestClient(object):
         headers=None,
         implemented_by=None,
         session=None,
-        request_options={}
+        request_options={},
+        page_concurrency=None,
+        pool_connections=None,
+        pool_maxsize=None,
+        pool_block=None,
+        keep_alive=None,
+        retry_policy=None,
+        rate_limiter=None,
+        cache=None,
+        metrics=None,
+        hooks=None
     ):
         # check and set the various kwargs
         for p in [
@@ -94,6 +173,16 @@ class StandardRestClient(object):
             'implemented_by',
             'session',
             'request_options',
+            'page_concurrency',
+            'pool_connections',
+            'pool_maxsize',
+            'pool_block',
+            'keep_alive',
+            'retry_policy',
+            'rate_limiter',
+            'cache',
+            'metrics',
+            'hooks',
         ]:
             value = locals().get(p)
             if value is not None:
@@ -115,10 +204,70 @@ class StandardRestClient(object):
         # setup empty mock flagset
         self._mock_flags = {}
 
+        # all requests share a single pool of persistent connections
+        if self.session is None:
+            self.session = self.make_session()
+
+        if self.metrics is None:
+            self.metrics = RequestMetrics()
+
         # disables the warnings requests emits, which ARE for our own good, but if we make the
         # decision to do something stupid, we'll own that and don't need to pollute the logs.
         requests.packages.urllib3.disable_warnings()
 
+    def make_session(self):
+        """
+        Creates the :class:`requests.Session` used by this client when one was not provided,
+        configured to pool and reuse connections according to this instance's ``pool_*`` and
+        ``keep_alive`` settings.
+
+        Returns:
+            :class:`requests.Session`
+        """
+        session = requests.Session()
+        adapter = TimedHTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=max(self.pool_maxsize, self.page_concurrency or 1),
+            pool_block=self.pool_block
+        )
+
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+
+        return session
+
+    @contextmanager
+    def batch_loading(self, concurrency=None):
+        """
+        A context manager within which related objects (see
+        :func:`~performline.clients.rest.models.RestModel.related`) are retrieved lazily and in
+        batches by a :class:`~performline.clients.rest.loader.Loader`, rather than one request at
+        a time as they are accessed.
+
+        Example::
+
+            with client.batch_loading():
+                for item in client.items():
+                    print(item.campaign.name)   # one request per distinct campaign
+
+        Args:
+            concurrency (int, optional): The maximum number of simultaneous requests per batch.
+                Defaults to ``pool_maxsize``.
+
+        Yields:
+            :class:`~performline.clients.rest.loader.Loader`
+        """
+        previous = self.loader
+        self.loader = Loader(self, concurrency=concurrency)
+
+        try:
+            yield self.loader
+        finally:
+            self.loader = previous
+
     def request(
         self,
         method,
@@ -167,12 +316,340 @@ class StandardRestClient(object):
             :class:`~performline.clients.rest.exceptions.DeprecatedEndpoint`
         """
 
+        context = self._prepare_request(
+            method,
+            path,
+            data=data,
+            params=params,
+            headers=headers,
+            encoder=encoder,
+            content_type=content_type,
+            **kwargs
+        )
+
+        cache_key, cached, fresh = self._cache_lookup(context)
+
+        if fresh:
+            return cached
+
+        attempt = 1
+
+        while True:
+            try:
+                response = self._send(context, attempt)
+
+                if self._drop_validators(context, cache_key, cached, response):
+                    response = self._send(context, attempt)
+
+                return self._cache_store(cache_key, cached, response)
+            except ErrorResponse as e:
+                # retrying re-sends only this request; callers paging through a result set
+                # continue from the same offset
+                if self.retry_policy is None or \
+                        not self.retry_policy.should_retry(context.method, attempt, e):
+                    self._record_error(context, e)
+                    raise
+
+                delay = self.retry_policy.get_delay(attempt, e)
+                self._record_retry(context, attempt, e, delay)
+                time.sleep(delay)
+                attempt += 1
+            except Exception as e:
+                self._record_error(context, e)
+                raise
+
+    def _send(self, context, attempt=1):
+        """
+        Performs a single attempt of the request described by ``context``.
+        """
+        if self.rate_limiter is not None:
+            self._record_throttle(context, self.rate_limiter.acquire())
+
+        event = self._begin_attempt(context, attempt)
+        response = None
+
+        # the body is read separately (unless the caller streams it) so that waiting for the
+        # response and downloading it are timed as separate phases
+        options = dict(context.options)
+        stream = options.get('stream')
+        options['stream'] = True
+        phases = PhaseTimer('performline.clients.rest.request', context.stat_tags)
+        pop_connect_time()
+
+        try:
+            stats.increment('performline.clients.rest.request', tags=context.stat_tags)
+
+            with stats.time('performline.clients.rest.request.time', tags=context.stat_tags):
+                requestor = (self.session or requests)
+
+                try:
+                    response = getattr(requestor, context.method)(
+                        context.url,
+                        data=context.data,
+                        params=context.params,
+                        headers=context.headers,
+                        **options
+                    )
+
+                    phases.mark('ttfb')
+
+                    if not stream:
+                        response.content
+                        phases.mark('download')
+                finally:
+                    connect = pop_connect_time()
+
+                    if connect:
+                        phases.add('connect', connect)
+
+                        if 'ttfb' in phases.phases:
+                            phases.add('ttfb', -connect)
+
+                    phases.report()
+                    self._record_attempt(
+                        context,
+                        response.status_code if response is not None else None,
+                        phases
+                    )
+
+        except requests.exceptions.SSLError as e:
+            stats.increment('performline.clients.rest.error_ssl', tags=context.stat_tags)
+
+            if event is not None:
+                event.finish(phases=phases, error=e)
+
+            raise
+        except requests.exceptions.ConnectionError as e:
+            stats.increment('performline.clients.rest.error_on_connect', tags=context.stat_tags)
+            error = BadGateway(
+                message="Failed to connect to {}: {}".format(
+                    e.request.url,
+                    str(e)
+                ),
+                exception=e
+            )
+
+            if event is not None:
+                event.finish(phases=phases, error=error)
+
+            raise error
+
+        self._cache_invalidate(context)
+
+        if event is None:
+            return self._process_response(context, response)
+
+        try:
+            rv = self._process_response(context, response)
+        except Exception as e:
+            event.finish(response, phases, error=e, response_bytes=_body_length(response, stream))
+            raise
+
+        event.finish(response, phases, response_bytes=_body_length(response, stream))
+        self.hooks.after_response(event)
+
+        return rv
+
+    def _record_attempt(self, context, status, phases):
+        """
+        Records the duration of an attempt of the request described by ``context`` (which
+        received a response with the given status, or `None`) in ``metrics``.
+        """
+        if self.metrics:
+            self.metrics.record(
+                context.method,
+                context.path,
+                status,
+                phases.elapsed(),
+                phases.phases
+            )
+
+    def metrics_snapshot(self):
+        """
+        Returns the latency percentiles, request rates, and retry counts of every request made
+        by this client so far, or `None` if ``metrics`` is disabled.  See:
+        :func:`~performline.clients.rest.metrics.RequestMetrics.snapshot`.
+
+        Returns:
+            dict
+        """
+        if not self.metrics:
+            return None
+
+        return self.metrics.snapshot()
+
+    def _begin_attempt(self, context, attempt):
+        """
+        Creates the :class:`~performline.clients.rest.hooks.RequestEvent` describing an attempt
+        of the request described by ``context`` and passes it to the ``before_request`` hook, or
+        returns `None` if no hooks are configured.
+        """
+        if self.hooks is None:
+            return None
+
+        event = context.event = RequestEvent(context, attempt, parent=current_pages())
+        self.hooks.before_request(event)
+
+        return event
+
+    def _cache_lookup(self, context):
+        """
+        Looks up the response to the request described by ``context`` in the cache, returning a
+        tuple of the cache key (or `None` if the request cannot be cached), the cached response
+        (or `None`), and whether that response is still valid.
+
+        If a response was found that has expired but can be revalidated, conditional request
+        headers are added to (a copy of) the headers of ``context``.
+        """
+        if self.cache is None or context.method != 'get' or context.options.get('stream'):
+            return (None, None, False)
+
+        key = self.cache.make_key(context.method, context.url, context.params, context.headers)
+        cached, fresh = self.cache.lookup(key)
+
+        if fresh:
+            cached.from_cache = True
+            stats.increment('performline.clients.rest.cache.hit', tags=context.stat_tags)
+        else:
+            stats.increment('performline.clients.rest.cache.miss', tags=context.stat_tags)
+
+            if cached is not None:
+                headers = dict(context.headers)
+
+                if cached.etag is not None:
+                    headers['If-None-Match'] = cached.etag
+
+                if cached.last_modified is not None:
+                    headers['If-Modified-Since'] = cached.last_modified
+
+                context.headers = headers
+
+        return (key, cached, fresh)
+
+    def _cache_invalidate(self, context):
+        """
+        Removes the cached responses that the request described by ``context`` may have made
+        stale: if it used an unsafe method, those for its URL and for the URL of the list
+        containing it (e.g.: ``/common/brands/`` for ``/common/brands/1/``).
+        """
+        if self.cache is None or context.method in SAFE_METHODS:
+            return
+
+        url = context.url.rstrip('/')
+
+        self.cache.invalidate(url)
+        self.cache.invalidate(url.rsplit('/', 1)[0])
+
+    def _drop_validators(self, context, key, cached, response):
+        """
+        Returns whether a cacheable request must be sent again because the server answered it
+        with a 304 response although there is no cached response to reuse (e.g.: when the
+        caller supplied its own conditional headers), removing those headers from ``context``.
+        """
+        if key is None or cached is not None or not _is_not_modified(response):
+            return False
+
+        context.headers = dict(
+            (k, v) for k, v in context.headers.items()
+            if k.lower() not in ('if-none-match', 'if-modified-since')
+        )
+
+        return True
+
+    def _cache_store(self, key, cached, response):
+        """
+        Stores a response under a key returned by :func:`_cache_lookup`, returning the response
+        that should be given to the caller.  If the server indicated that the ``cached`` response
+        has not been modified, that response (and its already-decoded payload) is reused.
+        """
+        if key is None:
+            return response
+
+        if _is_not_modified(response):
+            # a 304 only means something alongside the response it refers to
+            if cached is not None:
+                stats.increment('performline.clients.rest.cache.revalidated')
+                self.cache.refresh(key, cached)
+                return cached.revalidated()
+
+            return response
+
+        self.cache.set(key, response)
+        return response
+
+    def _record_throttle(self, context, wait):
+        """
+        Reports the time the request described by ``context`` spent waiting on the rate limiter.
+        """
+        if wait > 0:
+            stats.timing('performline.clients.rest.throttle.time',
+                         wait * 1000.0,
+                         tags=context.stat_tags)
+
+    def _record_retry(self, context, attempt, error, delay):
+        """
+        Reports that the request described by ``context`` failed and is about to be retried.
+        """
+        stat_tags = dict(context.stat_tags)
+        stat_tags['status'] = error_status(error) or 'connect'
+
+        stats.increment('performline.clients.rest.retry', tags=stat_tags)
+
+        if self.metrics:
+            self.metrics.record_retry(context.method, context.path, error_status(error))
+
+        logging.info('Retrying {0} {1} (attempt {2} failed, waiting {3:.2f}s)'.format(
+            context.method.upper(),
+            context.url,
+            attempt,
+            delay
+        ))
+
+        if self.hooks is not None and context.event is not None:
+            context.event.delay = delay
+            self.hooks.on_retry(context.event)
+
+    def _record_error(self, context, error):
+        """
+        Reports that the request described by ``context`` failed and will not be retried.
+        """
+        event = context.event
+
+        if self.hooks is not None and event is not None:
+            if event.elapsed_ms is None:
+                event.finish(error=error)
+
+            if event.error is not None:
+                self.hooks.on_error(event)
+
+    def _prepare_request(
+        self,
+        method,
+        path,
+        data=None,
+        params={},
+        headers={},
+        encoder='json',
+        content_type=None,
+        **kwargs
+    ):
+        """
+        Validates and merges the arguments to :func:`request` with this client's defaults, returning
+        a :class:`RequestContext` describing the HTTP call to make.  This is independent of the
+        library that performs the call, and is shared with
+        :class:`~performline.clients.rest.aio.AsyncRestClient`.
+        """
+
         if not method.lower() in ALLOWED_METHODS:
             raise Exception('Invalid request method {0}'.format(method))
 
         # normalize the given path
         path = path.strip('/')
 
+        # the caller's dicts (often a shared default argument) must not be modified
+        params = dict(params or {})
+        headers = dict(headers or {})
+
         # set content type
         if self.content_type is not None:
             headers['Content-Type'] = self.content_type
@@ -222,33 +699,21 @@ class StandardRestClient(object):
         if self.implemented_by is not None:
             stat_tags['implemented_by'] = str(self.implemented_by)
 
-        # perform the request
-        try:
-            stats.increment('performline.clients.rest.request', tags=stat_tags)
-
-            with stats.time('performline.clients.rest.request.time', tags=stat_tags):
-                requestor = (self.session or requests)
+        context = RequestContext(self, method.lower(), path, data, params, headers)
+        context.url = self.make_url(path)
+        context.options = kwargs
+        context.stat_tags = stat_tags
 
-                response = getattr(requestor, method.lower())(
-                    self.make_url(path),
-                    data=data,
-                    params=params,
-                    headers=headers,
-                    **kwargs
-                )
+        return context
 
-        except requests.exceptions.SSLError:
-            stats.increment('performline.clients.rest.error_ssl', tags=stat_tags)
-            raise
-        except requests.exceptions.ConnectionError as e:
-            stats.increment('performline.clients.rest.error_on_connect', tags=stat_tags)
-            raise BadGateway(
-                message="Failed to connect to {}: {}".format(
-                    e.request.url,
-                    str(e)
-                ),
-                exception=e
-            )
+    def _process_response(self, context, response):
+        """
+        Inspects the :class:`requests.Response` for the request described by ``context``, returning
+        a :class:`~performline.clients.rest.responses.SuccessResponse` or raising the appropriate
+        :class:`~performline.clients.rest.exceptions.ErrorResponse`.
+        """
+        path = context.path
+        stat_tags = dict(context.stat_tags)
 
         # check for endpoint deprecation, and raise an error if the endpoint cutoff date is
         # in the past.
@@ -269,15 +734,12 @@ class StandardRestClient(object):
 
         if response.status_code < 400:
             stats.increment('performline.clients.rest.success', tags=stat_tags)
-            response_body = None
 
-            if len(response.content) > 0:
-                try:
-                    response_body = response.json()
-                except ValueError:
-                    pass
+            # the body is decoded when (and if) it is first needed
+            rv = SuccessResponse(response)
+            rv.stat_tags = context.stat_tags
 
-            return SuccessResponse(response, response_body)
+            return rv
         else:
             stats.increment('performline.clients.rest.error', tags=stat_tags)
 
@@ -335,7 +797,20 @@ class StandardRestClient(object):
         """
         return self.request('head', *args, **kwargs)
 
-    def request_until(
+    def request_until(self, *args, **kwargs):
+        """
+        Perform an HTTP request repeatedly until a given function returns true, returning all of
+        the responses as a list.
+
+        Args:
+            See: :func:`iter_until`
+
+        Returns:
+            list of :class:`~performline.clients.rest.responses.SuccessResponse`
+        """
+        return list(self.iter_until(*args, **kwargs))
+
+    def iter_until(
         self,
         method,
         path,
@@ -346,10 +821,13 @@ class StandardRestClient(object):
         testfn=autopage_fn,
         request_delay_ms=0,
         max_iterations=25,
+        concurrency=None,
         **kwargs
     ):
         """
-        Perform an HTTP request repeatedly until a given function returns true.
+        Perform an HTTP request repeatedly until a given function returns true, yielding each
+        response as soon as it arrives.  Responses are not retained once they have been yielded,
+        so arbitrarily large result sets can be processed in constant memory.
 
         Args:
             See: :func:`request`
@@ -362,18 +840,68 @@ class StandardRestClient(object):
                 - ``context`` (:class:`RequestContext`) is an editable request context that can
                     be used for modifying the request details for subsequent calls.
 
-                The function should return a truthy value when request processing should stop.z
+                The function should return a truthy value when request processing should stop.
 
             request_delay_ms (int): The number of milliseconds to wait between successive requests
-                if ``testfn`` has not evaluated to True.
+                if ``testfn`` has not evaluated to True.  Deprecated: configure a ``rate_limiter``
+                on the client instead, which only waits when requests are actually being made too
+                quickly and is coordinated between concurrent callers.
 
             max_iterations (int): If set to a value, this is the maximum number of iterations that
                 will occur before returning regardless of the output of ``testfn``.
+
+            concurrency (int, optional): When ``testfn`` is the default
+                :func:`~performline.clients.rest.utils.autopage_fn`, the offsets of all remaining
+                pages are known as soon as the first page has been retrieved.  If this is greater
+                than 1, those pages are then fetched in parallel by up to this many threads
+                (responses are still yielded in order).  Defaults to ``page_concurrency``.
+
+        Returns:
+            generator of :class:`~performline.clients.rest.responses.SuccessResponse`
         """
+        pages = self._iter_pages(
+            method,
+            path,
+            data,
+            params,
+            headers,
+            encoder,
+            testfn,
+            request_delay_ms,
+            max_iterations,
+            concurrency,
+            **kwargs
+        )
+
+        if self.hooks is None:
+            return pages
 
-        responses = []
+        return self._observe_pages(pages, PagesEvent(method.lower(), path, params))
+
+    def _iter_pages(
+        self,
+        method,
+        path,
+        data,
+        params,
+        headers,
+        encoder,
+        testfn,
+        request_delay_ms,
+        max_iterations,
+        concurrency,
+        **kwargs
+    ):
+        """
+        The generator returned by :func:`iter_until`.
+        """
         count = 0
-        context = RequestContext(self, method, path, data, params, headers)
+
+        # the offset is advanced on a copy, rather than on the caller's (or the default) params
+        context = RequestContext(self, method, path, data, dict(params or {}), headers)
+
+        if concurrency is None:
+            concurrency = self.page_concurrency
 
         while True:
             response = self.request(
@@ -386,8 +914,6 @@ class StandardRestClient(object):
                 **kwargs
             )
 
-            responses.append(response)
-
             # break if we've exceeded max_iterations
             if max_iterations is not None:
                 if count >= max_iterations:
@@ -399,6 +925,30 @@ class StandardRestClient(object):
                         )
                     )
 
+            # the rest of the result set can be fetched in parallel once its size is known
+            if count == 0 and testfn is autopage_fn and concurrency and concurrency > 1:
+                remaining = self._request_remaining_pages(
+                    context,
+                    response,
+                    encoder,
+                    concurrency=concurrency,
+                    max_iterations=max_iterations,
+                    **kwargs
+                )
+
+                # stops the remaining requests if the caller abandons the result set early
+                try:
+                    yield response
+
+                    for response in remaining:
+                        yield response
+                finally:
+                    remaining.close()
+
+                return
+
+            yield response
+
             # only loop if we were given a callable testfn
             if callable(testfn):
                 # call testfn to see if we should stop now
@@ -413,7 +963,99 @@ class StandardRestClient(object):
             if request_delay_ms > 0:
                 time.sleep(float(request_delay_ms) / 1000.0)
 
-        return responses
+    def _observe_pages(self, pages, event):
+        """
+        Yields each response from the generator ``pages``, passing ``event`` to the
+        ``before_pages`` and ``after_pages`` hooks and making it the parent of every request made
+        while retrieving them.
+        """
+        error = None
+        self.hooks.before_pages(event)
+
+        try:
+            while True:
+                with pages_scope(event):
+                    try:
+                        response = next(pages)
+                    except StopIteration:
+                        return
+
+                event.pages += 1
+                yield response
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            pages.close()
+            event.finish(error)
+            self.hooks.after_pages(event)
+
+    def _remaining_page_offsets(self, context, first_response, max_iterations=None):
+        """
+        Returns the offsets of all pages following ``first_response``, following the same rules
+        as :func:`~performline.clients.rest.utils.autopage_fn` (pages are the size of the first
+        one when no ``limit`` was requested).
+
+        Raises:
+            :class:`~performline.clients.rest.exceptions.TooManyIterations`
+        """
+        limit = int(context.params.get('limit') or first_response.limit or 0)
+
+        if not limit:
+            return []
+
+        # the offset that was requested, rather than the one the server reports
+        offsets = list(range(
+            int(context.params.get('offset') or 0) + limit,
+            first_response.total_length,
+            limit
+        ))
+
+        if max_iterations is not None and len(offsets) >= max_iterations:
+            raise TooManyIterations(
+                "Request {} {} has exceeded the maximum iteration count of {}".format(
+                    context.method.upper(),
+                    context.path,
+                    max_iterations
+                )
+            )
+
+        return offsets
+
+    def _request_remaining_pages(
+        self,
+        context,
+        first_response,
+        encoder='json',
+        concurrency=1,
+        max_iterations=None,
+        **kwargs
+    ):
+        """
+        Returns a generator that fetches all pages following ``first_response`` using a bounded
+        pool of threads (created when it is first advanced), yielding the responses in offset
+        order.
+        """
+        offsets = self._remaining_page_offsets(context, first_response, max_iterations)
+        parent = current_pages()
+
+        def fetch(offset):
+            params = dict(context.params)
+            params['offset'] = offset
+
+            # worker threads do not share the caller's context
+            with pages_scope(parent):
+                return self.request(
+                    context.method,
+                    context.path,
+                    context.data,
+                    params,
+                    dict(context.headers),
+                    encoder,
+                    **kwargs
+                )
+
+        return imap_bounded(fetch, offsets, concurrency)
 
     def get_until(self, *args, **kwargs):
         """
@@ -421,6 +1063,12 @@ class StandardRestClient(object):
         """
         return self.request_until('get', *args, **kwargs)
 
+    def iget_until(self, *args, **kwargs):
+        """
+        Perform a GET request repeatedly, yielding each response.  See: :func:`iter_until`.
+        """
+        return self.iter_until('get', *args, **kwargs)
+
     def post_until(self, *args, **kwargs):
         """
         Perform a POST request repeatedly.  See: :func:`request_until`.
@@ -567,6 +1215,21 @@ class StandardRestClient(object):
         raise Exception('No such model "{}"'.format(name))
 
 
+def _is_not_modified(response):
+    return response.response is not None and response.response.status_code == 304
+
+
+def _body_length(response, stream):
+    """
+    Returns the size of a response body that has already been read, or `None` if it is being
+    streamed to the caller.
+    """
+    if stream:
+        return None
+
+    return len(response.content)
+
+
 def _check_response_for_deprecation(path, response):
     """
     Inspects the given response's HTTP headers for a value that indicates the given path
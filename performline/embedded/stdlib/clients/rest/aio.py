@@ -0,0 +1,541 @@
+"""
+An asyncio counterpart to :class:`~performline.clients.rest.StandardRestClient`.
+
+Requests are prepared and their responses interpreted by a wrapped synchronous client, so the
+same headers, parameters, stats, response, exception, and model classes apply; only the
+transport (``aiohttp``, which must be installed separately) differs.
+"""
+from __future__ import absolute_import
+import asyncio
+from collections import deque
+from itertools import islice
+import requests
+from requests.structures import CaseInsensitiveDict
+from . import RequestContext
+from .exceptions import ErrorResponse, BadGateway, TooManyIterations
+from .hooks import PagesEvent, pages_scope
+from .timing import PhaseTimer
+from .utils import autopage_fn
+from ...utils import stats
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+
+class AsyncRestClient(object):
+    """
+    Performs the requests of a :class:`~performline.clients.rest.StandardRestClient` using
+    ``asyncio``.  All connections are drawn from a single shared, pooled ``aiohttp`` session, which
+    is created on first use and should be released with :func:`close` (or by using the instance
+    as an ``async with`` context manager).
+
+    Args:
+        client (:class:`~performline.clients.rest.StandardRestClient`): The client whose
+            configuration (URL, prefix, headers, params, request options) is used to build
+            requests.  Model instances returned by this class are bound to this client.
+
+        pool_maxsize (int): The maximum number of simultaneous connections.
+
+        page_concurrency (int, optional): The default number of pages :func:`iter_until` will
+            fetch in parallel.  Defaults to the wrapped client's ``page_concurrency``.
+    """
+
+    pool_maxsize = 100
+
+    def __init__(self, client, pool_maxsize=None, page_concurrency=None):
+        if aiohttp is None:
+            raise ImportError('The aiohttp package is required to use {0}'.format(
+                self.__class__.__name__))
+
+        self.client = client
+        self.session = None
+
+        if pool_maxsize is not None:
+            self.pool_maxsize = pool_maxsize
+
+        if page_concurrency is not None:
+            self.page_concurrency = page_concurrency
+        else:
+            self.page_concurrency = client.page_concurrency
+
+    @property
+    def url(self):
+        return self.client.url
+
+    @url.setter
+    def url(self, value):
+        self.client.url = value
+
+    @property
+    def prefix(self):
+        return self.client.prefix
+
+    @prefix.setter
+    def prefix(self, value):
+        self.client.prefix = value
+
+    def get_session(self):
+        """
+        Returns the ``aiohttp.ClientSession`` used for all requests, creating it if necessary.
+        """
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_maxsize)
+            )
+
+        return self.session
+
+    def metrics_snapshot(self):
+        """
+        Returns the latency percentiles, request rates, and retry counts of every request made
+        so far.  See: :func:`~performline.clients.rest.StandardRestClient.metrics_snapshot`.
+        """
+        return self.client.metrics_snapshot()
+
+    async def close(self):
+        """
+        Closes the underlying session and all of its pooled connections.
+        """
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def request(
+        self,
+        method,
+        path,
+        data=None,
+        params={},
+        headers={},
+        encoder='json',
+        content_type=None,
+        **kwargs
+    ):
+        """
+        Perform a generic HTTP request.  See:
+        :func:`~performline.clients.rest.StandardRestClient.request`.
+
+        Of the additional keyword arguments, only ``timeout`` (in seconds) and ``verify`` are
+        supported.
+        """
+        context = self.client._prepare_request(
+            method,
+            path,
+            data=data,
+            params=params,
+            headers=headers,
+            encoder=encoder,
+            content_type=content_type,
+            **kwargs
+        )
+
+        cache_key, cached, fresh = self.client._cache_lookup(context)
+
+        if fresh:
+            return cached
+
+        policy = self.client.retry_policy
+        attempt = 1
+
+        while True:
+            try:
+                response = await self._send(context, attempt)
+
+                if self.client._drop_validators(context, cache_key, cached, response):
+                    response = await self._send(context, attempt)
+
+                return self.client._cache_store(cache_key, cached, response)
+            except ErrorResponse as e:
+                if policy is None or not policy.should_retry(context.method, attempt, e):
+                    self.client._record_error(context, e)
+                    raise
+
+                delay = policy.get_delay(attempt, e)
+                self.client._record_retry(context, attempt, e, delay)
+                await asyncio.sleep(delay)
+                attempt += 1
+            except Exception as e:
+                self.client._record_error(context, e)
+                raise
+
+    async def _send(self, context, attempt=1):
+        """
+        Performs a single attempt of the request described by ``context``.
+        """
+        if self.client.rate_limiter is not None:
+            wait = self.client.rate_limiter.reserve()
+
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            self.client._record_throttle(context, wait)
+
+        event = self.client._begin_attempt(context, attempt)
+        options = {}
+
+        if context.options.get('timeout') is not None:
+            options['timeout'] = aiohttp.ClientTimeout(total=context.options['timeout'])
+
+        if context.options.get('verify') is False:
+            options['ssl'] = False
+
+        phases = PhaseTimer('performline.clients.rest.request', context.stat_tags)
+        response = None
+
+        try:
+            stats.increment('performline.clients.rest.request', tags=context.stat_tags)
+
+            with stats.time('performline.clients.rest.request.time', tags=context.stat_tags):
+                try:
+                    async with self.get_session().request(
+                        context.method,
+                        context.url,
+                        data=context.data,
+                        params=context.params,
+                        headers=context.headers,
+                        **options
+                    ) as response:
+                        phases.mark('ttfb')
+                        content = await response.read()
+                        phases.mark('download')
+                finally:
+                    phases.report()
+                    self.client._record_attempt(
+                        context,
+                        response.status if response is not None else None,
+                        phases
+                    )
+
+        except aiohttp.ClientSSLError as e:
+            stats.increment('performline.clients.rest.error_ssl', tags=context.stat_tags)
+
+            if event is not None:
+                event.finish(phases=phases, error=e)
+
+            raise
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            stats.increment('performline.clients.rest.error_on_connect', tags=context.stat_tags)
+            error = BadGateway(
+                message="Failed to connect to {}: {}".format(context.url, str(e)),
+                exception=e
+            )
+
+            if event is not None:
+                event.finish(phases=phases, error=error)
+
+            raise error
+
+        response = _as_requests_response(response, content)
+        self.client._cache_invalidate(context)
+
+        if event is None:
+            return self.client._process_response(context, response)
+
+        try:
+            rv = self.client._process_response(context, response)
+        except Exception as e:
+            event.finish(response, phases, error=e, response_bytes=len(content))
+            raise
+
+        event.finish(response, phases, response_bytes=len(content))
+        self.client.hooks.after_response(event)
+
+        return rv
+
+    async def get(self, *args, **kwargs):
+        """
+        Perform a GET request.  See: :func:`request`.
+        """
+        return await self.request('get', *args, **kwargs)
+
+    async def post(self, *args, **kwargs):
+        """
+        Perform a POST request.  See: :func:`request`.
+        """
+        return await self.request('post', *args, **kwargs)
+
+    async def put(self, *args, **kwargs):
+        """
+        Perform a PUT request.  See: :func:`request`.
+        """
+        return await self.request('put', *args, **kwargs)
+
+    async def delete(self, *args, **kwargs):
+        """
+        Perform a DELETE request.  See: :func:`request`.
+        """
+        return await self.request('delete', *args, **kwargs)
+
+    def iter_until(
+        self,
+        method,
+        path,
+        data=None,
+        params={},
+        headers={},
+        encoder='json',
+        testfn=autopage_fn,
+        request_delay_ms=0,
+        max_iterations=25,
+        concurrency=None,
+        **kwargs
+    ):
+        """
+        Perform an HTTP request repeatedly until a given function returns true, yielding each
+        response as soon as it arrives.  See:
+        :func:`~performline.clients.rest.StandardRestClient.iter_until`.
+        """
+        pages = self._iter_pages(
+            method,
+            path,
+            data,
+            params,
+            headers,
+            encoder,
+            testfn,
+            request_delay_ms,
+            max_iterations,
+            concurrency,
+            **kwargs
+        )
+
+        if self.client.hooks is None:
+            return pages
+
+        return self._observe_pages(pages, PagesEvent(method.lower(), path, params))
+
+    async def _iter_pages(
+        self,
+        method,
+        path,
+        data,
+        params,
+        headers,
+        encoder,
+        testfn,
+        request_delay_ms,
+        max_iterations,
+        concurrency,
+        **kwargs
+    ):
+        """
+        The asynchronous generator returned by :func:`iter_until`.
+        """
+        count = 0
+
+        # the offset is advanced on a copy, rather than on the caller's (or the default) params
+        context = RequestContext(self, method, path, data, dict(params or {}), headers)
+
+        if concurrency is None:
+            concurrency = self.page_concurrency
+
+        while True:
+            response = await self.request(
+                context.method,
+                context.path,
+                context.data,
+                context.params,
+                context.headers,
+                encoder,
+                **kwargs
+            )
+
+            if max_iterations is not None and count >= max_iterations:
+                raise TooManyIterations(
+                    "Request {} {} has exceeded the maximum iteration count of {}".format(
+                        method.upper(),
+                        path,
+                        max_iterations
+                    )
+                )
+
+            # the rest of the result set can be fetched in parallel once its size is known
+            if count == 0 and testfn is autopage_fn and concurrency and concurrency > 1:
+                offsets = iter(self.client._remaining_page_offsets(
+                    context,
+                    response,
+                    max_iterations
+                ))
+
+                def fetch(offset):
+                    page_params = dict(context.params)
+                    page_params['offset'] = offset
+
+                    return asyncio.ensure_future(self.request(
+                        context.method,
+                        context.path,
+                        context.data,
+                        page_params,
+                        dict(context.headers),
+                        encoder,
+                        **kwargs
+                    ))
+
+                pending = deque(fetch(o) for o in islice(offsets, concurrency))
+
+                try:
+                    yield response
+
+                    while len(pending):
+                        response = await pending.popleft()
+
+                        for offset in islice(offsets, 1):
+                            pending.append(fetch(offset))
+
+                        yield response
+                finally:
+                    for task in pending:
+                        task.cancel()
+
+                    # wait for cancelled requests to finish so none outlive the generator
+                    await asyncio.gather(*pending, return_exceptions=True)
+
+                return
+
+            yield response
+
+            if callable(testfn):
+                if testfn(count, response, context):
+                    break
+            else:
+                break
+
+            count += 1
+
+            if request_delay_ms > 0:
+                await asyncio.sleep(float(request_delay_ms) / 1000.0)
+
+    async def _observe_pages(self, pages, event):
+        """
+        Yields each response from the asynchronous generator ``pages``, passing ``event`` to the
+        client's pagination hooks.  See:
+        :func:`~performline.clients.rest.StandardRestClient._observe_pages`.
+        """
+        hooks = self.client.hooks
+        error = None
+        hooks.before_pages(event)
+
+        try:
+            while True:
+                # tasks created for pages fetched in parallel inherit the current context
+                with pages_scope(event):
+                    try:
+                        response = await pages.__anext__()
+                    except StopAsyncIteration:
+                        return
+
+                event.pages += 1
+                yield response
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            await pages.aclose()
+            event.finish(error)
+            hooks.after_pages(event)
+
+    def iget_until(self, *args, **kwargs):
+        """
+        Perform a GET request repeatedly, yielding each response.  See: :func:`iter_until`.
+        """
+        return self.iter_until('get', *args, **kwargs)
+
+    def iall(self, model, autoload=False, max_results=None, **kwargs):
+        """
+        Asynchronous iterator over all instances of the given model.  See: :func:`aiall`.
+        """
+        return aiall(model, self, autoload=autoload, max_results=max_results, **kwargs)
+
+
+async def aget(model, client, pk):
+    """
+    Retrieve a single instance of ``model`` by its primary key.  See:
+    :func:`~performline.clients.rest.models.RestModel.get`.
+
+    Args:
+        model (type): A subclass of :class:`~performline.clients.rest.models.RestModel`.
+
+        client (:class:`AsyncRestClient`): The client used to perform the request.
+
+        pk (any): The primary key (or, for models with a ``secondary_key``, a pair of keys).
+
+    Returns:
+        :class:`~performline.clients.rest.models.RestModel`
+    """
+    if model.secondary_key is not None:
+        if not isinstance(pk, (list, tuple)) or len(pk) == 1:
+            raise AttributeError(
+                "Multiple components are required to retrieve this item,"
+                "1 given."
+            )
+
+        instance = model(client.client, {
+            model.primary_key: pk[0],
+            model.secondary_key: pk[1],
+        })
+    else:
+        instance = model(client.client, {
+            model.primary_key: pk,
+        })
+
+    return await aretrieve(instance, client)
+
+
+async def aretrieve(instance, client):
+    """
+    Refreshes a model instance from the server.  See:
+    :func:`~performline.clients.rest.models.RestModel.retrieve`.
+    """
+    response = await client.request(instance.rest_read_method, instance.formatted_path())
+
+    instance.set_data(response.results(0))
+    instance.set_metadata(response.metadata)
+
+    return instance
+
+
+async def aiall(model, client, autoload=False, max_results=None, **kwargs):
+    """
+    Asynchronous iterator over all instances of ``model``, automatically paging through
+    paginated result sets.  See: :func:`~performline.clients.rest.models.RestModel.iall`.
+
+    Instances are bound to the synchronous client wrapped by ``client``.
+    """
+    count = 0
+
+    async for response in client.iget_until(model.rest_root, **kwargs):
+        for item in response.results():
+            instance = model.from_result(client.client, item)
+
+            if instance is not None:
+                if autoload:
+                    await aretrieve(instance, client)
+
+                yield instance
+                count += 1
+
+                if max_results and count >= max_results:
+                    return
+
+
+def _as_requests_response(response, content):
+    """
+    Builds a :class:`requests.Response` from an ``aiohttp`` response and its body so that it can
+    be handled exactly as synchronous responses are.
+    """
+    rv = requests.Response()
+    rv.status_code = response.status
+    rv.reason = response.reason
+    rv.headers = CaseInsensitiveDict(response.headers)
+    rv.url = str(response.url)
+    rv.encoding = response.charset
+    rv._content = content
+    return rv
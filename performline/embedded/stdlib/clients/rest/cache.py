@@ -0,0 +1,390 @@
+"""
+Caches for the responses of idempotent (GET) requests.
+"""
+from __future__ import absolute_import
+from collections import OrderedDict
+from threading import RLock
+import hashlib
+import json
+import sqlite3
+import time
+import requests
+from requests.structures import CaseInsensitiveDict
+from .responses import SuccessResponse
+
+
+class ResponseCache(object):
+    """
+    A base class for caches of :class:`~performline.clients.rest.responses.SuccessResponse`
+    objects, keyed by the method, URL, query string parameters and credentials of the request that
+    produced them.  Entries expire ``ttl`` seconds after being stored, and the least recently used
+    entries are evicted once more than ``max_entries`` are stored.
+
+    Subclasses implement storage by overriding :func:`_load`, :func:`_store`, :func:`_delete`,
+    :func:`_evict`, :func:`_invalidate` and :func:`clear`.
+
+    Args:
+        ttl (float): The number of seconds an entry remains valid.  If `None`, entries do not
+            expire.
+
+        max_entries (int): The maximum number of entries to retain.  If `None`, the size of the
+            cache is unbounded.
+    """
+
+    def __init__(self, ttl=300, max_entries=1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.lock = RLock()
+
+    def make_key(self, method, url, params=None, headers=None):
+        """
+        Returns the cache key for a request.
+
+        Args:
+            method (str): The HTTP method.
+
+            url (str): The request URL (without query string).
+
+            params (dict, optional): The query string parameters.
+
+            headers (dict, optional): The request headers; only the ``Authorization`` header is
+                considered, so that responses are never shared between different credentials.
+
+        Returns:
+            str
+        """
+        key = json.dumps([
+            method.lower(),
+            url,
+            sorted((str(k), str(v)) for k, v in (params or {}).items()),
+            (headers or {}).get('Authorization'),
+        ])
+
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """
+        Returns the cached response for the given key, or `None` if there is no valid entry.
+
+        Returns:
+            :class:`~performline.clients.rest.responses.SuccessResponse`, `None`
+        """
+        response, fresh = self.lookup(key)
+
+        if fresh:
+            return response
+
+        return None
+
+    def lookup(self, key):
+        """
+        Returns the cached response for the given key, and whether it is still valid.  Expired
+        responses are retained (and returned) if they carry validators (an ``ETag`` or
+        ``Last-Modified`` header), so that they can be revalidated with a conditional request
+        and then :func:`refresh`-ed instead of being downloaded again.
+
+        Returns:
+            tuple of (:class:`~performline.clients.rest.responses.SuccessResponse` or `None`,
+            bool)
+        """
+        with self.lock:
+            entry = self._load(key)
+
+            if entry is not None:
+                expires, response = entry
+
+                if expires is None or expires > time.time():
+                    self.hits += 1
+                    return (response, True)
+
+                self.expirations += 1
+
+                if response.validator is None:
+                    self._delete(key)
+                else:
+                    self.misses += 1
+                    return (response, False)
+
+            self.misses += 1
+            return (None, False)
+
+    def refresh(self, key, response):
+        """
+        Marks a stored response as valid for another ``ttl`` seconds (e.g.: after the server has
+        confirmed it has not been modified).
+        """
+        self.set(key, response)
+
+    def set(self, key, response):
+        """
+        Stores a response in the cache, evicting the least recently used entries if the cache is
+        full.
+        """
+        if self.ttl is None:
+            expires = None
+        else:
+            expires = time.time() + self.ttl
+
+        with self.lock:
+            self._store(key, expires, response)
+
+            if self.max_entries is not None:
+                self.evictions += self._evict(self.max_entries)
+
+    def invalidate(self, url):
+        """
+        Removes every entry for the given URL (regardless of its query string parameters or
+        credentials), e.g.: after the resource it identifies has been modified.
+
+        Args:
+            url (str): The URL, without query string.
+
+        Returns:
+            int: The number of entries removed.
+        """
+        with self.lock:
+            return self._invalidate(url.rstrip('/'))
+
+    @property
+    def stats(self):
+        """
+        Returns the counters describing this cache's effectiveness.
+
+        Returns:
+            dict
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'size': len(self),
+        }
+
+    def clear(self):
+        """
+        Removes all entries from the cache.
+        """
+        raise NotImplementedError()
+
+    def _load(self, key):
+        """
+        Returns the ``(expires, response)`` tuple stored for the key (marking it as recently
+        used), or `None`.
+        """
+        raise NotImplementedError()
+
+    def _store(self, key, expires, response):
+        raise NotImplementedError()
+
+    def _delete(self, key):
+        raise NotImplementedError()
+
+    def _evict(self, max_entries):
+        """
+        Removes least recently used entries until no more than ``max_entries`` remain, returning
+        the number removed.
+        """
+        raise NotImplementedError()
+
+    def _invalidate(self, url):
+        """
+        Removes the entries whose response URL (ignoring its query string and any trailing
+        slash) is ``url``, returning the number removed.
+        """
+        raise NotImplementedError()
+
+    def __len__(self):
+        raise NotImplementedError()
+
+
+class MemoryCache(ResponseCache):
+    """
+    A :class:`ResponseCache` that keeps responses (including their decoded payloads) in memory.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(MemoryCache, self).__init__(*args, **kwargs)
+        self._entries = OrderedDict()
+
+    def clear(self):
+        with self.lock:
+            self._entries.clear()
+
+    def _load(self, key):
+        entry = self._entries.pop(key, None)
+
+        if entry is not None:
+            self._entries[key] = entry
+
+        return entry
+
+    def _store(self, key, expires, response):
+        self._entries.pop(key, None)
+        self._entries[key] = (expires, response)
+
+    def _delete(self, key):
+        self._entries.pop(key, None)
+
+    def _evict(self, max_entries):
+        evicted = 0
+
+        while len(self._entries) > max_entries:
+            self._entries.popitem(last=False)
+            evicted += 1
+
+        return evicted
+
+    def _invalidate(self, url):
+        keys = [
+            key for key, (_, response) in self._entries.items()
+            if _base_url(response.response.url) == url
+        ]
+
+        for key in keys:
+            del self._entries[key]
+
+        return len(keys)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SqliteCache(ResponseCache):
+    """
+    A :class:`ResponseCache` that persists responses to a SQLite database, so that they survive
+    between processes.  Only the status, headers and body of each response are stored; bodies are
+    decoded again (when needed) after being read back.
+
+    Reading an entry does not write to the database: the time each entry was last used is kept in
+    memory, and only written (along with the next change to the cache) before entries are stored
+    or evicted.
+
+    Args:
+        path (str): The path of the database file (created if it does not exist).
+    """
+
+    def __init__(self, path, *args, **kwargs):
+        super(SqliteCache, self).__init__(*args, **kwargs)
+        self.path = path
+        self._accessed = {}
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            '  key TEXT PRIMARY KEY,'
+            '  expires REAL,'
+            '  accessed REAL NOT NULL,'
+            '  url TEXT NOT NULL,'
+            '  status INTEGER NOT NULL,'
+            '  headers TEXT NOT NULL,'
+            '  content BLOB NOT NULL'
+            ')'
+        )
+        self._db.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+        self._db.commit()
+
+    def clear(self):
+        with self.lock:
+            self._accessed.clear()
+            self._db.execute('DELETE FROM responses')
+            self._db.commit()
+
+    def _load(self, key):
+        row = self._db.execute(
+            'SELECT expires, url, status, headers, content FROM responses WHERE key = ?',
+            (key,)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        self._accessed[key] = time.time()
+
+        expires, url, status, headers, content = row
+
+        response = requests.Response()
+        response.url = url
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(json.loads(headers))
+        response._content = bytes(content)
+
+        return (expires, SuccessResponse(response))
+
+    def _store(self, key, expires, response):
+        raw = response.response
+
+        self._accessed.pop(key, None)
+        self._write_accessed()
+        self._db.execute(
+            'INSERT OR REPLACE INTO responses '
+            '(key, expires, accessed, url, status, headers, content) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (
+                key,
+                expires,
+                time.time(),
+                raw.url or '',
+                raw.status_code,
+                json.dumps(dict(raw.headers)),
+                sqlite3.Binary(raw.content),
+            )
+        )
+        self._db.commit()
+
+    def _delete(self, key):
+        self._db.execute('DELETE FROM responses WHERE key = ?', (key,))
+        self._db.commit()
+
+    def _evict(self, max_entries):
+        self._write_accessed()
+        cursor = self._db.execute(
+            'DELETE FROM responses WHERE key IN ('
+            '  SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?'
+            ')',
+            (max_entries,)
+        )
+        self._db.commit()
+
+        return max(cursor.rowcount, 0)
+
+    def _invalidate(self, url):
+        conditions = []
+        values = []
+
+        for candidate in (url, url + '/'):
+            conditions.append("url = ? OR url LIKE ? ESCAPE '!'")
+            values.extend([candidate, _escape_like(candidate) + '?%'])
+
+        cursor = self._db.execute(
+            'DELETE FROM responses WHERE {0}'.format(' OR '.join(conditions)),
+            values
+        )
+        self._db.commit()
+
+        return max(cursor.rowcount, 0)
+
+    def _write_accessed(self):
+        """
+        Writes the access times recorded since they were last written, without committing.
+        """
+        if self._accessed:
+            self._db.executemany(
+                'UPDATE responses SET accessed = ? WHERE key = ?',
+                [(accessed, key) for key, accessed in self._accessed.items()]
+            )
+            self._accessed.clear()
+
+    def __len__(self):
+        return self._db.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+
+def _base_url(url):
+    return (url or '').split('?', 1)[0].rstrip('/')
+
+
+def _escape_like(value):
+    return value.replace('!', '!!').replace('%', '!%').replace('_', '!_')
@@ -0,0 +1,264 @@
+"""
+Callbacks observing the requests made by a client.
+
+Assigning a :class:`RequestHooks` instance to a client's ``hooks`` setting (which applies to the
+:class:`~performline.clients.rest.aio.AsyncRestClient` wrapping it as well) calls its methods
+around every attempt of every request:
+
+``before_request(event)``
+    Immediately before the attempt is sent (after any wait for the rate limiter).
+
+``after_response(event)``
+    When the attempt succeeded.
+
+``on_retry(event)``
+    When the attempt failed and the request is about to be attempted again.
+
+``on_error(event)``
+    When the attempt failed and the request will not be attempted again.
+
+Each attempt is described by a single :class:`RequestEvent`, passed to ``before_request`` and
+then to exactly one of the other three methods.  Requests made by
+:func:`~performline.clients.rest.StandardRestClient.iter_until` are additionally grouped by a
+:class:`PagesEvent` passed to ``before_pages`` and ``after_pages``, which is available to each
+request as :attr:`RequestEvent.parent` (including pages fetched in parallel).
+
+When ``hooks`` is `None` (the default), no events are created.
+"""
+from __future__ import absolute_import
+from contextlib import contextmanager
+from six import binary_type, text_type
+from .retry import error_status
+from ...utils.stats import clock_ns
+
+try:
+    from contextvars import ContextVar
+except ImportError:
+    ContextVar = None
+
+
+class RequestHooks(object):
+    """
+    Base class for request callbacks; each method does nothing unless overridden.
+    """
+
+    def before_request(self, event):
+        """
+        Called with a :class:`RequestEvent` before each attempt of a request is sent.
+        """
+
+    def after_response(self, event):
+        """
+        Called with the :class:`RequestEvent` of an attempt that succeeded.
+        """
+
+    def on_error(self, event):
+        """
+        Called with the :class:`RequestEvent` of an attempt that failed and will not be retried.
+        """
+
+    def on_retry(self, event):
+        """
+        Called with the :class:`RequestEvent` of an attempt that failed and is about to be
+        retried after :attr:`RequestEvent.delay` seconds.
+        """
+
+    def before_pages(self, event):
+        """
+        Called with a :class:`PagesEvent` before the first request of a paginated result set.
+        """
+
+    def after_pages(self, event):
+        """
+        Called with the :class:`PagesEvent` of a paginated result set once it has been
+        exhausted, has failed, or was abandoned by the caller.
+        """
+
+
+class RequestEvent(object):
+    """
+    Describes a single attempt of a request.
+
+    Attributes:
+        method (str): The HTTP method, in lower case.
+
+        path (str): The path the request was made for (relative to the client's prefix).
+
+        url (str): The full URL of the request, excluding the query string.
+
+        params (dict): The query string parameters.
+
+        attempt (int): The number of this attempt, starting from 1.
+
+        parent (:class:`PagesEvent`): The paginated result set this request is part of, if any.
+
+        status (int): The HTTP status code of the response, or `None` if none was received.
+
+        request_bytes (int): The size of the request body, if known.
+
+        response_bytes (int): The size of the response body, if known (it is not when the
+            response is streamed and the server did not send a ``Content-Length``).
+
+        elapsed_ms (float): The duration of the attempt, in milliseconds.
+
+        phases (dict): The duration of each measured phase of the attempt (see
+            :mod:`~performline.clients.rest.timing`), in milliseconds.
+
+        error (Exception): The error the attempt failed with, if any.
+
+        delay (float): The number of seconds before the request is retried, if it is.
+
+        span: Unused by the client; hooks may store their own state here.
+    """
+
+    def __init__(self, context, attempt=1, parent=None):
+        self.method = context.method
+        self.path = context.path
+        self.url = context.url
+        self.params = dict(context.params or {})
+        self.attempt = attempt
+        self.parent = parent
+        self.status = None
+        self.request_bytes = _length(context.data)
+        self.response_bytes = None
+        self.elapsed_ms = None
+        self.phases = {}
+        self.error = None
+        self.delay = None
+        self.span = None
+        self._start = clock_ns()
+
+    def finish(self, response=None, phases=None, error=None, response_bytes=None):
+        """
+        Records the outcome of the attempt.
+
+        Args:
+            response (:class:`requests.Response`, optional): The response received.
+
+            phases (:class:`~performline.clients.rest.timing.PhaseTimer`, optional)
+
+            error (Exception, optional): The error the attempt failed with.
+
+            response_bytes (int, optional): The size of the response body.
+        """
+        self.elapsed_ms = (clock_ns() - self._start) / 1e6
+        self.error = error
+
+        if response is None and error is not None:
+            self.status = error_status(error)
+        elif response is not None:
+            self.status = response.status_code
+
+            if response_bytes is None:
+                response_bytes = _content_length(response)
+
+        self.response_bytes = response_bytes
+
+        if phases is not None:
+            self.phases = dict(
+                (phase, nanoseconds / 1e6) for phase, nanoseconds in phases.phases.items()
+            )
+
+
+class PagesEvent(object):
+    """
+    Describes the sequence of requests made to retrieve a paginated result set.
+
+    Attributes:
+        method (str): The HTTP method, in lower case.
+
+        path (str): The path of the first request.
+
+        params (dict): The query string parameters of the first request.
+
+        pages (int): The number of responses yielded to the caller.
+
+        elapsed_ms (float): The time from the first request until the result set was exhausted
+            (or abandoned), in milliseconds.
+
+        error (Exception): The error that ended the sequence, if any.
+
+        span: Unused by the client; hooks may store their own state here.
+    """
+
+    def __init__(self, method, path, params=None):
+        self.method = method
+        self.path = path
+        self.params = dict(params or {})
+        self.pages = 0
+        self.elapsed_ms = None
+        self.error = None
+        self.span = None
+        self._start = clock_ns()
+
+    def finish(self, error=None):
+        """
+        Records the end of the sequence.
+        """
+        self.elapsed_ms = (clock_ns() - self._start) / 1e6
+        self.error = error
+
+
+if ContextVar is not None:
+    _current_pages = ContextVar('performline_current_pages', default=None)
+
+    def current_pages():
+        """
+        Returns the :class:`PagesEvent` that requests made from the current context belong to,
+        or `None`.
+        """
+        return _current_pages.get()
+
+    @contextmanager
+    def pages_scope(event):
+        """
+        A context manager within which requests made from the current context (including asyncio
+        tasks created within it) belong to the given :class:`PagesEvent`.
+        """
+        token = _current_pages.set(event)
+
+        try:
+            yield event
+        finally:
+            _current_pages.reset(token)
+else:
+    import threading
+
+    _local = threading.local()
+
+    def current_pages():
+        """
+        Returns the :class:`PagesEvent` that requests made from the current thread belong to, or
+        `None`.
+        """
+        return getattr(_local, 'pages', None)
+
+    @contextmanager
+    def pages_scope(event):
+        """
+        A context manager within which requests made from the current thread belong to the given
+        :class:`PagesEvent`.
+        """
+        previous = current_pages()
+        _local.pages = event
+
+        try:
+            yield event
+        finally:
+            _local.pages = previous
+
+
+def _length(data):
+    if isinstance(data, binary_type):
+        return len(data)
+    elif isinstance(data, text_type):
+        return len(data.encode('utf-8'))
+
+    return None
+
+
+def _content_length(response):
+    try:
+        return int(response.headers['Content-Length'])
+    except (KeyError, TypeError, ValueError):
+        return None
@@ -0,0 +1,189 @@
+"""
+Deferred, batched retrieval of related objects.
+
+While a :class:`Loader` is active on a client (see
+:func:`~performline.clients.rest.StandardRestClient.batch_loading`), relationships declared in a
+model's ``relations`` return :class:`Deferred` proxies instead of retrieving the related object
+immediately.  The keys of every proxy created (and, for the instances yielded by
+:func:`~performline.clients.rest.models.RestModel.iall`, every related key on the current page)
+are queued, and the first time any proxy of a given model is used, all of that model's queued
+keys are retrieved together with :func:`~performline.clients.rest.models.RestModel.get_many`.
+Each distinct key is only retrieved once for the lifetime of the loader.
+"""
+from __future__ import absolute_import
+from collections import OrderedDict
+from threading import RLock
+from .exceptions import ErrorResponse
+
+
+class Loader(object):
+    """
+    Collects and retrieves related objects in batches.
+
+    Args:
+        client (:class:`~performline.clients.rest.StandardRestClient`): The client used to
+            perform requests.
+
+        concurrency (int, optional): The maximum number of simultaneous requests per batch.
+            Defaults to the client's ``pool_maxsize``.
+    """
+
+    def __init__(self, client, concurrency=None):
+        self.client = client
+        self.concurrency = concurrency
+        self.lock = RLock()
+        self._pending = OrderedDict()
+        self._loaded = {}
+
+    def defer(self, model, pk):
+        """
+        Returns a proxy for the instance of ``model`` with the given primary key, queueing the
+        key to be retrieved in the next batch.
+
+        Returns:
+            :class:`Deferred`, or `None` if ``pk`` is `None`.
+        """
+        if pk is None:
+            return None
+
+        self.queue(model, pk)
+
+        return Deferred(self, model, pk)
+
+    def queue(self, model, pk):
+        """
+        Queues a primary key to be retrieved the next time any instance of ``model`` is loaded.
+        """
+        if isinstance(pk, list):
+            pk = tuple(pk)
+
+        with self.lock:
+            if (model, pk) not in self._loaded:
+                self._pending.setdefault(model, OrderedDict())[pk] = True
+
+    def prime(self, instances):
+        """
+        Queues the keys of every relationship (declared in ``relations``) of the given
+        instances.
+
+        Args:
+            instances (list of :class:`~performline.clients.rest.models.RestModel`)
+        """
+        for instance in instances:
+            for model, attr in instance.relations.values():
+                pk = getattr(instance, attr)
+
+                if pk is not None:
+                    self.queue(model, pk)
+
+    def load(self, model, pk):
+        """
+        Returns the instance of ``model`` with the given primary key, retrieving it (along with
+        every other queued key of the same model) if it has not been loaded yet.
+
+        Returns:
+            :class:`~performline.clients.rest.models.RestModel`
+
+        Raises:
+            :class:`~performline.clients.rest.exceptions.ErrorResponse` if the instance could not
+            be retrieved.
+        """
+        if isinstance(pk, list):
+            pk = tuple(pk)
+
+        with self.lock:
+            if (model, pk) not in self._loaded:
+                self.queue(model, pk)
+                self.dispatch(model)
+
+            rv = self._loaded[(model, pk)]
+
+        if isinstance(rv, ErrorResponse):
+            raise rv
+
+        return rv
+
+    def dispatch(self, model=None):
+        """
+        Retrieves all queued keys of the given model (or of every model).
+        """
+        with self.lock:
+            if model is None:
+                models = list(self._pending)
+            else:
+                models = [model]
+
+            for model in models:
+                pks = self._pending.pop(model, None)
+
+                if pks:
+                    results = model.get_many(self.client, pks, concurrency=self.concurrency)
+
+                    for pk, result in results.items():
+                        self._loaded[(model, pk)] = result
+
+    def clear(self):
+        """
+        Discards all queued keys and loaded instances.
+        """
+        with self.lock:
+            self._pending.clear()
+            self._loaded.clear()
+
+
+class Deferred(object):
+    """
+    A stand-in for a related model instance that is retrieved by its :class:`Loader` the first
+    time any of its attributes are used.
+
+    Proxies otherwise behave like the instance they stand for: they are instances of its model
+    (without retrieving it), and are converted to strings, iterated over, compared and hashed
+    as the retrieved instance is.
+    """
+
+    __slots__ = ('_loader', '_model', '_pk')
+
+    def __init__(self, loader, model, pk):
+        object.__setattr__(self, '_loader', loader)
+        object.__setattr__(self, '_model', model)
+        object.__setattr__(self, '_pk', pk)
+
+    def _resolve(self):
+        """
+        Returns the underlying model instance.
+        """
+        return self._loader.load(self._model, self._pk)
+
+    @property
+    def __class__(self):
+        return self._model
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._resolve(), name, value)
+
+    def __dir__(self):
+        return dir(self._resolve())
+
+    def __iter__(self):
+        return iter(self._resolve())
+
+    def __eq__(self, other):
+        if isinstance(other, Deferred):
+            other = other._resolve()
+
+        return self._resolve() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._resolve())
+
+    def __repr__(self):
+        return repr(self._resolve())
+
+    def __str__(self):
+        return str(self._resolve())
@@ -0,0 +1,250 @@
+"""
+In-process latency and throughput metrics.
+
+Independently of the StatsD metrics it reports (see :mod:`~performline.clients.rest.timing`),
+each client keeps a :class:`RequestMetrics` instance recording the duration (and the duration of
+each phase) of every attempt of every request it makes, along with the number of retries, grouped
+by HTTP method, endpoint, and status class.  These are available through
+:func:`~performline.clients.rest.StandardRestClient.metrics_snapshot`, so slow endpoints can be
+spotted without running a StatsD service.
+
+Endpoints are named after the request path with any identifiers replaced by ``:id`` (in the
+style of each model's ``rest_root``), so that ``/common/brands/1/`` and ``/common/brands/2/`` are
+both reported as ``/common/brands/:id/``.
+"""
+from __future__ import absolute_import
+import re
+import threading
+import time
+from ...utils.stats import METRIC_NAME_CACHE_SIZE
+from ...utils.stats.histogram import Histogram
+
+PERCENTILES = (50, 95, 99)
+"""tuple: The percentiles included in each snapshot."""
+
+RX_IDENTIFIER = re.compile(r'^(?:\d+|[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?'
+                           r'[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}|[0-9a-fA-F]{24})$')
+
+
+class RequestMetrics(object):
+    """
+    Thread-safe latency histograms and counters for the requests made by a client.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._names = {}
+        self.reset()
+
+    def reset(self):
+        """
+        Discards everything recorded so far.
+        """
+        with self.lock:
+            self._series = {}
+            self.started = time.time()
+
+    def record(self, method, path, status, nanoseconds, phases=None):
+        """
+        Records a single attempt of a request.
+
+        Args:
+            method (str): The HTTP method.
+
+            path (str): The request path.
+
+            status (int): The HTTP status code of the response, or `None` if none was received.
+
+            nanoseconds (int): The duration of the attempt.
+
+            phases (dict, optional): The duration of each phase of the attempt, in nanoseconds.
+        """
+        series = self._get_series(method, path, status)
+
+        with self.lock:
+            series.requests += 1
+            series.latency.record(nanoseconds // 1000)
+
+            if phases:
+                for phase, value in phases.items():
+                    histogram = series.phases.get(phase)
+
+                    if histogram is None:
+                        histogram = series.phases[phase] = Histogram()
+
+                    histogram.record(value // 1000)
+
+    def record_retry(self, method, path, status):
+        """
+        Records that an attempt that failed with the given status (or `None` if no response was
+        received) is being retried.
+        """
+        series = self._get_series(method, path, status)
+
+        with self.lock:
+            series.retries += 1
+
+    def _get_series(self, method, path, status):
+        key = (method, self.endpoint(path), status_class(status))
+
+        with self.lock:
+            series = self._series.get(key)
+
+            if series is None:
+                series = self._series[key] = _Series()
+
+        return series
+
+    def endpoint(self, path):
+        """
+        Returns the name under which requests to ``path`` are recorded.
+        """
+        rv = self._names.get(path)
+
+        if rv is None:
+            segments = [
+                ':id' if RX_IDENTIFIER.match(s) else s
+                for s in path.strip('/').split('/')
+            ]
+
+            rv = '/{0}/'.format('/'.join(segments))
+
+            # paths containing identifiers are not remembered, so that memory stays bounded
+            if ':id' not in segments and len(self._names) < METRIC_NAME_CACHE_SIZE:
+                self._names[path] = rv
+
+        return rv
+
+    def snapshot(self):
+        """
+        Returns everything recorded so far.
+
+        Returns:
+            dict: With the keys ``started`` (the time recording began, in seconds since the
+            epoch), ``elapsed`` (seconds since then), ``requests``, ``retries``, and
+            ``endpoints``: a list of dicts (ordered by method, endpoint, and status class)
+            with the keys ``method``, ``endpoint``, ``status``, ``requests``, ``retries``,
+            ``rate`` (requests per second), ``latency`` (the ``count``, ``min``, ``mean``,
+            ``max``, and ``p50``, ``p95`` and ``p99`` in milliseconds), and ``phases`` (the same
+            for each phase of the request).
+        """
+        with self.lock:
+            elapsed = max(time.time() - self.started, 1e-9)
+            rv = {
+                'started': self.started,
+                'elapsed': elapsed,
+                'requests': 0,
+                'retries': 0,
+                'endpoints': [],
+            }
+
+            for key in sorted(self._series):
+                series = self._series[key]
+                method, endpoint, status = key
+
+                rv['requests'] += series.requests
+                rv['retries'] += series.retries
+                rv['endpoints'].append({
+                    'method': method,
+                    'endpoint': endpoint,
+                    'status': status,
+                    'requests': series.requests,
+                    'retries': series.retries,
+                    'rate': series.requests / elapsed,
+                    'latency': summarize(series.latency),
+                    'phases': dict(
+                        (phase, summarize(histogram))
+                        for phase, histogram in series.phases.items()
+                    ),
+                })
+
+        return rv
+
+
+class _Series(object):
+    __slots__ = ('requests', 'retries', 'latency', 'phases')
+
+    def __init__(self):
+        self.requests = 0
+        self.retries = 0
+        self.latency = Histogram()
+        self.phases = {}
+
+
+def status_class(status):
+    """
+    Returns the class of an HTTP status code (e.g.: ``'2xx'``), or ``'error'`` if no response
+    was received.
+    """
+    if status is None:
+        return 'error'
+
+    return '{0}xx'.format(status // 100)
+
+
+def summarize(histogram):
+    """
+    Returns the count, minimum, mean, maximum and percentiles of a histogram of microseconds, in
+    milliseconds.
+
+    Returns:
+        dict
+    """
+    if not histogram.count:
+        return {'count': 0}
+
+    rv = {
+        'count': histogram.count,
+        'min': histogram.min / 1000.0,
+        'mean': histogram.mean() / 1000.0,
+        'max': histogram.max / 1000.0,
+    }
+
+    for q, value in zip(PERCENTILES, histogram.percentiles(PERCENTILES)):
+        rv['p{0}'.format(q)] = value / 1000.0
+
+    return rv
+
+
+def format_report(snapshot):
+    """
+    Formats a snapshot returned by :func:`RequestMetrics.snapshot` as a table.
+
+    Returns:
+        str
+    """
+    header = ('METHOD', 'ENDPOINT', 'STATUS', 'REQUESTS', 'REQ/S', 'RETRIES',
+              'P50 MS', 'P95 MS', 'P99 MS')
+    rows = [header]
+
+    for series in snapshot['endpoints']:
+        latency = series['latency']
+        rows.append((
+            series['method'].upper(),
+            series['endpoint'],
+            series['status'],
+            str(series['requests']),
+            '{0:.2f}'.format(series['rate']),
+            str(series['retries']),
+        ) + tuple(
+            '{0:.1f}'.format(latency['p{0}'.format(q)]) if latency['count'] else '-'
+            for q in PERCENTILES
+        ))
+
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    lines = [
+        '  '.join(
+            cell.ljust(width) if i < 3 else cell.rjust(width)
+            for i, (cell, width) in enumerate(zip(row, widths))
+        ).rstrip()
+        for row in rows
+    ]
+
+    lines.append('{0} requests ({1:.2f}/s) and {2} retries in {3:.1f}s'.format(
+        snapshot['requests'],
+        snapshot['requests'] / snapshot['elapsed'],
+        snapshot['retries'],
+        snapshot['elapsed']
+    ))
+
+    return '\n'.join(lines)
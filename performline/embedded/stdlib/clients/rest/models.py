@@ -1,10 +1,106 @@
 from __future__ import absolute_import
-import json
+from collections import OrderedDict
+from functools import partial
+from keyword import iskeyword
 import os
+import re
+from six import string_types
 from ...utils.dicts import deep_get, camelize, camelize_dict, underscore_dict
 from ...utils.dicts import compact as utils_compact
-from ...utils.strings import u
-from .exceptions import UnsupportedOperation
+from ...utils.json import jsonify
+from ...utils.strings import u, underscore, CONVERSION_CACHE_SIZE
+from ...utils.threading import imap_bounded
+from ...utils import stats
+from ...utils.stats import clock_ns
+from .exceptions import ErrorResponse, UnsupportedOperation
+
+IDENTIFIER = re.compile(r'^[A-Za-z][A-Za-z0-9_]*$')
+
+# alias indices are shared between all instances whose data has the same set of
+# keys (which, for the results of a given endpoint, is nearly always the case)
+_alias_indices = {}
+
+
+def alias_index(data):
+    """
+    Builds the lookup tables used to resolve attribute names against a
+    model's data.
+
+    Args:
+        data (dict): The model's (post-processed) data.
+
+    Returns:
+        A tuple of (dict, frozenset).  The dict maps every name an attribute
+        may be read by (the key itself, and its "snake_case", "camelCase"
+        and "PascalCase" forms) to the key it resolves to, and the frozenset
+        contains the "PascalCase" form of every key.
+    """
+    if not isinstance(data, dict):
+        return ({}, frozenset())
+
+    keys = tuple(data)
+
+    try:
+        return _alias_indices[keys]
+    except KeyError:
+        pass
+
+    aliases = {}
+    pascal_keys = set()
+
+    for key in keys:
+        if not isinstance(key, string_types):
+            continue
+
+        try:
+            pascal = camelize(key, True)
+        except IndexError:
+            # the key consists only of separators
+            continue
+
+        pascal_keys.add(pascal)
+
+        # an alias resolves to a key the same way __getattr__ always has:
+        # by camelizing the attribute name
+        if pascal in data:
+            for alias in (underscore(key), camelize(key), pascal):
+                if alias and camelize(alias, True) == pascal:
+                    aliases[alias] = pascal
+
+    # exact matches take precedence; keys containing a slash are paths to
+    # nested values, which are resolved by deep_get instead
+    for key in keys:
+        if isinstance(key, string_types) and '/' not in key:
+            aliases[key] = key
+
+    for alias in [a for a in aliases if '/' in a]:
+        del aliases[alias]
+
+    if len(_alias_indices) >= CONVERSION_CACHE_SIZE:
+        _alias_indices.clear()
+
+    index = _alias_indices[keys] = (aliases, frozenset(pascal_keys))
+    return index
+
+
+def _build(model, from_result, results):
+    """
+    Yields the instances built from a page of results, reporting the total time spent building
+    them once the page has been consumed (or abandoned).
+    """
+    elapsed = 0
+
+    try:
+        for item in results:
+            start = clock_ns()
+            instance = from_result(item)
+            elapsed += clock_ns() - start
+
+            yield instance
+    finally:
+        stats.timing('performline.clients.rest.models.build.time', elapsed / 1e6, tags={
+            'model': model.__name__,
+        })
 
 
 class RestModel(object):
@@ -37,6 +133,10 @@ class RestModel(object):
 
         rest_update_method (str, optional): The HTTP method that will be
         used for updating the object this instance represents.
+
+        relations (dict, optional): Maps the name of each related object
+        (see :func:`related`) to a tuple of the related model and the name
+        of the attribute holding its primary key.
     """
 
     primary_key = 'id'
@@ -45,6 +145,11 @@ class RestModel(object):
     rest_create_method = 'post'
     rest_update_method = 'put'
     fields = tuple()
+    relations = {}
+    __data = None
+    __aliases = {}
+    __pascal_keys = frozenset()
+    __validator = None
 
     def __init__(
         self,
@@ -130,11 +235,59 @@ class RestModel(object):
             }).retrieve()
 
     @classmethod
-    def iall(cls, client, autoload=False, **kwargs):
+    def get_many(cls, client, pks, concurrency=None):
+        """
+        Retrieve several instances of this model by their primary keys,
+        performing the requests in parallel.
+
+        Args:
+            client (:class:`StandardRestClient`): The client instance that
+            will be used to perform the underlying requests.
+
+            pks (iterable): The primary keys (see :func:`get`) to retrieve.
+            Duplicates are only retrieved once.
+
+            concurrency (int, optional): The maximum number of simultaneous
+            requests.  Defaults to the client's ``pool_maxsize``.
+
+        Returns:
+            An ordered dict mapping each distinct primary key (in the order
+            given) to either the retrieved :class:`RestModel` or, if the
+            request for that key failed, the
+            :class:`~performline.clients.rest.exceptions.ErrorResponse`
+            that was raised (e.g.: ``NotFound``).
+        """
+        pks = list(OrderedDict.fromkeys(
+            tuple(pk) if isinstance(pk, list) else pk for pk in pks
+        ))
+
+        if concurrency is None:
+            concurrency = getattr(client, 'pool_maxsize', 1)
+
+        def fetch(pk):
+            try:
+                return cls.get(client, pk)
+            except ErrorResponse as e:
+                return e
+
+        return OrderedDict(zip(pks, list(imap_bounded(fetch, pks, concurrency))))
+
+    @classmethod
+    def iall(
+        cls,
+        client,
+        autoload=False,
+        max_results=None,
+        compact=False,
+        stream=False,
+        **kwargs
+    ):
         """
         Iterator to retrieve all instances of this model, automatically
-        paging through paginated result sets and aggregating the instances
-        into a single list.
+        paging through paginated result sets.  Each page is requested only
+        when the previous one has been consumed (or, when pages are fetched
+        concurrently, as soon as a worker is free), and is discarded once
+        its instances have been yielded.
 
         Args:
             client (:class:`StandardRestClient`): The client instance that
@@ -143,37 +296,133 @@ class RestModel(object):
             autoload (bool): Whether each retrieved instance should
             automatically be reloaded from the server to fully populate its
             data.
+
+            max_results (int, optional): If set, stop (without requesting
+            any further pages) once this many instances have been yielded.
+
+            compact (bool): Whether to yield read-only :class:`CompactModel`
+            instances instead of full models (see
+            :func:`compact_from_result`).  Cannot be combined with
+            ``autoload``.
+
+            stream (bool): Whether to construct instances as the results of
+            each page are downloaded, rather than after the whole page has
+            been received and decoded (see
+            :func:`~performline.clients.rest.responses.SuccessResponse.iter_results`).
+            Streamed responses are never cached.
+
+            **kwargs: Passed to :func:`StandardRestClient.iget_until`; e.g.:
+            ``params``, or ``concurrency`` to fetch pages in parallel.
         """
-        for response in client.get_until(cls.rest_root, **kwargs):
+        if compact and autoload:
+            raise AttributeError(
+                "Compact instances cannot be automatically reloaded"
+            )
+
+        if compact:
+            from_result = cls.compact_from_result
+        else:
+            from_result = partial(cls.from_result, client)
+
+        if stream:
+            kwargs['stream'] = True
+
+        count = 0
+
+        for response in client.iget_until(cls.rest_root, **kwargs):
             if os.environ.get('DEBUG') in ['1', 'true']:
-                import json
                 print('[DEBUG] {}'.format(
-                    json.dumps(response.payload, indent=4))
+                    jsonify(response.payload, indent=2))
                 )
 
-            # for each result
-            for item in response.results():
-                # format list result item in the same way as formatted_path
-                item = underscore_dict(item)
-
-                # get the value of the primary key field
-                pk = item.get(cls.primary_key)
-
-                if pk is not None:
-                    if cls.secondary_key is not None:
-                        sk = item.get(cls.secondary_key)
+            if stream:
+                results = response.iter_results()
+            else:
+                results = response.results()
 
-                        if sk is None:
-                            continue
+            instances = _build(cls, from_result, results)
 
-                        item[cls.secondary_key] = sk
+            # queue the related keys of the whole page so that they are
+            # retrieved together when the first of them is used
+            loader = getattr(client, 'loader', None)
 
-                    instance = cls(client, item)
+            if loader is not None and cls.relations and not compact:
+                instances = [i for i in instances if i is not None]
+                loader.prime(instances)
 
+            for instance in instances:
+                if instance is not None:
                     if autoload:
                         instance.retrieve()
 
                     yield instance
+                    count += 1
+
+                    if max_results and count >= max_results:
+                        return
+
+    @classmethod
+    def from_result(cls, client, item):
+        """
+        Create an instance of this model from a single element of a list
+        response.
+
+        Args:
+            client (:class:`StandardRestClient`): The client instance the
+            new instance will be bound to.
+
+            item (dict): The result element, as returned by the server.
+
+        Returns:
+            :class:`RestModel`, or `None` if ``item`` does not contain the
+            key field(s) required to identify it.
+        """
+        # format list result item in the same way as formatted_path
+        item = underscore_dict(item)
+
+        # get the value of the primary key field
+        pk = item.get(cls.primary_key)
+
+        if pk is None:
+            return None
+
+        if cls.secondary_key is not None:
+            sk = item.get(cls.secondary_key)
+
+            if sk is None:
+                return None
+
+            item[cls.secondary_key] = sk
+
+        return cls(client, item)
+
+    @classmethod
+    def compact_from_result(cls, item):
+        """
+        Create a read-only :class:`CompactModel` from a single element of a
+        list response.  Compact instances are considerably smaller and
+        faster to create and read than full models, which makes them
+        suitable for holding large result sets in memory.
+
+        Args:
+            item (dict): The result element, as returned by the server.
+
+        Returns:
+            :class:`CompactModel`, or `None` if ``item`` does not contain the
+            key field(s) required to identify it.
+        """
+        if not isinstance(item, dict):
+            return None
+
+        instance = CompactModel.for_keys(cls, tuple(item))(item.values())
+
+        if instance.pk is None:
+            return None
+
+        if cls.secondary_key is not None and instance.sk is None:
+            return None
+
+        return instance
 
     @classmethod
     def all(cls, client, autoload=True, **kwargs):
@@ -202,7 +451,7 @@ class RestModel(object):
         Returns:
             any
         """
-        return self._data.get(self.primary_key)
+        return getattr(self, self.primary_key)
 
     @property
     def sk(self):
@@ -215,7 +464,7 @@ class RestModel(object):
         if self.secondary_key is None:
             return None
 
-        return self._data.get(self.secondary_key)
+        return getattr(self, self.secondary_key)
 
     @property
     def _data(self):
@@ -290,6 +539,8 @@ class RestModel(object):
         :func:`prepare_data_from_retrieval` first.
         """
         self.__data = self.prepare_data_from_retrieval(data)
+        self.__aliases, self.__pascal_keys = alias_index(self.__data)
+        self.__validator = None
 
     def set_metadata(self, metadata):
         """
@@ -351,9 +602,37 @@ class RestModel(object):
         """
         return self._client
 
+    def related(self, name):
+        """
+        Returns the related object declared in ``relations`` under the given
+        name.  If a :class:`~performline.clients.rest.loader.Loader` is
+        active on this instance's client (see
+        :func:`~performline.clients.rest.StandardRestClient.batch_loading`),
+        a :class:`~performline.clients.rest.loader.Deferred` proxy is
+        returned and the object is retrieved in a batch with every other
+        queued key; otherwise, it is retrieved immediately.
+
+        Args:
+            name (str): The name of the relationship.
+
+        Returns:
+            :class:`RestModel`, :class:`~performline.clients.rest.loader.Deferred`
+        """
+        model, attr = self.relations[name]
+        pk = getattr(self, attr)
+        loader = getattr(self.client, 'loader', None)
+
+        if loader is None:
+            return model.get(self.client, pk)
+
+        return loader.defer(model, pk)
+
     def retrieve(self):
         """
         Refreshes this model's internal representation with the server.
+        Any values assigned since the model was last retrieved are replaced;
+        if there are none and the server confirms (with a 304 response) that
+        the data is unchanged, it is not prepared again.
         """
 
         if self.rest_read_method is None:
@@ -364,10 +643,18 @@ class RestModel(object):
         response = self.client.request(
             self.rest_read_method, self.formatted_path()
         )
+
+        validator = response.validator
+
+        if response.not_modified and validator is not None and \
+                validator == self.__validator:
+            return self
+
         result = response.results(0)
 
         self.set_data(result)
         self.set_metadata(response.metadata)
+        self.__validator = validator
 
         return self
 
@@ -447,21 +734,39 @@ class RestModel(object):
             any
         """
         if not name.startswith('_'):
-            candidate_key = camelize(name, True)
-            value = deep_get(
-                self._data, name, deep_get(self._data, candidate_key)
-            )
+            key = self.__aliases.get(name)
+
+            if key is not None:
+                value = self.__data.get(key)
+            else:
+                value = deep_get(
+                    self._data, name, deep_get(self._data, camelize(name, True))
+                )
 
             if value is not None:
                 return value
 
     def __setattr__(self, name, value):
-        key = u(camelize(name, True))
+        if not name.startswith('_'):
+            data = self.__data
+
+            if isinstance(data, dict):
+                key = u(camelize(name, True))
 
-        if isinstance(self._data, dict):
-            if key in [u(camelize(k, True)) for k in self._data.keys()] or \
-                key in [u(camelize(k, True)) for k in self.fields]:
-                    self._data[key] = value
+                if key in self.__pascal_keys or key in data or \
+                        any(camelize(k, True) == key for k in self.fields):
+                    data[key] = value
+
+                    # the data no longer matches the version it was retrieved as
+                    self.__validator = None
+
+                    if key not in self.__pascal_keys:
+                        self.__aliases, self.__pascal_keys = alias_index(data)
+
+                    # read back from the data (rather than an instance attribute), so that the
+                    # value is replaced when the data is
+                    if not hasattr(self.__class__, name):
+                        return
 
         object.__setattr__(self, name, value)
 
@@ -473,5 +778,172 @@ class RestModel(object):
         return self._data
 
     def __repr__(self):
-        return json.dumps(self._data, indent=4)
+        return jsonify(self._data, indent=2)
+    __str__ = __repr__
+
+
+_compact_classes = {}
+
+
+class CompactModel(object):
+    """
+    A read-only, memory-efficient representation of a single result of a
+    :class:`RestModel` list request.  Values are stored in ``__slots__``
+    (named after the "snake_case" form of each key) rather than in a dict,
+    and can be read by the same attribute names as on the model itself.
+    Nested values are kept exactly as they were received.
+
+    Instances are created with :func:`RestModel.compact_from_result` (or
+    :func:`RestModel.iall` with ``compact=True``); a subclass is generated
+    for each distinct model and set of keys.  Use :func:`to_model` to
+    obtain a full, writable model instance.
+    """
+    __slots__ = ()
+    _model = None
+    _keys = ()
+    _slots = ()
+    _aliases = {}
+
+    def __init__(self, values):
+        for slot, value in zip(self._slots, values):
+            object.__setattr__(self, slot, value)
+
+    @classmethod
+    def for_keys(cls, model, keys):
+        """
+        Returns the compact class for results of the given model that have
+        the given keys, creating it if necessary.
+
+        Args:
+            model (type): A subclass of :class:`RestModel`.
+
+            keys (tuple): The keys of the result elements, in order.
+
+        Returns:
+            type
+        """
+        try:
+            return _compact_classes[(model, keys)]
+        except KeyError:
+            pass
+
+        slots = []
+        aliases = {}
+
+        for i, key in enumerate(keys):
+            slot = underscore(key) if isinstance(key, string_types) else ''
+
+            if not IDENTIFIER.match(slot) or iskeyword(slot) or \
+                    slot in slots or hasattr(cls, slot):
+                slot = '_{0}'.format(i)
+
+            slots.append(slot)
+
+            if isinstance(key, string_types):
+                try:
+                    forms = (underscore(key), camelize(key), camelize(key, True))
+                except IndexError:
+                    forms = ()
+
+                for alias in forms:
+                    aliases.setdefault(alias, slot)
+
+        # exact matches take precedence
+        for key, slot in zip(keys, slots):
+            if isinstance(key, string_types):
+                aliases[key] = slot
+
+        klass = type(
+            str('Compact{0}'.format(model.__name__)),
+            (cls,),
+            {
+                '__slots__': tuple(slots),
+                '_model': model,
+                '_keys': keys,
+                '_slots': tuple(slots),
+                '_aliases': aliases,
+            }
+        )
+
+        if len(_compact_classes) >= CONVERSION_CACHE_SIZE:
+            _compact_classes.clear()
+
+        _compact_classes[(model, keys)] = klass
+        return klass
+
+    @property
+    def pk(self):
+        """
+        Retrieve the value of the model's primary key field.
+
+        Returns:
+            any
+        """
+        return getattr(self, self._model.primary_key)
+
+    @property
+    def sk(self):
+        """
+        Retrieve the value of the model's secondary key field.
+
+        Returns:
+            any
+        """
+        if self._model.secondary_key is None:
+            return None
+
+        return getattr(self, self._model.secondary_key)
+
+    @property
+    def _data(self):
+        """
+        Retrieves the data this instance represents, with its keys as
+        received.
+
+        Returns:
+            dict
+        """
+        return dict(
+            (key, getattr(self, slot))
+            for key, slot in zip(self._keys, self._slots)
+        )
+
+    def to_model(self, client):
+        """
+        Create a full instance of the model this instance was created from.
+
+        Args:
+            client (:class:`~performline.clients.rest.StandardRestClient`):
+            The client the new instance will be bound to.
+
+        Returns:
+            :class:`RestModel`
+        """
+        return self._model(client, self._data)
+
+    def __getattr__(self, name):
+        slot = self._aliases.get(name)
+
+        if slot is not None:
+            return getattr(self, slot)
+
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(
+            "{0} instances are read-only".format(self.__class__.__name__)
+        )
+
+    def __delattr__(self, name):
+        raise AttributeError(
+            "{0} instances are read-only".format(self.__class__.__name__)
+        )
+
+    def __iter__(self):
+        for key, slot in zip(self._keys, self._slots):
+            yield (key, getattr(self, slot))
+
+    def __repr__(self):
+        return jsonify(self._data, indent=2)
     __str__ = __repr__
@@ -1,8 +1,17 @@
 from __future__ import absolute_import
 from six import string_types
 import math
-import json
 from ...utils.dicts import deep_get, must_deep_get
+from ...utils.json import loads
+from ...utils import stats
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover
+    ijson = None
+
+UNDECODED = object()
+RESULT_COUNT_KEY = b'"ResultCount"'
 
 
 class Response(object):
@@ -41,7 +50,7 @@ class Response(object):
         elif hasattr(self, 'data'):
             if isinstance(self.data, (string_types, bytes)):
                 try:
-                    self._payload = json.loads(self.data)
+                    self._payload = loads(self.data)
                 except ValueError:
                     self._payload = self.data
             else:
@@ -137,7 +146,154 @@ class SuccessResponse(Response):
     """
     A subclass of :class:`Response` that provides accessors for fields present in successful REST
     responses.
+
+    If ``data`` is not given, the body of ``response`` is only decoded once the payload is first
+    needed.  The pagination accessors (:func:`total_length`, :func:`length`, :func:`limit` and
+    :func:`offset`) do not require the body to be decoded.
     """
+
+    _result_count = None
+
+    from_cache = False
+    """bool: Whether this response was served from the client's cache."""
+
+    not_modified = False
+    """bool: Whether this cached response was revalidated by the server with a 304 response."""
+
+    stat_tags = None
+    """dict: The tags the decoding time of this response is reported with."""
+
+    @property
+    def etag(self):
+        """
+        Return the value of the response's ``ETag`` header, if any.
+
+        Returns:
+            str, None
+        """
+        if self.response is None:
+            return None
+
+        return self.response.headers.get('ETag')
+
+    @property
+    def last_modified(self):
+        """
+        Return the value of the response's ``Last-Modified`` header, if any.
+
+        Returns:
+            str, None
+        """
+        if self.response is None:
+            return None
+
+        return self.response.headers.get('Last-Modified')
+
+    @property
+    def validator(self):
+        """
+        Return the values that identify this version of the response for conditional requests,
+        or `None` if the server did not provide any.
+
+        Returns:
+            tuple, None
+        """
+        if self.etag is None and self.last_modified is None:
+            return None
+
+        return (self.etag, self.last_modified)
+
+    def __init__(self, response, data=UNDECODED):
+        super(SuccessResponse, self).__init__(response, data)
+
+    @property
+    def payload(self):
+        """
+        Returns the decoded response payload, decoding the response body if that has not yet
+        been done.  See: :func:`Response.payload`.
+        """
+        if self._payload is UNDECODED:
+            self._payload = self._decode()
+
+        return super(SuccessResponse, self).payload
+
+    @property
+    def decoded(self):
+        """
+        Return whether the response body has been decoded.
+
+        Returns:
+            bool
+        """
+        return self._payload is not UNDECODED
+
+    @property
+    def content(self):
+        """
+        Return the raw (undecoded) response body.
+
+        Returns:
+            bytes
+        """
+        if self.response is None or self.response.content is None:
+            return b''
+
+        return self.response.content
+
+    def _decode(self):
+        if len(self.content) == 0:
+            return None
+
+        with stats.time('performline.clients.rest.response.decode.time', tags=self.stat_tags):
+            try:
+                return loads(self.content)
+            except ValueError:
+                return None
+
+    @property
+    def result_count(self):
+        """
+        Return the ``ResultCount`` object describing the size of the result set and the position
+        of this page within it.  If the body has not been decoded yet, this object is read from
+        the raw body (without decoding ``Results``) whenever it can be located unambiguously.
+
+        Returns:
+            dict
+        """
+        if self._result_count is None:
+            counts = None
+
+            if not self.decoded:
+                counts = scan_result_count(self.content)
+
+            if counts is None:
+                payload = self.payload
+
+                if isinstance(payload, dict):
+                    counts = payload.get('ResultCount')
+
+            if not isinstance(counts, dict):
+                counts = {}
+
+            self._result_count = counts
+
+        return self._result_count
+
+    def revalidated(self):
+        """
+        Return a copy of this (cached) response, sharing its decoded payload, indicating that
+        the server has confirmed it is unchanged.
+
+        Returns:
+            :class:`SuccessResponse`
+        """
+        response = SuccessResponse(self.response, self._payload)
+        response._result_count = self._result_count
+        response.stat_tags = self.stat_tags
+        response.from_cache = True
+        response.not_modified = True
+        return response
+
     @property
     def total_length(self):
         """
@@ -146,7 +302,7 @@ class SuccessResponse(Response):
         Returns:
             int
         """
-        return self.deep_get('ResultCount/Total', 0)
+        return self.result_count.get('Total', 0)
 
     @property
     def length(self):
@@ -157,7 +313,7 @@ class SuccessResponse(Response):
         Returns:
             int
         """
-        return self.deep_get('ResultCount/Current', self.total_length)
+        return self.result_count.get('Current', self.total_length)
 
     @property
     def limit(self):
@@ -167,7 +323,7 @@ class SuccessResponse(Response):
         Returns:
             int
         """
-        return self.deep_get('ResultCount/Limit', self.length)
+        return self.result_count.get('Limit', self.length)
 
     @property
     def offset(self):
@@ -178,7 +334,7 @@ class SuccessResponse(Response):
         Returns:
             int
         """
-        return self.deep_get('ResultCount/Offset', 0)
+        return self.result_count.get('Offset', 0)
 
     @property
     def total_pages(self):
@@ -231,6 +387,89 @@ class SuccessResponse(Response):
         else:
             return results
 
+    def iter_results(self, chunk_size=65536):
+        """
+        Iterate over the results of a standard REST response.  If the response body has not been
+        read yet (i.e.: the request was made with ``stream=True``) and the ``ijson`` package is
+        installed, the body is parsed incrementally as it is downloaded, so only one result at a
+        time is held in memory; otherwise, this is equivalent to iterating over :func:`results`.
+
+        Once a streamed body has been parsed, the rest of the payload (e.g.: ``ResultCount``,
+        ``Metadata``) is available as usual, but the results themselves are not retained.
+
+        Args:
+            chunk_size (int): The number of bytes to read from the connection at a time.
+
+        Returns:
+            iterator of dict
+        """
+        if ijson is None or self.decoded or self.response is None or \
+                self.response._content is not False:
+            for result in self.results():
+                yield result
+
+            return
+
+        skeleton = ijson.ObjectBuilder()
+        builder = None
+        in_array = False
+        complete = False
+
+        try:
+            events = ijson.parse(_ChunkReader(self.response.iter_content(chunk_size)),
+                                 use_float=True)
+
+            for prefix, event, value in events:
+                if prefix == 'Results' and event in ('start_array', 'end_array'):
+                    in_array = (event == 'start_array')
+                    skeleton.event(event, value)
+                    continue
+
+                if in_array and prefix.startswith('Results.item'):
+                    depth = 'Results.item'
+                elif prefix == 'Results' or prefix.startswith('Results.'):
+                    # a single (non-list) result
+                    depth = 'Results'
+                else:
+                    skeleton.event(event, value)
+                    continue
+
+                if builder is None:
+                    if event in ('start_map', 'start_array'):
+                        builder = ijson.ObjectBuilder()
+                    else:
+                        if value is not None:
+                            yield value
+
+                        if depth == 'Results':
+                            skeleton.event('start_array', None)
+                            skeleton.event('end_array', None)
+
+                        continue
+
+                builder.event(event, value)
+
+                if prefix == depth and event in ('end_map', 'end_array'):
+                    result, builder = builder.value, None
+                    yield result
+
+                    if depth == 'Results':
+                        skeleton.event('start_array', None)
+                        skeleton.event('end_array', None)
+
+            complete = True
+        finally:
+            if not complete:
+                self.response.close()
+
+        payload = getattr(skeleton, 'value', None)
+
+        if isinstance(payload, dict):
+            payload.pop('Results', None)
+
+        self._payload = payload
+        self._result_count = None
+
     def results_get(self, key, fallback=None, flatten=False, required=False):
         """
         Retrieves a given value from each element in the Results response.
@@ -270,3 +509,66 @@ class SuccessResponse(Response):
                 return values[0]
 
         return values
+
+
+class _ChunkReader(object):
+    """
+    Presents an iterator of byte strings as a readable file-like object.
+    """
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def read(self, size=-1):
+        # parsers read zero bytes to determine whether the file is binary
+        if size == 0:
+            return b''
+
+        for chunk in self.chunks:
+            if chunk:
+                return chunk
+
+        return b''
+
+
+def scan_result_count(content):
+    """
+    Extracts the top-level ``ResultCount`` object from a raw JSON response body without decoding
+    the rest of it.
+
+    Args:
+        content (bytes): The response body.
+
+    Returns:
+        dict, or `None` if the object could not be located unambiguously (in which case the body
+        must be decoded in full).
+    """
+    if not content or content.count(RESULT_COUNT_KEY) != 1:
+        return None
+
+    start = content.index(RESULT_COUNT_KEY)
+
+    # the key must be a member of the outermost object
+    if content.count(b'{', 0, start) - content.count(b'}', 0, start) != 1:
+        return None
+
+    start += len(RESULT_COUNT_KEY)
+    end = content.find(b'}', start)
+
+    if end < 0:
+        return None
+
+    fragment = content[start:end + 1].lstrip()
+
+    if not fragment.startswith(b':'):
+        return None
+
+    try:
+        counts = loads(fragment[1:])
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+    if not isinstance(counts, dict):
+        return None
+
+    return counts
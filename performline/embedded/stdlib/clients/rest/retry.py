@@ -0,0 +1,153 @@
+"""
+Policies for automatically retrying failed requests.
+"""
+from __future__ import absolute_import
+import random
+import time
+from email.utils import parsedate_tz, mktime_tz
+from .exceptions import ErrorResponse, BadGateway
+
+IDEMPOTENT_METHODS = ('get', 'head', 'options', 'put', 'delete')
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+
+class RetryPolicy(object):
+    """
+    Describes whether, and after how long, a failed request should be attempted again.
+
+    Args:
+        max_attempts (int): The total number of times a request will be attempted (including the
+            first).  A value of 1 disables retries.
+
+        backoff_factor (float): The delay (in seconds) before the first retry.  Each subsequent
+            retry waits twice as long as the previous one.
+
+        max_backoff (float): The longest delay (in seconds) computed from ``backoff_factor``.
+
+        jitter (bool): Whether to randomize each delay (between zero and the computed value) so
+            that concurrent clients do not retry in lockstep.
+
+        statuses (tuple): HTTP status codes that should be retried.
+
+        methods (tuple): HTTP methods that may be retried.  By default, only idempotent methods
+            are retried.
+
+        retry_on_connect (bool): Whether failures to connect to the server should be retried.
+
+        respect_retry_after (bool): Whether a ``Retry-After`` header in the response should be
+            used as the delay instead of the computed backoff.
+    """
+
+    def __init__(
+        self,
+        max_attempts=3,
+        backoff_factor=0.5,
+        max_backoff=30.0,
+        jitter=True,
+        statuses=RETRYABLE_STATUSES,
+        methods=IDEMPOTENT_METHODS,
+        retry_on_connect=True,
+        respect_retry_after=True
+    ):
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses = statuses
+        self.methods = methods
+        self.retry_on_connect = retry_on_connect
+        self.respect_retry_after = respect_retry_after
+
+    def should_retry(self, method, attempt, error):
+        """
+        Returns whether a request should be attempted again.
+
+        Args:
+            method (str): The HTTP method of the request.
+
+            attempt (int): The number of the attempt that just failed (starting from 1).
+
+            error (Exception): The exception raised by that attempt.
+
+        Returns:
+            bool
+        """
+        if attempt >= self.max_attempts:
+            return False
+
+        if method.lower() not in self.methods:
+            return False
+
+        if not isinstance(error, ErrorResponse):
+            return False
+
+        status = error_status(error)
+
+        if status is None:
+            return self.retry_on_connect and isinstance(error, BadGateway)
+
+        return status in self.statuses
+
+    def get_delay(self, attempt, error=None):
+        """
+        Returns the number of seconds to wait before the next attempt.
+
+        Args:
+            attempt (int): The number of the attempt that just failed (starting from 1).
+
+            error (Exception, optional): The exception raised by that attempt.
+
+        Returns:
+            float
+        """
+        if self.respect_retry_after:
+            retry_after = parse_retry_after(getattr(error, 'response', None))
+
+            if retry_after is not None:
+                return retry_after
+
+        delay = min(self.backoff_factor * (2 ** (attempt - 1)), self.max_backoff)
+
+        if self.jitter:
+            delay = random.uniform(0, delay)
+
+        return delay
+
+
+def error_status(error):
+    """
+    Returns the HTTP status code of the response that caused the given error, or `None` if no
+    response was received.
+    """
+    response = getattr(error, 'response', None)
+
+    if response is None:
+        return None
+
+    return getattr(response, 'status_code', None)
+
+
+def parse_retry_after(response):
+    """
+    Returns the delay (in seconds) requested by a response's ``Retry-After`` header, which may be
+    either a number of seconds or an HTTP date; or `None` if the header is absent or invalid.
+    """
+    if response is None or getattr(response, 'headers', None) is None:
+        return None
+
+    value = response.headers.get('Retry-After')
+
+    if value is None:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    parsed = parsedate_tz(value)
+
+    if parsed is None:
+        return None
+
+    return max(mktime_tz(parsed) - time.time(), 0.0)
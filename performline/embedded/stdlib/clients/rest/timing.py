@@ -0,0 +1,143 @@
+"""
+Measurement of the phases of a request.
+
+Each request made by :class:`~performline.clients.rest.StandardRestClient` reports its total
+duration as ``performline.clients.rest.request.time``, and the duration of each of its phases as
+``performline.clients.rest.request.<phase>.time``:
+
+``connect``
+    Resolving the host and establishing the connection (including the TLS handshake).  Only
+    reported when a new connection was opened, and only for sessions whose adapter is a
+    :class:`TimedHTTPAdapter` (as the client's default session is).
+
+``ttfb``
+    From sending the request until the response headers were received, excluding the
+    ``connect`` phase where it is measured separately (the asynchronous client includes it).
+
+``download``
+    Reading the response body.
+
+Decoding the body is reported as ``performline.clients.rest.response.decode.time``, and
+constructing model instances from each page of results as
+``performline.clients.rest.models.build.time``.  All durations are in milliseconds, and phases
+are reported whether the request succeeds or fails.
+"""
+from __future__ import absolute_import
+from collections import OrderedDict
+import threading
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from ...utils import stats
+from ...utils.stats import clock_ns
+
+_local = threading.local()
+
+
+def pop_connect_time():
+    """
+    Returns the total time (in nanoseconds) the current thread has spent opening connections
+    since this function was last called, resetting it to zero.
+
+    Returns:
+        int
+    """
+    rv = getattr(_local, 'connect_ns', 0)
+    _local.connect_ns = 0
+    return rv
+
+
+def _record_connect(start):
+    _local.connect_ns = getattr(_local, 'connect_ns', 0) + clock_ns() - start
+
+
+class TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        start = clock_ns()
+
+        try:
+            return super(TimedHTTPConnection, self).connect()
+        finally:
+            _record_connect(start)
+
+
+class TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        start = clock_ns()
+
+        try:
+            return super(TimedHTTPSConnection, self).connect()
+        finally:
+            _record_connect(start)
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """
+    A :class:`requests.adapters.HTTPAdapter` whose connections record how long they take to
+    open (see :func:`pop_connect_time`).
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super(TimedHTTPAdapter, self).init_poolmanager(*args, **kwargs)
+
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TimedHTTPConnectionPool,
+            'https': TimedHTTPSConnectionPool,
+        }
+
+
+class PhaseTimer(object):
+    """
+    Measures consecutive phases of an operation, and reports each as a timing.
+
+    Args:
+        prefix (str): The metric each phase is reported as is ``<prefix>.<phase>.time``.
+
+        tags (dict, optional): Tags to report each phase with.
+    """
+
+    def __init__(self, prefix, tags=None):
+        self.prefix = prefix
+        self.tags = tags
+        self.phases = OrderedDict()
+        self.started = self._last = clock_ns()
+
+    def mark(self, phase):
+        """
+        Ends the named phase, which began when the previous phase ended (or when this timer was
+        created).
+        """
+        now = clock_ns()
+        self.add(phase, now - self._last)
+        self._last = now
+
+    def elapsed(self):
+        """
+        Returns the time (in nanoseconds) since this timer was created.
+        """
+        return clock_ns() - self.started
+
+    def add(self, phase, nanoseconds):
+        """
+        Adds a duration to the named phase.
+        """
+        self.phases[phase] = self.phases.get(phase, 0) + nanoseconds
+
+    def report(self):
+        """
+        Reports the duration of every phase that was measured.
+        """
+        for phase, nanoseconds in self.phases.items():
+            stats.timing(
+                '{0}.{1}.time'.format(self.prefix, phase),
+                nanoseconds / 1e6,
+                tags=self.tags
+            )
@@ -0,0 +1,139 @@
+"""
+Tracing of requests with OpenTelemetry (``opentelemetry-api``, which must be installed
+separately).
+
+Example::
+
+    from performline.clients.rest.tracing import OpenTelemetryHooks
+
+    client = Client(api_key, hooks=OpenTelemetryHooks())
+
+Each attempt of each request is recorded as a ``CLIENT`` span, named for its method and path.
+Every paginated result set retrieved by
+:func:`~performline.clients.rest.StandardRestClient.iter_until` (and therefore by
+:func:`~performline.clients.rest.models.RestModel.iall`) is recorded as a span of its own, with
+the request for each page as its child.  Spans are started in whichever context is current when
+the request is made, so they nest beneath the caller's own spans.
+"""
+from __future__ import absolute_import
+from .hooks import RequestHooks
+
+try:
+    from opentelemetry import trace
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+except ImportError:
+    trace = None
+
+TRACER_NAME = 'performline.clients.rest'
+
+
+class OpenTelemetryHooks(RequestHooks):
+    """
+    Request hooks that record spans with OpenTelemetry.
+
+    Args:
+        tracer_provider (optional): The ``TracerProvider`` to obtain a tracer from.  Defaults to
+            the globally configured provider.
+
+        tracer (optional): The ``Tracer`` to record spans with, instead of obtaining one from
+            ``tracer_provider``.
+    """
+
+    def __init__(self, tracer_provider=None, tracer=None):
+        if trace is None:
+            raise ImportError('The opentelemetry-api package is required to trace requests')
+
+        if tracer is None:
+            tracer = trace.get_tracer(TRACER_NAME, tracer_provider=tracer_provider)
+
+        self.tracer = tracer
+
+    def before_pages(self, event):
+        event.span = self.tracer.start_span(
+            '{0} {1} (paginated)'.format(event.method.upper(), event.path),
+            kind=SpanKind.INTERNAL,
+            attributes=_attributes({
+                'http.request.method': event.method.upper(),
+                'performline.path': event.path,
+                'performline.limit': event.params.get('limit'),
+            })
+        )
+
+    def after_pages(self, event):
+        span = event.span
+
+        if span is None:
+            return
+
+        span.set_attribute('performline.pages', event.pages)
+
+        if event.error is not None:
+            _set_error(span, event.error)
+
+        span.end()
+
+    def before_request(self, event):
+        context = None
+
+        if event.parent is not None and event.parent.span is not None:
+            context = trace.set_span_in_context(event.parent.span)
+
+        event.span = self.tracer.start_span(
+            '{0} {1}'.format(event.method.upper(), event.path),
+            context=context,
+            kind=SpanKind.CLIENT,
+            attributes=_attributes({
+                'http.request.method': event.method.upper(),
+                'url.full': event.url,
+                'performline.path': event.path,
+                'performline.attempt': event.attempt,
+                'performline.offset': event.params.get('offset'),
+                'performline.limit': event.params.get('limit'),
+                'http.request.body.size': event.request_bytes,
+            })
+        )
+
+    def after_response(self, event):
+        self._end(event)
+
+    def on_error(self, event):
+        self._end(event)
+
+    def on_retry(self, event):
+        if event.span is not None:
+            event.span.set_attribute('performline.retry.delay', event.delay)
+
+        self._end(event)
+
+    def _end(self, event):
+        span = event.span
+
+        if span is None:
+            return
+
+        for name, value in _attributes({
+            'http.response.status_code': event.status,
+            'http.response.body.size': event.response_bytes,
+        }).items():
+            span.set_attribute(name, value)
+
+        for phase, ms in event.phases.items():
+            span.set_attribute('performline.{0}.ms'.format(phase), ms)
+
+        if event.error is not None:
+            _set_error(span, event.error)
+
+        span.end()
+
+
+def _attributes(values):
+    """
+    Returns the given span attributes, omitting those without a value.
+    """
+    return dict((k, v) for k, v in values.items() if v is not None)
+
+
+def _set_error(span, error):
+    span.record_exception(error)
+    span.set_attribute('error.type', type(error).__name__)
+    span.set_status(Status(StatusCode.ERROR, str(error)))
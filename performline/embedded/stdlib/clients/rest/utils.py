@@ -1,15 +1,16 @@
 def autopage_fn(i, response, context):
-    limit = context.params.get('limit')
+    # without a limit, pages are as large as the server's default page size
+    limit = context.params.get('limit') or response.limit
     offset = response.offset or 0
 
     if (offset + 1) < response.total_length:
-        if limit is not None:
+        if limit:
             if isinstance(context.params.get('offset'), int):
                 context.params['offset'] += limit
             else:
                 context.params['offset'] = limit
 
-            if context.params['offset'] > response.total_length:
+            if context.params['offset'] >= response.total_length:
                 return True
 
             return False
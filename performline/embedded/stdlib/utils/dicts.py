@@ -3,6 +3,7 @@ Functions for retrieving data from and manipulating dictionaries.
 """
 from __future__ import absolute_import
 from copy import deepcopy
+from six import string_types
 from .strings import camelize, underscore
 
 DATA_ELEMENT_SEPARATOR = '/'
@@ -76,7 +77,7 @@ def camelize_dict(inValue, upperFirst=False):
 
     return mutate_dict(inValue,
                        keyFn=camelize,
-                       keyTypes=(str, unicode),
+                       keyTypes=string_types,
                        upperFirst=upperFirst)
 
 
@@ -95,13 +96,17 @@ def underscore_dict(inValue, joiner='_'):
 
     return mutate_dict(inValue,
                        keyFn=underscore,
-                       keyTypes=(str, unicode),
+                       keyTypes=string_types,
                        joiner=joiner)
 
 
+def _identity(value):
+    return value
+
+
 def mutate_dict(inValue,
-                keyFn=lambda k: k,
-                valueFn=lambda v: v,
+                keyFn=_identity,
+                valueFn=_identity,
                 keyTypes=None,
                 valueTypes=None,
                 **kwargs):
@@ -144,6 +149,9 @@ def mutate_dict(inValue,
         # create the output dict
         outputDict = dict()
 
+        # (the default valueFn is skipped, since most values are primitives)
+        mutateValues = valueFn is not _identity
+
         # for each dict item...
         for k, v in inValue.items():
             # apply the keyFn to some or all of the keys we encounter
@@ -152,8 +160,9 @@ def mutate_dict(inValue,
                 k = keyFn(k, **kwargs)
 
             # apply the valueFn to some or all of the values we encounter
-            if valueTypes is None or (isinstance(valueTypes, tuple) and isinstance(v, valueTypes)):
-                v = valueFn(v)
+            if mutateValues:
+                if valueTypes is None or (isinstance(valueTypes, tuple) and isinstance(v, valueTypes)):
+                    v = valueFn(v)
 
             # recurse depending on the value's type
             #
@@ -161,8 +170,9 @@ def mutate_dict(inValue,
                 # recursively call mutate_dict() for nested dicts
                 outputDict[k] = recurse(v)
             elif isinstance(v, list):
-                # recursively call mutate_dict() for each element in a list
-                outputDict[k] = [recurse(i) for i in v]
+                # recursively call mutate_dict() for each container in a list (anything else
+                # would be returned as-is)
+                outputDict[k] = [recurse(i) if isinstance(i, (dict, list)) else i for i in v]
             else:
                 # set the value straight up
                 outputDict[k] = v
@@ -1,6 +1,19 @@
+"""
+JSON encoding and decoding.
+
+All encoding and decoding is performed by a single backend, selected when this module is imported:
+the first of :data:`BACKENDS` whose underlying library is installed, unless the
+``PERFORMLINE_JSON_BACKEND`` environment variable names a specific one.  The stdlib :mod:`json`
+module is always available, and is also used for any value or option a faster backend cannot
+handle.
+"""
 from __future__ import absolute_import
+from collections import OrderedDict
 from datetime import datetime
 import json
+import os
+
+BACKEND_ENV = 'PERFORMLINE_JSON_BACKEND'
 
 
 def json_serializer(obj):
@@ -13,9 +26,235 @@ def json_serializer(obj):
     raise TypeError("Type not serializable")
 
 
+class JSONBackend(object):
+    """
+    Encodes and decodes JSON using the stdlib :mod:`json` module.  Subclasses wrap faster
+    implementations; their constructors raise `ImportError` if the library is not installed.
+    """
+    name = 'json'
+
+    def loads(self, data):
+        """
+        Decodes a JSON document.
+
+        Args:
+            data (str, bytes): The document; bytes must be UTF-8 encoded.
+
+        Returns:
+            any
+
+        Raises:
+            ValueError
+        """
+        if isinstance(data, bytes):
+            data = data.decode('utf-8')
+
+        return json.loads(data)
+
+    def dumps(self, obj, indent=None, sort_keys=False):
+        """
+        Encodes a value as JSON.  :class:`~datetime.datetime` values are encoded as ISO 8601
+        strings.
+
+        Args:
+            obj (any): The value to encode.
+
+            indent (int, optional): If set, pretty-print the output with this many spaces of
+                indentation.  Only an indent of 2 is supported by every backend; others may
+                fall back to the stdlib.
+
+            sort_keys (bool): Whether to output the keys of dicts in sorted order.
+
+        Returns:
+            str
+
+        Raises:
+            TypeError, ValueError
+        """
+        return json.dumps(obj, indent=indent, sort_keys=sort_keys, default=json_serializer)
+
+
+class OrjsonBackend(JSONBackend):
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self.orjson = orjson
+
+    def loads(self, data):
+        return self.orjson.loads(data)
+
+    def dumps(self, obj, indent=None, sort_keys=False):
+        option = 0
+
+        if indent is not None:
+            if indent != 2:
+                raise ValueError('orjson only supports an indent of 2')
+
+            option |= self.orjson.OPT_INDENT_2
+
+        if sort_keys:
+            option |= self.orjson.OPT_SORT_KEYS
+
+        return self.orjson.dumps(obj, default=json_serializer, option=option).decode('utf-8')
+
+
+class UjsonBackend(JSONBackend):
+    name = 'ujson'
+
+    def __init__(self):
+        import ujson
+        self.ujson = ujson
+
+    def loads(self, data):
+        return self.ujson.loads(data)
+
+    def dumps(self, obj, indent=None, sort_keys=False):
+        return self.ujson.dumps(
+            obj,
+            indent=(indent or 0),
+            sort_keys=sort_keys,
+            escape_forward_slashes=False,
+            default=json_serializer
+        )
+
+
+class RapidjsonBackend(JSONBackend):
+    name = 'rapidjson'
+
+    def __init__(self):
+        import rapidjson
+        self.rapidjson = rapidjson
+
+    def loads(self, data):
+        return self.rapidjson.loads(data)
+
+    def dumps(self, obj, indent=None, sort_keys=False):
+        return self.rapidjson.dumps(
+            obj,
+            indent=indent,
+            sort_keys=sort_keys,
+            default=json_serializer
+        )
+
+
+# in order of preference
+BACKENDS = OrderedDict([
+    ('orjson', OrjsonBackend),
+    ('ujson', UjsonBackend),
+    ('rapidjson', RapidjsonBackend),
+    ('json', JSONBackend),
+])
+
+STDLIB = JSONBackend()
+backend = STDLIB
+
+
+def register_backend(name, backend_class, preferred=False):
+    """
+    Adds a backend to :data:`BACKENDS`.  This does not change the selected backend; see
+    :func:`select_backend`.
+
+    Args:
+        name (str): The name the backend is selected by.
+
+        backend_class (type): A subclass of :class:`JSONBackend`.
+
+        preferred (bool): Whether the backend should be preferred over all others when one is
+            selected automatically.
+    """
+    BACKENDS[name] = backend_class
+
+    if preferred:
+        for other in [n for n in BACKENDS if n != name]:
+            BACKENDS[other] = BACKENDS.pop(other)
+
+
+def select_backend(name=None):
+    """
+    Selects the backend used by :func:`loads`, :func:`dumps` and :func:`jsonify`.
+
+    Args:
+        name (str, optional): The name of the backend to use.  If not given, the value of the
+            ``PERFORMLINE_JSON_BACKEND`` environment variable is used, and if that is not set,
+            the first available backend in :data:`BACKENDS` is selected.
+
+    Returns:
+        :class:`JSONBackend`
+
+    Raises:
+        ValueError if the named backend does not exist, ImportError if its library is not
+        installed.
+    """
+    global backend
+
+    if name is None:
+        name = os.environ.get(BACKEND_ENV) or None
+
+    if name is not None:
+        if name not in BACKENDS:
+            raise ValueError('Unknown JSON backend {0!r}'.format(name))
+
+        backend = BACKENDS[name]()
+        return backend
+
+    for backend_class in BACKENDS.values():
+        try:
+            backend = backend_class()
+            return backend
+        except ImportError:
+            continue
+
+    backend = STDLIB
+    return backend
+
+
+def loads(data):
+    """
+    Decodes a JSON document using the selected backend.  See: :func:`JSONBackend.loads`.
+    """
+    try:
+        return backend.loads(data)
+    except ValueError:
+        # e.g.: integers or values (NaN) the backend does not support
+        if backend is STDLIB:
+            raise
+
+        return STDLIB.loads(data)
+
+
+def dumps(obj, indent=None, sort_keys=False):
+    """
+    Encodes a value as JSON using the selected backend.  See: :func:`JSONBackend.dumps`.
+    """
+    try:
+        return backend.dumps(obj, indent=indent, sort_keys=sort_keys)
+    except (TypeError, ValueError, OverflowError):
+        if backend is STDLIB:
+            raise
+
+        return STDLIB.dumps(obj, indent=indent, sort_keys=sort_keys)
+
+
 def jsonify(input, **kwargs):
-    kwargs.update({
-        'default': json_serializer,
-    })
+    """
+    Encodes a value as JSON.  Options other than ``indent`` and ``sort_keys`` are passed to
+    :func:`json.dumps`, bypassing the selected backend.
+
+    Returns:
+        str
+    """
+    if set(kwargs) - set(['indent', 'sort_keys']):
+        kwargs.update({
+            'default': json_serializer,
+        })
+
+        return json.dumps(input, **kwargs)
+
+    return dumps(input, **kwargs)
+
 
-    return json.dumps(input, **kwargs)
+try:
+    select_backend()
+except (ImportError, ValueError):
+    backend = STDLIB
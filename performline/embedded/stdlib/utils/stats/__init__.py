@@ -2,14 +2,197 @@
 Application monitoring and timeseries data collection utilities
 """
 from __future__ import absolute_import
+import atexit
+from functools import wraps
+import os
+import random
 import re
-from copy import deepcopy
-import datetime
+import threading
+import weakref
 import statsd
+from six import string_types
 from ..dicts import compact
 
+# clock_ns() returns the value (in nanoseconds) of a high-resolution, monotonic clock; only the
+# difference between two values is meaningful
+try:
+    from time import perf_counter_ns as clock_ns
+except ImportError:  # pragma: no cover
+    from timeit import default_timer as _timer
+
+    def clock_ns():
+        return int(_timer() * 1e9)
+
 TAG_VALUE_REPLACE = re.compile('[^0-9a-zA-Z\-\.]')
 
+METRIC_NAME_CACHE_SIZE = 4096
+"""int: The maximum number of formatted metric names each :class:`Stats` instance remembers."""
+
+# every live buffer is flushed when the interpreter exits
+_buffers = weakref.WeakSet()
+
+
+class StatsBuffer(object):
+    """
+    Aggregates observations in memory and sends them to a StatsD service in batches from a
+    background thread, so that recording an observation never waits on the network.
+
+    Counter increments are summed per metric (and sample rate), gauges collapse to their net
+    value, and timings are queued individually.  The buffer is flushed every ``interval``
+    seconds, as soon as ``max_size`` observations have been recorded since the last flush, and
+    when the process exits.  Flushed lines are packed into packets of at most
+    ``max_packet_size`` bytes.
+
+    Args:
+        send (func): Called with each packet (str) to send.
+
+        interval (float): The number of seconds between flushes.
+
+        max_size (int): The number of buffered observations that triggers an early flush.
+
+        max_packet_size (int): The maximum size of a single packet.
+    """
+
+    def __init__(self, send, interval=1.0, max_size=1000, max_packet_size=512):
+        self.send = send
+        self.interval = interval
+        self.max_size = max_size
+        self.max_packet_size = max_packet_size
+        self.lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._reset()
+        _buffers.add(self)
+
+    def _reset(self):
+        self.counters = {}
+        self.gauges = {}
+        self.timings = []
+        self.size = 0
+
+    def count(self, name, value, rate=1.0):
+        """
+        Buffers a counter increment (or, if negative, decrement).
+        """
+        key = (name, rate)
+
+        with self.lock:
+            self._check_process()
+            self.counters[key] = self.counters.get(key, 0) + value
+            self._added()
+
+    def gauge(self, name, value, delta=False):
+        """
+        Buffers a gauge value, or a change to it if ``delta`` is true.
+        """
+        with self.lock:
+            self._check_process()
+            current = self.gauges.get(name)
+
+            if delta and current is not None:
+                self.gauges[name] = (current[0] + value, current[1])
+            else:
+                self.gauges[name] = (value, delta)
+
+            self._added()
+
+    def timing(self, name, milliseconds, rate=1.0):
+        """
+        Buffers a timing.
+        """
+        line = '{0}:{1:0.6f}|ms'.format(name, milliseconds)
+
+        if rate < 1:
+            line += '|@{0}'.format(rate)
+
+        with self.lock:
+            self._check_process()
+            self.timings.append(line)
+            self._added()
+
+    def _added(self):
+        self.size += 1
+
+        if self.size >= self.max_size:
+            self._wake.set()
+
+    def _check_process(self):
+        # (re)start the flushing thread in this process; after a fork, the child discards the
+        # observations it inherited (the parent will send them)
+        pid = os.getpid()
+
+        if self._pid != pid:
+            if self._pid is not None:
+                self._reset()
+
+            self._pid = pid
+            self._wake = threading.Event()
+            self._thread = threading.Thread(target=self._run, name='performline-stats-flush')
+            self._thread.daemon = True
+            self._thread.start()
+
+    def _run(self):
+        wake = self._wake
+
+        while True:
+            wake.wait(self.interval)
+            wake.clear()
+            self.flush()
+
+    def lines(self):
+        """
+        Removes and returns all buffered observations, formatted as StatsD lines.
+
+        Returns:
+            list of str
+        """
+        with self.lock:
+            counters, gauges, timings = self.counters, self.gauges, self.timings
+            self._reset()
+
+        rv = []
+
+        for (name, rate), value in counters.items():
+            line = '{0}:{1}|c'.format(name, value)
+
+            if rate < 1:
+                line += '|@{0}'.format(rate)
+
+            rv.append(line)
+
+        for name, (value, delta) in gauges.items():
+            if delta:
+                rv.append('{0}:{1}{2}|g'.format(name, '+' if value >= 0 else '', value))
+            else:
+                # a leading sign would be read as a delta, so negative values are set from zero
+                if value < 0:
+                    rv.append('{0}:0|g'.format(name))
+
+                rv.append('{0}:{1}|g'.format(name, value))
+
+        rv.extend(timings)
+
+        return rv
+
+    def flush(self):
+        """
+        Sends all buffered observations.
+        """
+        packet = ''
+
+        for line in self.lines():
+            if packet and len(packet) + len(line) + 1 > self.max_packet_size:
+                self.send(packet)
+                packet = line
+            elif packet:
+                packet += '\n' + line
+            else:
+                packet = line
+
+        if packet:
+            self.send(packet)
+
 
 class Stats(object):
     """
@@ -28,16 +211,71 @@ class Stats(object):
             OpenTSDB, KairosDB).
 
         enabled (bool): Whether metrics submission is enabled by default.
+
+        buffered (bool): Whether observations are aggregated and sent in batches by a
+            :class:`StatsBuffer` (rather than each being sent immediately as its own packet).
+
+        flush_interval (float): The number of seconds between flushes of the buffer.
+
+        max_buffer_size (int): The number of buffered observations that triggers an early flush.
     """
 
-    def __init__(self, host='localhost', port=8125, prefix=None, tags=None, enabled=True):
+    def __init__(
+        self,
+        host='localhost',
+        port=8125,
+        prefix=None,
+        tags=None,
+        enabled=True,
+        buffered=True,
+        flush_interval=1.0,
+        max_buffer_size=1000
+    ):
         self.host = host
         self.port = port
+        self._names = {}
         self.prefix = prefix
         self.tags = tags
         self._statsd = statsd.StatsClient(self.host, self.port)
         self.enabled = enabled
 
+        if buffered:
+            self.buffer = StatsBuffer(
+                self._send,
+                interval=flush_interval,
+                max_size=max_buffer_size
+            )
+        else:
+            self.buffer = None
+
+    @property
+    def prefix(self):
+        return self._prefix
+
+    @prefix.setter
+    def prefix(self, value):
+        self._prefix = value
+        self._names.clear()
+
+    @property
+    def tags(self):
+        return self._tags
+
+    @tags.setter
+    def tags(self, value):
+        self._tags = value
+        self._names.clear()
+
+    def _send(self, packet):
+        self._statsd._send(packet)
+
+    def flush(self):
+        """
+        Sends all buffered observations immediately.
+        """
+        if self.buffer is not None:
+            self.buffer.flush()
+
     def enable(self):
         self.enabled = True
 
@@ -58,15 +296,31 @@ class Stats(object):
         Returns:
             str
         """
-        if isinstance(self.prefix, (str, unicode)):
+        try:
+            key = (metric, frozenset(additional_tags.items()) if additional_tags else None)
+            return self._names[key]
+        except KeyError:
+            pass
+        except (TypeError, AttributeError):
+            # unhashable (or non-dict) tags are formatted every time
+            return self._format_metric_name(metric, additional_tags)
+
+        name = self._format_metric_name(metric, additional_tags)
+
+        if len(self._names) >= METRIC_NAME_CACHE_SIZE:
+            self._names.clear()
+
+        self._names[key] = name
+
+        return name
+
+    def _format_metric_name(self, metric, additional_tags=None):
+        if isinstance(self.prefix, string_types):
             prefix = str(self.prefix).strip('.')
             metric = prefix + '.' + str(metric)
 
         tagset = []
-        tags = deepcopy(self.tags)
-
-        if not isinstance(tags, dict):
-            tags = {}
+        tags = dict(self.tags) if isinstance(self.tags, dict) else {}
 
         if isinstance(additional_tags, dict):
             tags.update(additional_tags)
@@ -101,7 +355,7 @@ class Stats(object):
             None
         """
         if self.enabled:
-            self._statsd.incr(self.get_metric_name(metric, tags), value, rate=rate)
+            self._count(metric, value, rate, tags)
 
     def decrement(self, metric, value=1, rate=1.0, tags=None):
         """
@@ -121,7 +375,7 @@ class Stats(object):
             None
         """
         if self.enabled:
-            self._statsd.decr(self.get_metric_name(metric, tags), value, rate=rate)
+            self._count(metric, -value, rate, tags)
 
     def timing(self, metric, milliseconds, rate=1.0, tags=None):
         """
@@ -141,9 +395,10 @@ class Stats(object):
             None
         """
         if self.enabled:
-            self._statsd.timing(self.get_metric_name(metric, tags),
-                                milliseconds,
-                                rate=rate)
+            if self.buffer is None:
+                self._statsd.timing(self.get_metric_name(metric, tags), milliseconds, rate=rate)
+            elif _sampled(rate):
+                self.buffer.timing(self.get_metric_name(metric, tags), milliseconds, rate)
 
     def gauge(self, metric, value, delta=False, rate=1.0, tags=None):
         """
@@ -166,10 +421,23 @@ class Stats(object):
             None
         """
         if self.enabled:
-            self._statsd.gauge(self.get_metric_name(metric, tags),
-                               value,
-                               rate=rate,
-                               delta=delta)
+            if self.buffer is None:
+                self._statsd.gauge(self.get_metric_name(metric, tags),
+                                   value,
+                                   rate=rate,
+                                   delta=delta)
+            elif _sampled(rate):
+                self.buffer.gauge(self.get_metric_name(metric, tags), value, delta)
+
+    def _count(self, metric, value, rate, tags):
+        if self.buffer is None:
+            self._statsd.incr(self.get_metric_name(metric, tags), value, rate=rate)
+        elif _sampled(rate):
+            self.buffer.count(self.get_metric_name(metric, tags), value, rate)
+
+
+def _sampled(rate):
+    return rate >= 1 or random.random() < rate
 
 
 default = Stats(enabled=True)
@@ -191,80 +459,129 @@ def disable():
     default.disable()
 
 
-def configure(host=None, port=None, prefix=None, tags=None):
+def configure(
+    host=None,
+    port=None,
+    prefix=None,
+    tags=None,
+    buffered=None,
+    flush_interval=None,
+    max_buffer_size=None
+):
     """
-    Configure the default global statistics collector.
+    Configure the default global statistics collector.  Observations still buffered by the
+    previous collector are sent first.
 
     See :class:`Stats`
     """
     global default
+    default.flush()
     default = Stats(**compact({
         'host': host,
         'port': port,
         'prefix': prefix,
         'tags': tags,
+        'buffered': buffered,
+        'flush_interval': flush_interval,
+        'max_buffer_size': max_buffer_size,
     }))
 
 
+def flush():
+    """
+    Sends all observations buffered by the default global statistics collector.
+    """
+    default.flush()
+
+
+# the module-level functions return immediately when the default collector is disabled, so
+# that instrumentation costs (nearly) nothing
+
+
 def increment(*args, **kwargs):
     """
     See: :func:`Stats.increment`
     """
-    global default
-    default.increment(*args, **kwargs)
+    if default.enabled:
+        default.increment(*args, **kwargs)
 
 
 def decrement(*args, **kwargs):
     """
     See: :func:`Stats.decrement`
     """
-    global default
-    default.decrement(*args, **kwargs)
+    if default.enabled:
+        default.decrement(*args, **kwargs)
 
 
 def timing(*args, **kwargs):
     """
     See: :func:`Stats.timing`
     """
-    global default
-    default.timing(*args, **kwargs)
+    if default.enabled:
+        default.timing(*args, **kwargs)
 
 
 def gauge(*args, **kwargs):
     """
     See: :func:`Stats.gauge`
     """
-    global default
-    default.gauge(*args, **kwargs)
+    if default.enabled:
+        default.gauge(*args, **kwargs)
+
+
+@atexit.register
+def _flush_all():
+    for buffer in list(_buffers):
+        buffer.flush()
 
 
 class time(object):  # noqa
+    """
+    Reports the duration of a block (when used as a context manager) or of each call to a
+    function (when used as a decorator) as a timing, whether it completes or raises.  Durations
+    are measured with :func:`clock_ns`, so they are unaffected by changes to the system clock.
+
+    Args:
+        metric (str): The metric to report the duration as.
+
+        rate (float): Sample rate.
+
+        tags (dict, optional): Additional tags to help specify this observation.
+
+    Attributes:
+        elapsed_ms (float): The duration (in milliseconds) of the last timed block.
+    """
+
     def __init__(self, metric, rate=1.0, tags=None):
         self.metric_name = metric
         self.rate = rate
         self.tags = tags
+        self._block_time_start = None
+        self.elapsed_ms = None
 
     def __call__(self, view_func):
+        @wraps(view_func)
         def wrap(*args, **kwargs):
-            self.__enter__()
-            rv = view_func(*args, **kwargs)
-            self.__exit__()
-            return rv
+            # each call gets its own timer so that concurrent calls don't share a start time
+            with time(self.metric_name, rate=self.rate, tags=self.tags):
+                return view_func(*args, **kwargs)
 
         return wrap
 
     def __enter__(self):
-        self._block_time_start = datetime.datetime.now()
+        self._block_time_start = clock_ns()
         return self
 
     def __exit__(self, *args):
-        if self.metric_name and self._block_time_start:
-            global default
-            delta = datetime.datetime.now() - self._block_time_start
-            delta_ms = (delta.total_seconds() * 1000.0)
-            default.timing(
-                self.metric_name,
-                delta_ms,
-                rate=self.rate,
-                tags=self.tags
-            )
+        if self._block_time_start is not None:
+            self.elapsed_ms = (clock_ns() - self._block_time_start) / 1e6
+            self._block_time_start = None
+
+            if self.metric_name:
+                timing(
+                    self.metric_name,
+                    self.elapsed_ms,
+                    rate=self.rate,
+                    tags=self.tags
+                )
@@ -0,0 +1,137 @@
+"""
+Compact histograms of non-negative integer observations (such as latencies in microseconds).
+"""
+from __future__ import absolute_import
+import math
+
+SUB_BUCKET_BITS = 5
+"""int: Each power of two is divided into ``2 ** SUB_BUCKET_BITS`` buckets of equal width, so
+a value is recorded to within about 3% of itself."""
+
+
+class Histogram(object):
+    """
+    A histogram in the style of HdrHistogram: values below ``2 ** SUB_BUCKET_BITS`` are counted
+    exactly, and larger values in logarithmically-sized buckets with a fixed relative precision.
+    Only buckets that have been used are stored, so a histogram of latencies between one
+    microsecond and one minute never holds more than about 800 counters.
+
+    The minimum, maximum, and sum of all values are kept exactly.  Instances are not thread-safe;
+    callers recording from several threads must hold a lock.
+    """
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def record(self, value, count=1):
+        """
+        Records ``count`` observations of ``value`` (negative values are recorded as zero).
+        """
+        value = max(int(value), 0)
+        index = bucket_index(value)
+
+        self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += count
+        self.total += value * count
+
+        if self.min is None or value < self.min:
+            self.min = value
+
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        """
+        Adds every observation recorded by another histogram to this one.
+        """
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+
+        self.count += other.count
+        self.total += other.total
+
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def mean(self):
+        """
+        Returns the mean of all recorded values, or `None` if none have been recorded.
+        """
+        if not self.count:
+            return None
+
+        return float(self.total) / self.count
+
+    def percentile(self, q):
+        """
+        Returns the value below which ``q`` percent of observations fall, or `None` if none have
+        been recorded.
+
+        Args:
+            q (float): A percentile between 0 and 100.
+
+        Returns:
+            float
+        """
+        return self.percentiles([q])[0]
+
+    def percentiles(self, qs):
+        """
+        Returns the value for each of several percentiles (see :func:`percentile`).
+
+        Returns:
+            list of float
+        """
+        if not self.count:
+            return [None] * len(qs)
+
+        ranks = [max(1, min(self.count, int(math.ceil(q / 100.0 * self.count)))) for q in qs]
+        order = sorted(range(len(ranks)), key=ranks.__getitem__)
+        rv = [None] * len(qs)
+        seen = 0
+        i = 0
+
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+
+            while i < len(order) and ranks[order[i]] <= seen:
+                low, high = bucket_range(index)
+                value = (low + high) / 2.0
+                rv[order[i]] = float(min(max(value, self.min), self.max))
+                i += 1
+
+            if i == len(order):
+                break
+
+        return rv
+
+
+def bucket_index(value):
+    """
+    Returns the index of the bucket that counts ``value``.
+    """
+    if value < (1 << SUB_BUCKET_BITS):
+        return value
+
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+
+    return ((shift + 1) << SUB_BUCKET_BITS) + (value >> shift) - (1 << SUB_BUCKET_BITS)
+
+
+def bucket_range(index):
+    """
+    Returns the lowest and highest values counted by the bucket with the given index.
+    """
+    if index < (1 << SUB_BUCKET_BITS):
+        return (index, index)
+
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    mantissa = (index & ((1 << SUB_BUCKET_BITS) - 1)) + (1 << SUB_BUCKET_BITS)
+
+    return (mantissa << shift, ((mantissa + 1) << shift) - 1)
@@ -10,10 +10,25 @@ WORD_OMIT = r'[\W\s\_\-]+'
 WORD_SPLIT = re.compile(r'(?:([A-Z][^A-Z]*)|' + WORD_OMIT + ')')
 CAMEL_STRIP = re.compile(WORD_OMIT)
 
+# converted key names are memoized, since API payloads reuse the same few dozen keys over and over;
+# once this many distinct conversions have been cached the table is emptied and refilled.
+CONVERSION_CACHE_SIZE = 4096
+
+_camelized = {}
+_underscored = {}
+
+
+def _remember(cache, key, value):
+    if len(cache) >= CONVERSION_CACHE_SIZE:
+        cache.clear()
+
+    cache[key] = value
+    return value
+
 
 def camelize(value, upperFirst=False):
     """
-    Convert a string into "camelCase" or "PascalCase".
+    Convert a string into "camelCase" or "PascalCase".  Results are cached.
 
     Args:
         value (str): The string to convert.
@@ -24,7 +39,13 @@ def camelize(value, upperFirst=False):
     Returns:
         str
     """
+    try:
+        return _camelized[(value, upperFirst)]
+    except KeyError:
+        return _remember(_camelized, (value, upperFirst), _camelize(value, upperFirst))
+
 
+def _camelize(value, upperFirst=False):
     # split on word-separating characters (and discard them), or on capital
     # letters (preserving them)
     value = WORD_SPLIT.split(value)
@@ -36,7 +57,7 @@ def camelize(value, upperFirst=False):
     value = ''.join(x.title() for x in value)
 
     # do a final pass removing omitted characters from the value
-    value = re.sub(WORD_OMIT, '', value)
+    value = CAMEL_STRIP.sub('', value)
 
     if upperFirst:
         # return PascalCase
@@ -48,7 +69,7 @@ def camelize(value, upperFirst=False):
 
 def underscore(value, joiner='_'):
     """
-    Convert a string into "snake_case" (words separated by underscores).
+    Convert a string into "snake_case" (words separated by underscores).  Results are cached.
 
     Args:
         value (str): The string to convert.
@@ -59,6 +80,13 @@ def underscore(value, joiner='_'):
     Returns:
         str
     """
+    try:
+        return _underscored[(value, joiner)]
+    except KeyError:
+        return _remember(_underscored, (value, joiner), _underscore(value, joiner))
+
+
+def _underscore(value, joiner='_'):
     # split on word-separating characters (and discard them), or on capital
     # letters (preserving them)
     value = WORD_SPLIT.split(value)
@@ -2,7 +2,17 @@
 Functions for performing thread-safe operations.
 """
 from __future__ import absolute_import
+from collections import deque
+from itertools import islice
 from multiprocessing import RawValue, Lock
+from multiprocessing.pool import ThreadPool
+import sys
+import time
+from six import reraise
+from six.moves.queue import Queue
+
+# a clock that is shared by all processes on a host (where available)
+_clock = getattr(time, 'monotonic', time.time)
 
 
 class Counter(object):
@@ -21,3 +31,176 @@ class Counter(object):
 
     def __int__(self):
         return int(self.value)
+
+
+class TokenBucket(object):
+    """
+    A token bucket rate limiter that can be shared by any number of threads.  Like
+    :class:`Counter`, its state lives in shared memory, so an instance created before forking is
+    also shared by the child processes.
+
+    Tokens are added continuously at ``rate`` per second, up to a maximum of ``burst``.  Callers
+    that ask for more tokens than are available reserve them anyway and are told how long to wait,
+    so concurrent callers are served in the order they arrived.
+
+    Args:
+        rate (float): The number of tokens added per second (i.e.: the sustained rate of requests).
+
+        burst (int): The maximum number of tokens that can accumulate while idle (i.e.: how many
+            requests may be made at once before the rate applies).
+    """
+
+    def __init__(self, rate, burst=1):
+        if rate <= 0:
+            raise ValueError('Rate must be greater than zero')
+
+        self.rate = float(rate)
+        self.burst = float(max(burst, 1))
+        self.tokens = RawValue('d', self.burst)
+        self.updated = RawValue('d', _clock())
+        self.lock = Lock()
+
+    def reserve(self, tokens=1):
+        """
+        Takes ``tokens`` from the bucket, returning the number of seconds the caller must wait
+        before using them.
+
+        Returns:
+            float
+        """
+        with self.lock:
+            now = _clock()
+            available = self.tokens.value + (now - self.updated.value) * self.rate
+
+            self.tokens.value = min(available, self.burst) - tokens
+            self.updated.value = now
+
+            if self.tokens.value >= 0:
+                return 0.0
+
+            return -self.tokens.value / self.rate
+
+    def acquire(self, tokens=1):
+        """
+        Takes ``tokens`` from the bucket, sleeping until they may be used.
+
+        Returns:
+            float; the number of seconds spent waiting.
+        """
+        wait = self.reserve(tokens)
+
+        if wait > 0:
+            time.sleep(wait)
+
+        return wait
+
+
+def imap_bounded(fn, iterable, concurrency=4):
+    """
+    Calls ``fn`` on each element of ``iterable`` using a pool of worker threads, yielding the
+    results in the same order as the input.  No more than ``concurrency`` calls will be in flight
+    (or waiting to be consumed) at any given time, so memory use stays bounded even if the consumer
+    is slower than the workers.
+
+    The pool is created when the returned generator is first advanced, and is shut down as soon
+    as the generator is exhausted, fails, or is closed; calls that have not started by then are
+    never made.
+
+    Args:
+        fn (func): The function to call with each element.
+
+        iterable (iterable): The values to pass to ``fn``.
+
+        concurrency (int): The maximum number of simultaneous calls to ``fn``.
+
+    Returns:
+        generator
+
+    Raises:
+        Any exception raised by ``fn`` is re-raised when its result would have been yielded.
+    """
+    concurrency = max(int(concurrency or 1), 1)
+    values = iter(iterable)
+    pool = None
+
+    try:
+        pending = deque()
+
+        for value in islice(values, concurrency):
+            if pool is None:
+                pool = ThreadPool(concurrency)
+
+            pending.append(pool.apply_async(fn, (value,)))
+
+        while len(pending):
+            result = pending.popleft().get()
+
+            for value in islice(values, 1):
+                pending.append(pool.apply_async(fn, (value,)))
+
+            yield result
+    finally:
+        if pool is not None:
+            # discards the calls that have not started, and waits for those that have
+            pool.terminate()
+            pool.join()
+
+
+def imap_unordered_bounded(fn, iterable, concurrency=4):
+    """
+    Like :func:`imap_bounded`, but yields each result as soon as it is available rather than in
+    the order of the input.  A slow call therefore never holds back the results of calls that
+    were started after it.
+
+    Args:
+        fn (func): The function to call with each element.
+
+        iterable (iterable): The values to pass to ``fn``.
+
+        concurrency (int): The maximum number of simultaneous calls to ``fn``.
+
+    Returns:
+        generator
+
+    Raises:
+        Any exception raised by ``fn`` is re-raised when it would have been yielded; no further
+        calls are started afterwards.
+    """
+    concurrency = max(int(concurrency or 1), 1)
+    values = iter(iterable)
+    done = Queue()
+    pool = None
+
+    def call(value):
+        try:
+            done.put((True, fn(value)))
+        except Exception:
+            done.put((False, sys.exc_info()))
+
+    try:
+        in_flight = 0
+
+        for value in islice(values, concurrency):
+            if pool is None:
+                pool = ThreadPool(concurrency)
+
+            pool.apply_async(call, (value,))
+            in_flight += 1
+
+        while in_flight:
+            ok, result = done.get()
+            in_flight -= 1
+
+            if not ok:
+                reraise(*result)
+
+            for value in islice(values, 1):
+                pool.apply_async(call, (value,))
+                in_flight += 1
+
+            yield result
+    finally:
+        if pool is not None:
+            # discards the calls that have not started, and waits for those that have
+            pool.terminate()
+            pool.join()
@@ -0,0 +1,571 @@
+# Copyright (c) 2016, PerformLine, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the company nor the
+#       names of its contributors may be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL PERFORMLINE, INC. BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+Export of (paginated) model listings to columnar formats.
+
+Records are gathered into :class:`ColumnBatch` objects of a bounded size as they are read, so
+exports of any size use a constant amount of memory.  Batches can be converted to ``pyarrow``
+record batches, NumPy record arrays or pandas data frames, and are written incrementally to
+Parquet, Feather (Arrow IPC) or CSV files.  Parquet and Feather require the ``pyarrow`` package;
+CSV output and plain Python batches do not.
+
+The schema of a Parquet or Feather file is fixed once its first batch is written.  Column types
+are inferred from the values that are present, across as many batches as it takes for every
+column to have one (up to ``infer_rows`` records); columns holding both integers and floats are
+floats.  Values that a later batch cannot be converted to the schema without loss (e.g.: a float
+in an integer column) raise a `ValueError`, and can be avoided by passing a ``schema``::
+
+    export(client.items(), 'items.parquet', schema={'Score': pyarrow.float64()})
+
+Example::
+
+    export(client.items(), 'items.parquet')
+
+    # or, reading the listing with compact models
+    export_model(client, Item, 'items.csv', params={'limit': 1000})
+
+    for batch in iter_batches(client.calls(), batch_size=5000):
+        frame = batch.to_pandas()
+"""
+from __future__ import absolute_import
+from collections import OrderedDict
+import csv
+import io
+import numbers
+from .embedded.stdlib.utils.json import jsonify
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+DEFAULT_BATCH_SIZE = 10000
+DEFAULT_PAGE_SIZE = 1000
+DEFAULT_INFER_ROWS = 10 * DEFAULT_BATCH_SIZE
+
+
+class ColumnBatch(object):
+    """
+    A batch of records stored column-wise, as lists of values.  Nested values (dicts and lists)
+    are stored as JSON strings.
+
+    Args:
+        columns (OrderedDict): Maps each column name to its list of values; all lists must have
+            the same length.
+    """
+
+    def __init__(self, columns):
+        self.columns = columns
+
+    @property
+    def names(self):
+        return list(self.columns)
+
+    def __len__(self):
+        for values in self.columns.values():
+            return len(values)
+
+        return 0
+
+    def to_arrow(self, schema=None):
+        """
+        Returns this batch as a ``pyarrow.RecordBatch``.
+
+        Args:
+            schema (``pyarrow.Schema``, optional): The schema the batch must conform to.  Values
+                are converted to the type of their column, and values that do not fit a
+                string-typed column are converted with `str`.  By default, column types are
+                inferred (see: :func:`infer_schema`).
+
+        Returns:
+            ``pyarrow.RecordBatch``
+
+        Raises:
+            ValueError: If a value cannot be converted to the type of its column without loss.
+        """
+        _require(pyarrow, 'pyarrow')
+
+        if schema is None:
+            schema = infer_schema([self])
+
+        arrays = [
+            _arrow_array(name, self.columns[name], schema.field(name).type)
+            for name in schema.names
+        ]
+
+        return pyarrow.RecordBatch.from_arrays(arrays, schema=schema)
+
+    def to_numpy(self):
+        """
+        Returns this batch as a NumPy record array.  Columns of integers, floats or booleans get
+        the corresponding NumPy types (integer and boolean columns with missing values become
+        floats and objects, respectively, and missing floats become ``nan``); all other columns
+        are object arrays.
+
+        Returns:
+            ``numpy.recarray``
+        """
+        _require(numpy, 'numpy')
+
+        return numpy.rec.fromarrays(
+            [_numpy_array(values) for values in self.columns.values()],
+            names=[str(name) for name in self.names]
+        )
+
+    def to_pandas(self):
+        """
+        Returns this batch as a ``pandas.DataFrame``.  When ``pyarrow`` is installed, the frame
+        is built from the Arrow batch, so columns are not copied again to be consolidated.
+
+        Returns:
+            ``pandas.DataFrame``
+        """
+        if pyarrow is not None:
+            return self.to_arrow().to_pandas(split_blocks=True)
+
+        import pandas
+        return pandas.DataFrame(self.columns, columns=self.names)
+
+    def rows(self):
+        """
+        Iterate over the rows of this batch as lists of values.
+        """
+        return (list(row) for row in zip(*self.columns.values()))
+
+
+def iter_batches(records, batch_size=DEFAULT_BATCH_SIZE, columns=None):
+    """
+    Gathers records into :class:`ColumnBatch` objects as they are read.
+
+    Args:
+        records (iterable): Models (e.g.: as returned by :func:`Client.items`), compact models,
+            or dicts.
+
+        batch_size (int): The maximum number of records per batch.
+
+        columns (list, optional): The columns to export.  By default, these are the keys of the
+            records in the first batch, in the order they are first seen.  Every batch has the
+            same columns: missing values are `None`, and keys that are not columns are ignored.
+
+    Returns:
+        iterator of :class:`ColumnBatch`
+    """
+    buffered = []
+
+    for record in records:
+        if not isinstance(record, dict):
+            record = record._data
+
+        buffered.append(record)
+
+        if len(buffered) >= batch_size:
+            if columns is None:
+                columns = _columns_of(buffered)
+
+            yield _make_batch(buffered, columns)
+            buffered = []
+
+    if len(buffered) or columns is None:
+        if columns is None:
+            columns = _columns_of(buffered)
+
+        yield _make_batch(buffered, columns)
+
+
+def infer_schema(batches, types=None):
+    """
+    Infers the Arrow schema of one or more batches with the same columns.  The type of each
+    column is inferred from the values that are present: columns of integers and floats are
+    floats, columns of values with different types are strings, and so are columns with no
+    values at all.
+
+    Args:
+        batches (list of :class:`ColumnBatch`)
+
+        types (dict, optional): Maps column names to the ``pyarrow.DataType`` to use, instead of
+            inferring it.
+
+    Returns:
+        ``pyarrow.Schema``
+    """
+    _require(pyarrow, 'pyarrow')
+    inferred = _infer_types(batches, types)
+
+    return pyarrow.schema([
+        (name, pyarrow.string() if type is None else type)
+        for name, type in inferred.items()
+    ])
+
+
+class BatchWriter(object):
+    """
+    A base class for writers that append :class:`ColumnBatch` objects to a file.  Writers can be
+    used as context managers, which close them on exit.
+    """
+
+    def __init__(self, path, **options):
+        self.path = path
+        self.options = options
+        self.rows = 0
+
+    def write(self, batch):
+        self.rows += len(batch)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class ArrowWriter(BatchWriter):
+    """
+    A base class for writers of Arrow-based formats.
+
+    Unless a complete schema is given, batches are held back until the type of every column can
+    be inferred from the values present (see: :func:`infer_schema`), or until ``infer_rows``
+    records have been held back; the file is then opened with the inferred schema, which every
+    later batch must conform to.
+
+    Args:
+        path (str): The file to write.
+
+        schema (``pyarrow.Schema`` or dict, optional): The schema of the file, or a dict mapping
+            some of its columns to the ``pyarrow.DataType`` to use instead of inferring it.
+
+        infer_rows (int): The maximum number of records held back to infer the schema.
+    """
+
+    def __init__(self, path, schema=None, infer_rows=DEFAULT_INFER_ROWS, **options):
+        _require(pyarrow, 'pyarrow')
+        super(ArrowWriter, self).__init__(path, **options)
+        self.writer = None
+        self.infer_rows = infer_rows
+        self.pending = []
+
+        if isinstance(schema, pyarrow.Schema):
+            self.schema = schema
+            self.types = None
+        else:
+            self.schema = None
+            self.types = dict(schema or {})
+
+    def open(self, schema):
+        raise NotImplementedError()
+
+    def write_arrow(self, arrow_batch):
+        self.writer.write_batch(arrow_batch)
+
+    def write(self, batch):
+        super(ArrowWriter, self).write(batch)
+
+        if self.writer is None:
+            self.pending.append(batch)
+
+            if self.schema is None:
+                types = _infer_types(self.pending, self.types)
+
+                if None in types.values() and self.rows < self.infer_rows:
+                    return
+
+            self.flush()
+        else:
+            self.write_arrow(batch.to_arrow(self.schema))
+
+    def flush(self):
+        """
+        Opens the file (inferring its schema from the batches held back, if necessary) and
+        writes any batches held back.
+        """
+        if self.writer is None:
+            if not self.pending:
+                return
+
+            if self.schema is None:
+                self.schema = infer_schema(self.pending, self.types)
+
+            self.writer = self.open(self.schema)
+
+        pending, self.pending = self.pending, []
+
+        for batch in pending:
+            self.write_arrow(batch.to_arrow(self.schema))
+
+    def close(self):
+        self.flush()
+
+        if self.writer is not None:
+            self.writer.close()
+
+
+class ParquetWriter(ArrowWriter):
+    """
+    Writes batches to a Parquet file, one row group per batch.  Options (e.g.: ``compression``)
+    are passed to ``pyarrow.parquet.ParquetWriter``.
+    """
+
+    def open(self, schema):
+        return pyarrow.parquet.ParquetWriter(self.path, schema, **self.options)
+
+    def write_arrow(self, arrow_batch):
+        self.writer.write_table(pyarrow.Table.from_batches([arrow_batch]))
+
+
+class FeatherWriter(ArrowWriter):
+    """
+    Writes batches to a Feather (version 2, i.e.: Arrow IPC) file.  Options are passed to
+    ``pyarrow.ipc.IpcWriteOptions``.
+    """
+
+    def open(self, schema):
+        options = pyarrow.ipc.IpcWriteOptions(**self.options) if self.options else None
+        return pyarrow.ipc.new_file(self.path, schema, options=options)
+
+
+class CSVWriter(BatchWriter):
+    """
+    Writes batches to a CSV file with a header row.  Missing values are written as empty
+    fields.  Options are passed to :func:`csv.writer`.
+    """
+
+    def __init__(self, path, **options):
+        super(CSVWriter, self).__init__(path, **options)
+        self.file = io.open(path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file, **options)
+        self.header = False
+
+    def write(self, batch):
+        if not self.header:
+            self.writer.writerow(batch.names)
+            self.header = True
+
+        self.writer.writerows(batch.rows())
+        super(CSVWriter, self).write(batch)
+
+    def close(self):
+        self.file.close()
+
+
+WRITERS = {
+    'parquet': ParquetWriter,
+    'feather': FeatherWriter,
+    'arrow': FeatherWriter,
+    'csv': CSVWriter,
+}
+
+
+def export(records, path, format=None, batch_size=DEFAULT_BATCH_SIZE, columns=None, **options):
+    """
+    Writes records to a file, one batch at a time.
+
+    Args:
+        records (iterable): Models, compact models, or dicts.  See: :func:`iter_batches`.
+
+        path (str): The file to write.
+
+        format (str, optional): One of :data:`WRITERS`.  Defaults to the extension of ``path``.
+
+        batch_size (int): The maximum number of records held in memory (and per row group).
+
+        columns (list, optional): The columns to export.  See: :func:`iter_batches`.
+
+        **options: Passed to the writer (e.g.: the ``schema`` of a Parquet or Feather file; see
+            :class:`ArrowWriter`).
+
+    Returns:
+        int; the number of records written.
+    """
+    if format is None:
+        format = path.rsplit('.', 1)[-1].lower()
+
+    if format not in WRITERS:
+        raise ValueError('Unsupported export format {0!r}'.format(format))
+
+    with WRITERS[format](path, **options) as writer:
+        for batch in iter_batches(records, batch_size=batch_size, columns=columns):
+            if len(batch):
+                writer.write(batch)
+
+    return writer.rows
+
+
+def export_model(client, model, path, params=None, **kwargs):
+    """
+    Reads every instance of a model as compact models (see
+    :func:`~performline.clients.rest.models.RestModel.iall`) and writes them to a file.  See:
+    :func:`export`.
+
+    Args:
+        client (:class:`~performline.client.Client`): The client used to perform requests.
+
+        model (type): The :class:`~performline.clients.rest.models.RestModel` subclass to export.
+
+        params (dict, optional): Query string parameters for the listing.  Pages of
+            :data:`DEFAULT_PAGE_SIZE` records are requested unless a ``limit`` is given.
+
+        **kwargs: ``format``, ``batch_size``, ``columns`` and writer options are passed to
+            :func:`export`; ``concurrency``, ``stream``, ``max_results`` and ``max_iterations``
+            (by default, every page is read) to ``iall``.
+
+    Returns:
+        int; the number of records written.
+    """
+    export_kwargs = dict(
+        (k, kwargs.pop(k)) for k in list(kwargs)
+        if k not in ('concurrency', 'stream', 'max_results', 'max_iterations')
+    )
+
+    params = dict(params or {})
+    params.setdefault('limit', DEFAULT_PAGE_SIZE)
+    kwargs.setdefault('max_iterations', None)
+
+    records = model.iall(client, compact=True, params=params, **kwargs)
+    return export(records, path, **export_kwargs)
+
+
+def _columns_of(records):
+    columns = OrderedDict()
+
+    for record in records:
+        for key in record:
+            columns[key] = True
+
+    return list(columns)
+
+
+def _make_batch(records, columns):
+    return ColumnBatch(OrderedDict(
+        (column, [_scalar(record.get(column)) for record in records])
+        for column in columns
+    ))
+
+
+def _scalar(value):
+    if isinstance(value, (dict, list)):
+        return jsonify(value)
+
+    return value
+
+
+def _infer_types(batches, types=None):
+    """
+    Returns an OrderedDict mapping each column to its type, or `None` for columns without values.
+    """
+    types = types or {}
+    rv = OrderedDict()
+
+    for name in (batches[0].names if batches else []):
+        if name in types:
+            rv[name] = types[name]
+        else:
+            rv[name] = _unify_types([_infer_type(batch.columns[name]) for batch in batches])
+
+    return rv
+
+
+def _infer_type(values):
+    try:
+        type = pyarrow.array(values).type
+    except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):
+        return pyarrow.string()
+
+    if pyarrow.types.is_null(type):
+        return None
+
+    return type
+
+
+def _unify_types(types):
+    types = set(t for t in types if t is not None)
+
+    if not types:
+        return None
+    elif len(types) == 1:
+        return types.pop()
+    elif all(pyarrow.types.is_integer(t) or pyarrow.types.is_floating(t) for t in types):
+        return pyarrow.float64()
+
+    return pyarrow.string()
+
+
+def _arrow_array(name, values, type):
+    """
+    Converts values to an array of the given type, raising a `ValueError` rather than losing
+    information (e.g.: by truncating floats to integers).
+    """
+    try:
+        array = pyarrow.array(values)
+    except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):
+        array = None
+
+    if pyarrow.types.is_string(type):
+        textual = array is not None and (
+            pyarrow.types.is_string(array.type) or pyarrow.types.is_null(array.type)
+        )
+
+        if not textual:
+            return pyarrow.array([None if v is None else str(v) for v in values], type=type)
+
+    try:
+        if array is None:
+            return pyarrow.array(values, type=type)
+
+        return array.cast(type, safe=True)
+    except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError, pyarrow.ArrowNotImplementedError) as e:
+        raise ValueError('Column {0!r} cannot be converted to {1}: {2}'.format(name, type, e))
+
+
+def _numpy_array(values):
+    present = [v for v in values if v is not None]
+
+    if len(present) and all(isinstance(v, bool) for v in present):
+        if len(present) == len(values):
+            return numpy.array(values, dtype=bool)
+    elif len(present) and all(isinstance(v, numbers.Integral) for v in present):
+        if len(present) == len(values):
+            return numpy.array(values, dtype=numpy.int64)
+
+        return numpy.array([numpy.nan if v is None else v for v in values], dtype=float)
+    elif len(present) and all(isinstance(v, numbers.Real) for v in present):
+        return numpy.array([numpy.nan if v is None else v for v in values], dtype=float)
+
+    array = numpy.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def _require(module, name):
+    if module is None:
+        raise ImportError('The {0} package is required for this export'.format(name))
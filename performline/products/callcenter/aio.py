@@ -0,0 +1,53 @@
+# Copyright (c) 2016, PerformLine, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the company nor the
+#       names of its contributors may be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL PERFORMLINE, INC. BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import absolute_import
+from .models import Call
+from ...embedded.stdlib.clients.rest.aio import aget
+from ...embedded.stdlib.utils.dicts import compact
+
+
+class AsyncCallCenterClientMethods(object):
+    """Asynchronous counterparts to :class:`~performline.products.callcenter.api.CallCenterClientMethods`"""
+
+    async def calls(self, id=None, limit=None, offset=None, brand=None, campaign=None):
+        """
+        Retrieve one or more calls.  See:
+        :func:`~performline.products.callcenter.api.CallCenterClientMethods.calls`.
+
+        Returns:
+            An instance of :class:`~performline.products.callcenter.models.Call`
+            if ``id`` is not `None`, otherwise a list of them.  Use
+            ``iall(Call, ...)`` to iterate over large result sets instead.
+        """
+        if id is None:
+            return [i async for i in self.iall(Call, params=compact({
+                'limit': limit,
+                'offset': offset,
+                'brand': brand,
+                'campaign': campaign,
+            }))]
+        else:
+            return await aget(Call, self, id)
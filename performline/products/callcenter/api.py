@@ -42,7 +42,7 @@ class CallCenterClientMethods(object):
         Returns:
             An instance of :class:`~performline.products.callcenter.models.Call`
             if ``id`` is not `None` representing the call with that ID.
-            Otherwise, retrieve a list of
+            Otherwise, return an iterator of
             :class:`~performline.products.callcenter.models.Call` instances of all
             calls associated with the account.
 
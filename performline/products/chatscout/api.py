@@ -42,7 +42,7 @@ class ChatScoutClientMethods(object):
         Returns:
             An instance of :class:`~performline.products.chatscout.models.Chat`
             if ``id`` is not `None` representing the chat with that ID.
-            Otherwise, retrieve a list of
+            Otherwise, return an iterator of
             :class:`~performline.products.chatscout.models.Chat` instances of all
             chats associated with the account.
 
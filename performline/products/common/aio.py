@@ -0,0 +1,115 @@
+# Copyright (c) 2016, PerformLine, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the company nor the
+#       names of its contributors may be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL PERFORMLINE, INC. BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import absolute_import
+from .models import (
+    Brand,
+    Campaign,
+    Rule,
+    TrafficSource,
+    Item,
+    WORKFLOW_PRODUCT_ROOTS
+)
+from ...embedded.stdlib.clients.rest.aio import aget
+from ...embedded.stdlib.utils.dicts import compact
+
+
+class AsyncCommonClientMethods(object):
+    """
+    Asynchronous counterparts to
+    :class:`~performline.products.common.api.CommonClientMethods`.  Listing
+    methods return lists; use ``iall(Model, ...)`` to iterate over large
+    result sets instead.
+    """
+
+    async def _get_or_list(self, model, id, limit, params):
+        if id is None:
+            return [i async for i in self.iall(model, max_results=limit, params=compact(params))]
+        else:
+            return await aget(model, self, id)
+
+    async def brands(self, id=None, limit=None, offset=None, create_date=None):
+        """
+        Retrieve one or more brands.  See:
+        :func:`~performline.products.common.api.CommonClientMethods.brands`.
+        """
+        return await self._get_or_list(Brand, id, limit, {
+            'limit': limit,
+            'offset': offset,
+            'create_date': create_date,
+        })
+
+    async def campaigns(self, id=None, limit=None, offset=None, brand=None):
+        """
+        Retrieve one or more campaigns.  See:
+        :func:`~performline.products.common.api.CommonClientMethods.campaigns`.
+        """
+        return await self._get_or_list(Campaign, id, limit, {
+            'limit': limit,
+            'offset': offset,
+            'brand': brand,
+        })
+
+    async def rules(self, id=None, limit=None, offset=None):
+        """
+        Retrieve one or more rules.  See:
+        :func:`~performline.products.common.api.CommonClientMethods.rules`.
+        """
+        return await self._get_or_list(Rule, id, limit, {
+            'limit': limit,
+            'offset': offset,
+        })
+
+    async def trafficsources(self, id=None, limit=None, offset=None):
+        """
+        Retrieve one or more traffic sources.  See:
+        :func:`~performline.products.common.api.CommonClientMethods.trafficsources`.
+        """
+        return await self._get_or_list(TrafficSource, id, limit, {
+            'limit': limit,
+            'offset': offset,
+        })
+
+    async def items(self, id=None, limit=None, offset=None, brand=None, campaign=None):
+        """
+        Retrieve one or more scorable items.  See:
+        :func:`~performline.products.common.api.CommonClientMethods.items`.
+        """
+        return await self._get_or_list(Item, id, limit, {
+            'limit': limit,
+            'offset': offset,
+            'brand': brand,
+            'campaign': campaign,
+        })
+
+    async def workflows(self, id, product):
+        """
+        Retrieve the workflow of a single item.  See:
+        :func:`~performline.products.common.api.CommonClientMethods.workflows`.
+        """
+        root = WORKFLOW_PRODUCT_ROOTS.get(product, '/common/items/')
+        response = await self.get('{0}{1}/workflow/'.format(root, id))
+
+        return response.deep_get('Results')
@@ -36,7 +36,9 @@ from .models import (
     Workflow
 )
 
+from ...embedded.stdlib.clients.rest.exceptions import ErrorResponse
 from ...embedded.stdlib.utils.dicts import compact
+from ...embedded.stdlib.utils.threading import imap_unordered_bounded
 
 
 class CommonClientMethods(object):
@@ -53,7 +55,7 @@ class CommonClientMethods(object):
         Returns:
             An instance of :class:`~performline.products.common.models.Brand`
             if ``id`` is not `None` representing the brand with that ID.
-            Otherwise, retrieve a list of
+            Otherwise, return an iterator of
             :class:`~performline.products.common.models.Brand` instances of all
             brands associated with the account.
 
@@ -61,19 +63,20 @@ class CommonClientMethods(object):
             See :func:`~performline.client.Client.request`
         """
         if id is None:
-            result = [output for output in Brand.iall(self, params=compact({
+            return Brand.iall(self, max_results=limit, params=compact({
                 'limit': limit,
                 'offset': offset,
                 'create_date': create_date,
-            }))]
-            if limit:
-                result = result[:limit]
-            return result
+            }))
         else:
             return Brand.get(self, id)
 
-    def brand_rules(self, id):
-        return BrandRules.get(id)
+    def brand_rules(self, id, limit=None):
+        """
+        Retrieve the rules of a brand.  See:
+        :func:`~performline.products.common.models.BrandRules.get`.
+        """
+        return BrandRules.get(self, id, limit=limit)
 
     def campaigns(self, id=None, limit=None, offset=None, brand=None):
         """
@@ -86,7 +89,7 @@ class CommonClientMethods(object):
         Returns:
             An instance of :class:`~performline.products.common.models.Campaign`
             if ``id`` is not `None` representing the campaign with that ID.
-            Otherwise, retrieve a list of
+            Otherwise, return an iterator of
             :class:`~performline.products.common.models.Campaign` instances of all
             campaigns associated with the account.
 
@@ -95,19 +98,20 @@ class CommonClientMethods(object):
         """
 
         if id is None:
-            result = [output for output in Campaign.iall(self, params=compact({
+            return Campaign.iall(self, max_results=limit, params=compact({
                 'limit': limit,
                 'offset': offset,
                 'brand': brand,
-            }))]
-            if limit:
-                result = result[:limit]
-            return result
+            }))
         else:
             return Campaign.get(self, id)
 
-    def campaign_rules(self, id):
-        return CampaignRules.get(id)
+    def campaign_rules(self, id, limit=None):
+        """
+        Retrieve the rules of a campaign.  See:
+        :func:`~performline.products.common.models.CampaignRules.get`.
+        """
+        return CampaignRules.get(self, id, limit=limit)
 
     def rules(self, id=None, limit=None, offset=None):
         """
@@ -120,7 +124,7 @@ class CommonClientMethods(object):
         Returns:
             An instance of :class:`~performline.products.common.models.Rule`
             if ``id`` is not `None` representing the rule with that ID.
-            Otherwise, retrieve a list of
+            Otherwise, return an iterator of
             :class:`~performline.products.common.models.Rule` instances of all
             rules associated with the account.
 
@@ -128,13 +132,10 @@ class CommonClientMethods(object):
             See :func:`~performline.client.Client.request`
         """
         if id is None:
-            result = [output for output in Rule.iall(self, params=compact({
+            return Rule.iall(self, max_results=limit, params=compact({
                 'limit': limit,
                 'offset': offset,
-            }))]
-            if limit:
-                result = result[:limit]
-            return result
+            }))
         else:
             return Rule.get(self, id)
 
@@ -150,7 +151,7 @@ class CommonClientMethods(object):
         Returns:
             An instance of :class:`~performline.products.common.models.TrafficSource`
             if ``id`` is not `None` representing the traffic source with that ID.
-            Otherwise, retrieve a list of
+            Otherwise, return an iterator of
             :class:`~performline.products.common.models.TrafficSource` instances of all
             traffic sources associated with the account.
 
@@ -158,11 +159,10 @@ class CommonClientMethods(object):
             See :func:`~performline.client.Client.request`
         """
         if id is None:
-            result = [output for output in TrafficSource.iall(self, params=compact({
+            return TrafficSource.iall(self, max_results=limit, params=compact({
                 'limit': limit,
                 'offset': offset,
-            }))]
-            return result
+            }))
         else:
             return TrafficSource.get(self, id)
 
@@ -177,7 +177,7 @@ class CommonClientMethods(object):
         Returns:
             An instance of :class:`~performline.products.common.models.Item`
             if ``id`` is not `None` representing the item with that ID.
-            Otherwise, retrieve a list of
+            Otherwise, return an iterator of
             :class:`~performline.products.common.models.Item` instances of all
             items associated with the account.
 
@@ -185,28 +185,90 @@ class CommonClientMethods(object):
             See :func:`~performline.client.Client.request`
         """
         if id is None:
-            result = [output for output in Item.iall(self, params=compact({
+            return Item.iall(self, max_results=limit, params=compact({
                 'limit': limit,
                 'offset': offset,
                 'brand': brand,
                 'campaign': campaign,
-            }))]
-            if limit:
-                result = result[:limit]
-            return result
+            }))
         else:
             return Item.get(self, id)
 
+    def items_by_ids(self, ids, concurrency=None):
+        """
+        Retrieve several scorable items by ID in parallel.
+
+        Args:
+            ids (iterable): The IDs of the items to retrieve.
+
+            concurrency (int, optional): The maximum number of simultaneous
+                requests.  Defaults to the client's ``pool_maxsize``.
+
+        Returns:
+            An ordered dict mapping each distinct ID to its
+            :class:`~performline.products.common.models.Item`, or to the
+            :class:`~performline.clients.rest.exceptions.ErrorResponse`
+            raised while retrieving it (e.g.: ``NotFound``).
+        """
+        return Item.get_many(self, ids, concurrency=concurrency)
+
     def remediation_statuses(self):
         """
         Retrieve all available remediation statuses available in the
         Performline platform.
+
         Returns:
-            An instance of :class:`~performline.products.common.models.RemediationStatuses`,
-            which has a property returning a list of strings representing the
-            availa
-        return RemediationStatus.get()
+            A list of strings naming the available remediation statuses.
         """
-    
+        return RemediationStatus.get(self)
+
     def workflows(self, id, product):
-        return Workflow.get(id, product)
+        """
+        Retrieve the workflow of a single item.  See:
+        :func:`~performline.products.common.models.Workflow.get`.
+        """
+        return Workflow.get(self, id, product)
+
+    def workflows_many(self, items, concurrency=None):
+        """
+        Retrieve the workflows of many items in parallel, yielding each one as soon as it has
+        been retrieved (i.e.: not necessarily in the order given).
+
+        Args:
+            items (iterable): ``(id, product)`` tuples (see :func:`workflows`), or bare IDs for
+                items whose product is not known.  Duplicates are only retrieved once.  The
+                iterable is consumed lazily, so it may be arbitrarily long.
+
+            concurrency (int, optional): The maximum number of simultaneous requests.  Defaults
+                to the client's ``pool_maxsize``.
+
+        Returns:
+            A generator of ``(id, product, workflow)`` tuples, where ``workflow`` is the
+            :class:`~performline.clients.rest.exceptions.ErrorResponse` raised while retrieving
+            it if the request failed (e.g.: ``NotFound``).
+        """
+        if concurrency is None:
+            concurrency = self.pool_maxsize
+
+        def unique():
+            seen = set()
+
+            for item in items:
+                if not isinstance(item, (list, tuple)):
+                    item = (item, None)
+
+                item = tuple(item)
+
+                if item not in seen:
+                    seen.add(item)
+                    yield item
+
+        def fetch(item):
+            id, product = item
+
+            try:
+                return (id, product, Workflow.get(self, id, product))
+            except ErrorResponse as e:
+                return (id, product, e)
+
+        return imap_unordered_bounded(fetch, unique(), concurrency)
@@ -0,0 +1,53 @@
+# Copyright (c) 2016, PerformLine, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the company nor the
+#       names of its contributors may be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL PERFORMLINE, INC. BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import absolute_import
+import click
+from ....embedded.stdlib.clients.rest.metrics import format_report
+
+
+@click.command(
+    help=(
+        'Run another command, then print the latency percentiles, request rates and retry '
+        'counts of the requests it made (e.g.: "metrics pages list")'
+    ),
+    context_settings={
+        'ignore_unknown_options': True,
+        'allow_interspersed_args': False,
+    })
+@click.argument('command', nargs=-1, required=True, type=click.UNPROCESSED)
+@click.pass_context
+def metrics(ctx, command):
+    group = ctx.parent.command
+    name, cmd, args = group.resolve_command(ctx.parent, list(command))
+
+    try:
+        with cmd.make_context(name, args, parent=ctx.parent) as subcontext:
+            cmd.invoke(subcontext)
+    finally:
+        snapshot = ctx.obj.client.metrics_snapshot()
+
+        if snapshot is not None:
+            click.echo(format_report(snapshot), err=True)
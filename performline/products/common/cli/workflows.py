@@ -24,8 +24,15 @@
 # SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 from __future__ import absolute_import
+import re
 import click
 from ....cliutils import out
+from ....embedded.stdlib.clients.rest.exceptions import ErrorResponse
+from ....embedded.stdlib.clients.rest.retry import error_status
+from ....embedded.stdlib.utils.dicts import deep_get
+from ....embedded.stdlib.utils.json import jsonify
+
+RX_SEPARATOR = re.compile(r'[\s,]+')
 
 
 @click.group(help='All workflows in the Performline platform')
@@ -78,4 +85,68 @@ def social(state, id):
                 type=int)
 @click.pass_obj
 def email(state, id):
-    out(state, state.client.workflows(id, "email"))
\ No newline at end of file
+    out(state, state.client.workflows(id, "email"))
+
+
+@workflows.command(help=(
+    'Retrieve the workflows of many items in parallel.  INPUT (default: stdin) contains one '
+    'item per line, as an ID optionally followed by its product (e.g.: "123 web").  One JSON '
+    'object is written per line as each workflow is retrieved.'
+))
+@click.argument('input',
+                type=click.File('r'),
+                default='-')
+@click.option('--product', '-p',
+              default='common',
+              type=click.Choice(['common', 'web', 'calls', 'callcenter', 'chat', 'social',
+                                 'email']),
+              help='The product of items whose line does not specify one')
+@click.option('--concurrency', '-c',
+              type=int,
+              help='The maximum number of simultaneous requests')
+@click.pass_obj
+def bulk(state, input, product, concurrency):
+    def items():
+        for line in input:
+            fields = [f for f in RX_SEPARATOR.split(line.strip()) if f]
+
+            if not fields:
+                continue
+
+            item_product = (fields[1] if len(fields) > 1 else product)
+
+            try:
+                id = int(fields[0])
+            except ValueError:
+                click.echo(jsonify(error_record(fields[0], item_product, 'Invalid item ID')))
+                continue
+
+            yield (id, item_product)
+
+    for id, item_product, result in state.client.workflows_many(items(), concurrency):
+        if isinstance(result, ErrorResponse):
+            record = error_record(
+                id,
+                item_product,
+                deep_get(result.data, 'ErrorMessage') or result.__class__.__name__,
+                error_status(result)
+            )
+        else:
+            record = {
+                'Id': id,
+                'Product': item_product,
+                'Results': result,
+            }
+
+        click.echo(jsonify(record))
+
+
+def error_record(id, product, message, status_code=None):
+    return {
+        'Id': id,
+        'Product': product,
+        'Error': {
+            'StatusCode': status_code,
+            'Message': message,
+        },
+    }
@@ -24,15 +24,31 @@
 # SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 """Models representing common API objects"""
 from __future__ import absolute_import
-
-import os, json
-import requests
 from ...embedded.stdlib.clients.rest.models import RestModel
 from ...embedded.stdlib.utils.dicts import compact
 
-import requests
-import json
-import os
+
+def all_results(client, path, params=None):
+    """
+    Retrieves the results of every page of a listing.  Pages are only requested beyond the
+    first if ``params`` includes a ``limit``.
+
+    Args:
+        client (:class:`~performline.client.Client`): The client used to perform the requests.
+
+        path (str): The path of the listing.
+
+        params (dict, optional): Query string parameters.
+
+    Returns:
+        list
+    """
+    results = []
+
+    for response in client.iget_until(path, params=dict(params or {})):
+        results.extend(response.results())
+
+    return results
 
 
 class Brand(RestModel):
@@ -64,22 +80,26 @@ class BrandRules(RestModel):
             }
         ))
 
-    @staticmethod
-    def get(id):
-        api_key = os.environ.get("API_KEY", "Not set")
-        url = "http://api.performline.com"
-        rest_root = '/common/brands/' + str(id) + '/rules/'
-        endpoint = url + rest_root
-        headers = {
-            "Authorization": "Token " + api_key
-        }
-        response = requests.get(endpoint, headers=headers)
-        if response.status_code != 200:
-            print("Received status code " + str(response.status_code))
-            return
-        content = json.loads(response._content)
-        os.environ["API_KEY"] = ""
-        return content["Results"]
+    @classmethod
+    def get(cls, client, id, limit=None):
+        """
+        Retrieve the rules of a brand.
+
+        Args:
+            client (:class:`~performline.client.Client`): The client used to perform the
+                requests.
+
+            id (int): The brand ID.
+
+            limit (int, optional): If set, request the rules in pages of this size, and
+                retrieve every page.  Otherwise, only the server's default page is retrieved.
+
+        Returns:
+            A list of rules (as dicts).
+        """
+        return all_results(client, '/common/brands/{0}/rules/'.format(id), params=compact({
+            'limit': limit,
+        }))
 
 
 class Campaign(RestModel):
@@ -88,10 +108,13 @@ class Campaign(RestModel):
     campaign.
     """
     rest_root = '/common/campaigns/'
+    relations = {
+        'brand': (Brand, 'brand_id'),
+    }
 
     @property
     def brand(self):
-        return Brand.get(self.client, self.brand_id)
+        return self.related('brand')
 
     def items(self, limit=None, offset=None, brand=None):
         return Item.iall(self.client, params=compact({
@@ -117,22 +140,26 @@ class CampaignRules(RestModel):
             }
         ))
 
-    @staticmethod
-    def get(id):
-        api_key = os.environ.get("API_KEY", "Not set")
-        url = "http://api.performline.com"
-        rest_root = '/common/campaigns/' + str(id) + '/rules/'
-        endpoint = url + rest_root
-        headers = {
-            "Authorization": "Token " + api_key
-        }
-        response = requests.get(endpoint, headers=headers)
-        if response.status_code != 200:
-            print("Received status code " + str(response.status_code))
-            return
-        content = json.loads(response._content)
-        os.environ["API_KEY"] = ""
-        return content["Results"]
+    @classmethod
+    def get(cls, client, id, limit=None):
+        """
+        Retrieve the rules of a campaign.
+
+        Args:
+            client (:class:`~performline.client.Client`): The client used to perform the
+                requests.
+
+            id (int): The campaign ID.
+
+            limit (int, optional): If set, request the rules in pages of this size, and
+                retrieve every page.  Otherwise, only the server's default page is retrieved.
+
+        Returns:
+            A list of rules (as dicts).
+        """
+        return all_results(client, '/common/campaigns/{0}/rules/'.format(id), params=compact({
+            'limit': limit,
+        }))
 
 
 class Rule(RestModel):
@@ -156,18 +183,23 @@ class Item(RestModel):
     regardless of product.
     """
     rest_root = '/common/items/'
+    relations = {
+        'brand': (Brand, 'brand_id'),
+        'campaign': (Campaign, 'campaign_id'),
+        'traffic_source': (TrafficSource, 'traffic_source_id'),
+    }
 
     @property
     def brand(self):
-        return Brand.get(self.client, self.brand_id)
+        return self.related('brand')
 
     @property
     def campaign(self):
-        return Campaign.get(self.client, self.campaign_id)
+        return self.related('campaign')
 
     @property
     def traffic_source(self):
-        return TrafficSource.get(self.client, self.traffic_source_id)
+        return self.related('traffic_source')
 
 class RemediationStatus(RestModel):
     """
@@ -176,52 +208,53 @@ class RemediationStatus(RestModel):
     """
     rest_root = "/common/remediation_status/"
 
-    @staticmethod
-    def get():
-        api_key = os.environ.get("API_KEY", "Not set")
-        url = "http://api.performline.com"
-        rest_root = '/common/remediation_status/'
-        endpoint = url + rest_root
-        headers = {
-            "Authorization": "Token " + api_key
-        }
-        response = requests.get(endpoint, headers=headers)
-        if response.status_code != 200:
-            print("Received status code " + str(response.status_code))
-            return
-        content = json.loads(response._content)
-        os.environ["API_KEY"] = ""
-        return content["Results"]["Statuses"]
+    @classmethod
+    def get(cls, client):
+        """
+        Retrieve the remediation statuses available in the platform.
+
+        Args:
+            client (:class:`~performline.client.Client`): The client used to perform the
+                request.
+
+        Returns:
+            A list of strings naming the available remediation statuses.
+        """
+        return client.get(cls.rest_root).deep_get('Results/Statuses')
+
+
+WORKFLOW_PRODUCT_ROOTS = {
+    "web": "/web/pages/",
+    "callcenter": "/callcenter/calls/",
+    "calls": "/callcenter/calls/",
+    "chat": "/chatscout/chats/",
+    "social": "/social/posts/",
+    "email": "/email/messages/",
+}
+
 
 class Workflow(RestModel):
+    """
+    An object for retrieving the workflow of an item.
+    """
+
+    @classmethod
+    def get(cls, client, id, product=None):
+        """
+        Retrieve the workflow of a single item.
+
+        Args:
+            client (:class:`~performline.client.Client`): The client used to perform the
+                request.
+
+            id (int): The item ID.
+
+            product (str, optional): The product the item belongs to (one of the keys of
+                :data:`WORKFLOW_PRODUCT_ROOTS`); determines the endpoint used.
+
+        Returns:
+            The workflow, as returned by the API.
+        """
+        root = WORKFLOW_PRODUCT_ROOTS.get(product, '/common/items/')
 
-    @staticmethod
-    def get(id, product):
-        api_key = os.environ.get("API_KEY", "Not set")
-        url = "http://api.performline.com"
-
-        if product == "web":
-            product_endpoint = "/web/pages/"
-        elif product == "callcenter":
-            product_endpoint = "/callcenter/calls/"
-        elif product == "chat":
-            product_endpoint = "/chatscout/chats/"
-        elif product == "social":
-            product_endpoint = "/social/posts/"
-        elif product == "email":
-            product_endpoint = "/email/messages/"
-        else:
-            product_endpoint = "/common/items/"
-
-        rest_root = product_endpoint + str(id) + '/workflow/'
-        endpoint = url + rest_root
-        headers = {
-            "Authorization": "Token " + api_key
-        }
-        response = requests.get(endpoint, headers=headers)
-        if response.status_code != 200:
-            print("Received status code " + str(response.status_code))
-            return
-        content = json.loads(response._content)
-        os.environ["API_KEY"] = ""
-        return content["Results"]
+        return client.get('{0}{1}/workflow/'.format(root, id)).deep_get('Results')
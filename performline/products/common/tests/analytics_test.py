@@ -0,0 +1,126 @@
+# Copyright (c) 2016, PerformLine, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the company nor the
+#       names of its contributors may be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL PERFORMLINE, INC. BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import unicode_literals
+import math
+import unittest
+from ..models import Item
+from .... import analytics
+from ....analytics import ItemFrame
+from ....testing import mock_client, paginated
+
+RECORDS = [
+    {'Id': 1, 'Type': 'web', 'Score': 10, 'BrandId': 1, 'CampaignId': 10},
+    {'Id': 2, 'Type': 'web', 'Score': 30, 'BrandId': 1, 'CampaignId': 10},
+    {'Id': 3, 'Type': 'call', 'Score': 50, 'BrandId': 1, 'CampaignId': 11},
+    {'Id': 4, 'Type': 'web', 'Score': None, 'BrandId': 2, 'CampaignId': 20},
+    {'Id': 5, 'Type': 'chat', 'Score': 90, 'BrandId': 2, 'CampaignId': 20},
+    {'Id': 6, 'Type': 'web', 'Score': 70},
+]
+
+
+class TestItemFrame(unittest.TestCase):
+    def setUp(self):
+        self.frame = ItemFrame.from_records(RECORDS)
+
+    def test_from_client(self):
+        client = mock_client()
+        client.mock_request('get', Item.rest_root, [paginated(RECORDS)])
+        frame = ItemFrame.from_client(client)
+
+        self.assertEqual(len(frame), 6)
+        self.assertEqual(frame.ids(), [1, 2, 3, 4, 5, 6])
+        self.assertEqual(frame.type_names(), ['web', 'web', 'call', 'web', 'chat', 'web'])
+        self.assertEqual(list(frame.column('brand_id')), [1, 1, 1, 2, 2, analytics.MISSING])
+        self.assertTrue(math.isnan(frame.column('score')[3]))
+
+    def test_from_client_reads_every_page(self):
+        records = [{'Id': i, 'Type': 'web', 'Score': 50} for i in range(1, 61)]
+        offsets = []
+        client = mock_client()
+        client.mock_request('get', Item.rest_root, [paginated(records, offsets)])
+
+        self.assertEqual(len(ItemFrame.from_client(client)), 60)
+        self.assertEqual(offsets, [0])
+
+        self.assertEqual(len(ItemFrame.from_client(client, params={'limit': 2})), 60)
+        self.assertEqual(len(offsets), 31)
+
+    def test_aggregates(self):
+        self.assertEqual(self.frame.count(), 5)
+        self.assertEqual(self.frame.mean(), 50.0)
+        self.assertEqual(self.frame.percentile(50), 50.0)
+        self.assertEqual(self.frame.percentile([0, 25, 100]), [10.0, 30.0, 90.0])
+        self.assertIsNone(ItemFrame.from_records([]).mean())
+        self.assertIsNone(ItemFrame.from_records([]).percentile(50))
+
+    def test_histogram(self):
+        counts, edges = self.frame.histogram(bins=4)
+
+        self.assertEqual(counts, [1, 1, 2, 1])
+        self.assertEqual(edges, [0.0, 25.0, 50.0, 75.0, 100.0])
+
+    def test_buckets(self):
+        self.assertEqual(
+            dict(self.frame.buckets()),
+            {'red': 2, 'yellow': 2, 'green': 1}
+        )
+        self.assertRaises(ValueError, self.frame.buckets, (50,), ('a', 'b', 'c'))
+
+    def test_filter(self):
+        self.assertEqual(self.frame.filter(brand=1).ids(), [1, 2, 3])
+        self.assertEqual(self.frame.filter(brand=1, max_score=30).ids(), [1, 2])
+        self.assertEqual(self.frame.filter(min_score=50, type='web').ids(), [6])
+        self.assertEqual(self.frame.filter(type='missing').ids(), [])
+        self.assertEqual(self.frame.filter(scored=False).ids(), [4])
+        self.assertEqual(self.frame.filter(scored=True).count(), 5)
+
+    def test_group_by(self):
+        by_campaign = self.frame.group_by('campaign_id')
+
+        self.assertEqual(list(by_campaign.size().items()), [
+            (None, 1), (10, 2), (11, 1), (20, 2),
+        ])
+        self.assertEqual(dict(by_campaign.count()), {None: 1, 10: 2, 11: 1, 20: 1})
+        self.assertEqual(dict(by_campaign.mean()), {None: 70.0, 10: 20.0, 11: 50.0, 20: 90.0})
+        self.assertEqual(dict(by_campaign.min()), {None: 70.0, 10: 10.0, 11: 50.0, 20: 90.0})
+        self.assertEqual(dict(by_campaign.max()), {None: 70.0, 10: 30.0, 11: 50.0, 20: 90.0})
+
+        by_type = self.frame.filter(brand=2).group_by('type')
+
+        self.assertEqual(dict(by_type.mean()), {'web': None, 'chat': 90.0})
+        self.assertEqual(dict(by_type.sum()), {'web': 0.0, 'chat': 90.0})
+        self.assertEqual(dict(by_type.max()), {'web': None, 'chat': 90.0})
+        self.assertRaises(ValueError, self.frame.group_by, 'score')
+
+
+class TestItemFramePurePython(TestItemFrame):
+    def setUp(self):
+        self.numpy = analytics.numpy
+        analytics.numpy = None
+        super(TestItemFramePurePython, self).setUp()
+
+    def tearDown(self):
+        analytics.numpy = self.numpy
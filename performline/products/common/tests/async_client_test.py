@@ -0,0 +1,130 @@
+# Copyright (c) 2016, PerformLine, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the company nor the
+#       names of its contributors may be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL PERFORMLINE, INC. BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import unicode_literals
+import asyncio
+import unittest
+from ..models import Brand, Item
+from ....embedded.stdlib.clients.rest.exceptions import NotFound
+from ....embedded.stdlib.clients.rest.utils import make_response
+
+try:
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+    from ....aio import AsyncClient
+except ImportError:
+    web = None
+
+ITEMS = [{'Id': i, 'Score': i % 100} for i in range(1, 48)]
+
+
+async def list_items(request):
+    # requests without a limit receive the server's default page size
+    limit = int(request.query.get('limit', 10))
+    offset = int(request.query.get('offset', 0))
+
+    return web.json_response(make_response(ITEMS[offset:offset + limit],
+                                           limit=limit,
+                                           offset=offset,
+                                           total=len(ITEMS)))
+
+
+async def get_brand(request):
+    if request.match_info['id'] != '11':
+        return web.json_response(make_response(None, status_code=404), status=404)
+
+    return web.json_response(make_response({'Id': 11, 'Name': 'Brand'}))
+
+
+async def get_workflow(request):
+    return web.json_response(make_response({'Status': 'Open'}))
+
+
+@unittest.skipIf(web is None, 'aiohttp is not installed')
+class TestAsyncClient(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        app = web.Application()
+        app.router.add_get('/common/items/', list_items)
+        app.router.add_get('/common/brands/{id}/', get_brand)
+        app.router.add_get('/web/pages/{id}/workflow/', get_workflow)
+
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+        self.client = AsyncClient('mock', url=str(self.server.make_url('/')))
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.server.close()
+
+    async def test_iall(self):
+        items = [i async for i in self.client.iall(Item, params={'limit': 10})]
+
+        self.assertEqual([i.id for i in items], [i['Id'] for i in ITEMS])
+        self.assertIsInstance(items[0], Item)
+
+    async def test_iall_concurrent(self):
+        items = [i async for i in self.client.iall(Item, params={'limit': 10}, concurrency=4)]
+
+        self.assertEqual([i.id for i in items], [i['Id'] for i in ITEMS])
+
+    async def test_iall_server_page_size(self):
+        for concurrency in (None, 4):
+            items = [i async for i in self.client.iall(Item, concurrency=concurrency)]
+
+            self.assertEqual([i.id for i in items], [i['Id'] for i in ITEMS])
+
+    async def test_iget_until_closed_early(self):
+        pages = self.client.iget_until('/common/items/', params={'limit': 10}, concurrency=4)
+
+        await pages.__anext__()
+        await pages.aclose()
+
+        requests = [
+            task for task in asyncio.all_tasks()
+            if task.get_coro().__qualname__.endswith('.request')
+        ]
+
+        self.assertEqual([task for task in requests if not task.done()], [])
+
+    async def test_items_limit(self):
+        items = await self.client.items(limit=5)
+
+        self.assertEqual([i.id for i in items], [1, 2, 3, 4, 5])
+
+    async def test_get(self):
+        brand = await self.client.brands(11)
+
+        self.assertIsInstance(brand, Brand)
+        self.assertEqual(brand.name, 'Brand')
+        self.assertIs(brand.client, self.client.client)
+
+        with self.assertRaises(NotFound):
+            await self.client.brands(9)
+
+    async def test_workflows(self):
+        workflow = await self.client.workflows(1, 'web')
+
+        self.assertEqual(workflow, [{'Status': 'Open'}])
@@ -0,0 +1,228 @@
+# Copyright (c) 2016, PerformLine, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the company nor the
+#       names of its contributors may be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL PERFORMLINE, INC. BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import unicode_literals
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from ..models import Brand, Item
+from ....embedded.stdlib.clients.rest.cache import MemoryCache, SqliteCache
+from ....embedded.stdlib.clients.rest.utils import make_response
+from ....testing import mock_client
+
+
+class CacheTests(object):
+    def make_cache(self, **kwargs):
+        raise NotImplementedError()
+
+    def setUp(self):
+        self.cache = self.make_cache(ttl=60, max_entries=2)
+        self.client = mock_client(cache=self.cache)
+
+        for i in (1, 2, 3):
+            self.client.mock_request('get', '/common/brands/{0}'.format(i), [
+                make_response({'Id': i, 'Name': 'Brand {0}'.format(i)}),
+            ])
+
+    def test_repeated_gets_are_cached(self):
+        item = Item(self.client, {'id': 1, 'brand_id': 1})
+
+        self.assertEqual(item.brand.name, 'Brand 1')
+        self.assertEqual(item.brand.name, 'Brand 1')
+        self.assertEqual(self.client._adapter.call_count, 1)
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_least_recently_used_are_evicted(self):
+        for i in (1, 2, 1, 3, 1, 2):
+            Brand.get(self.client, i)
+
+        self.assertEqual(self.client._adapter.call_count, 4)
+        self.assertEqual(self.cache.evictions, 2)
+        self.assertEqual(len(self.cache), 2)
+
+    def test_entries_expire(self):
+        self.cache.ttl = 0.01
+        Brand.get(self.client, 1)
+        time.sleep(0.02)
+        Brand.get(self.client, 1)
+
+        self.assertEqual(self.client._adapter.call_count, 2)
+        self.assertEqual(self.cache.expirations, 1)
+
+    def test_credentials_are_part_of_key(self):
+        Brand.get(self.client, 1)
+        self.client.headers = {'Authorization': 'Token other'}
+        Brand.get(self.client, 1)
+
+        self.assertEqual(self.client._adapter.call_count, 2)
+
+
+    def test_conditional_revalidation(self):
+        self.cache.ttl = 0
+        self.client._adapter.register_uri('GET', self.client.make_url('/common/brands/4'), [
+            {'json': make_response({'Id': 4, 'Name': 'Brand 4'}), 'headers': {'ETag': '"v1"'}},
+            {'status_code': 304},
+        ])
+
+        brand = Brand.get(self.client, 4)
+        brand.name = 'Edited'
+        brand.retrieve()
+
+        request = self.client._adapter.last_request
+        self.assertEqual(request.headers.get('If-None-Match'), '"v1"')
+        self.assertEqual(brand.name, 'Brand 4')
+
+        response = self.client.get('/common/brands/4')
+        self.assertTrue(response.not_modified)
+        self.assertEqual(response.results(0), {'Id': 4, 'Name': 'Brand 4'})
+
+    def test_not_modified_is_not_prepared_again(self):
+        self.cache.ttl = 0
+        self.client._adapter.register_uri('GET', self.client.make_url('/common/brands/4'), [
+            {'json': make_response({'Id': 4, 'Name': 'Brand 4'}), 'headers': {'ETag': '"v1"'}},
+            {'status_code': 304},
+        ])
+        prepared = []
+
+        class CountingBrand(Brand):
+            def prepare_data_from_retrieval(self, data):
+                prepared.append(data)
+                return super(CountingBrand, self).prepare_data_from_retrieval(data)
+
+        brand = CountingBrand.get(self.client, 4)
+        count = len(prepared)
+        brand.retrieve()
+        brand.retrieve()
+
+        self.assertEqual(len(prepared), count)
+        self.assertEqual(self.client._adapter.call_count, 3)
+        self.assertEqual(brand.name, 'Brand 4')
+
+        # once edited, the data is replaced again
+        brand.name = 'Edited'
+        brand.retrieve()
+
+        self.assertGreater(len(prepared), count)
+        self.assertEqual(brand.name, 'Brand 4')
+
+    def test_unsafe_methods_invalidate(self):
+        self.client.mock_request('get', '/common/brands/', [make_response([{'Id': 1}])])
+        self.client.mock_request('get', '/common/brands/2/rules/', [make_response([])])
+
+        for method in ('put', 'post', 'delete'):
+            self.client.mock_request(method, '/common/brands/1', [make_response({'Id': 1})])
+
+        for method in ('put', 'post', 'delete'):
+            self.cache.max_entries = None
+            self.client.get('/common/brands/', params={'limit': 10})
+            self.client.get('/common/brands/1')
+            self.client.get('/common/brands/2')
+            self.client.get('/common/brands/2/rules/')
+            calls = self.client._adapter.call_count
+
+            self.client.request(method, '/common/brands/1', data={'Name': 'Renamed'})
+            self.client.get('/common/brands/', params={'limit': 10})
+            self.client.get('/common/brands/1')
+            self.client.get('/common/brands/2')
+            self.client.get('/common/brands/2/rules/')
+
+            # the brand and the list were requested again; the other brand was not
+            self.assertEqual(self.client._adapter.call_count, calls + 3, method)
+
+    def test_validators_are_not_shared(self):
+        self.cache.ttl = 0
+        self.client._adapter.register_uri('GET', self.client.make_url('/common/brands/4'), [
+            {'json': make_response({'Id': 4, 'Name': 'Brand 4'}), 'headers': {'ETag': '"v1"'}},
+            {'status_code': 304},
+        ])
+
+        self.client.get('/common/brands/4')
+        self.client.get('/common/brands/4')
+        self.client.get('/common/brands/1')
+
+        self.assertNotIn('If-None-Match', self.client._adapter.last_request.headers)
+
+        for default in self.client.request.__defaults__:
+            if isinstance(default, dict):
+                self.assertEqual(default, {})
+
+    def test_not_modified_without_cached_response(self):
+        def respond(request, context):
+            if 'If-None-Match' in request.headers:
+                context.status_code = 304
+                return None
+
+            return make_response({'Id': 5, 'Name': 'Brand 5'})
+
+        self.client.mock_request('get', '/common/brands/5', [respond])
+
+        response = self.client.get('/common/brands/5', headers={'If-None-Match': '"v0"'})
+        calls = self.client._adapter.call_count
+
+        self.assertEqual(response.results(0), {'Id': 5, 'Name': 'Brand 5'})
+        self.assertEqual(calls, 2)
+        self.assertEqual(self.client.get('/common/brands/5').results(0)['Name'], 'Brand 5')
+        self.assertEqual(self.client._adapter.call_count, calls)
+
+
+class TestMemoryCache(CacheTests, unittest.TestCase):
+    def make_cache(self, **kwargs):
+        return MemoryCache(**kwargs)
+
+
+class TestSqliteCache(CacheTests, unittest.TestCase):
+    def make_cache(self, **kwargs):
+        self.tempdir = tempfile.mkdtemp()
+        return SqliteCache(os.path.join(self.tempdir, 'cache.db'), **kwargs)
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_hits_do_not_write(self):
+        Brand.get(self.client, 1)
+        Brand.get(self.client, 2)
+        changes = self.cache._db.total_changes
+
+        for _ in range(5):
+            Brand.get(self.client, 1)
+
+        self.assertEqual(self.cache._db.total_changes, changes)
+        self.assertEqual(self.cache.hits, 5)
+
+        # the recorded access times still decide which entry is evicted
+        Brand.get(self.client, 3)
+
+        self.assertEqual(Brand.get(self.client, 1).name, 'Brand 1')
+        self.assertEqual(self.client._adapter.call_count, 3)
+
+    def test_persists_between_instances(self):
+        Brand.get(self.client, 1)
+        self.client.cache = SqliteCache(self.cache.path)
+
+        self.assertEqual(Brand.get(self.client, 1).name, 'Brand 1')
+        self.assertEqual(self.client._adapter.call_count, 1)
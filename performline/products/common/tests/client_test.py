@@ -0,0 +1,152 @@
+# Copyright (c) 2016, PerformLine, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the company nor the
+#       names of its contributors may be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL PERFORMLINE, INC. BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import unicode_literals
+import unittest
+import requests_mock
+from ..models import Item, BrandRules
+from ....embedded.stdlib.clients.rest.exceptions import NotFound
+from ....client import Client
+from ....embedded.stdlib.utils.threading import TokenBucket
+from ....testing import mock_client, paginated
+
+
+class TestClientSession(unittest.TestCase):
+    def test_default_session_is_pooled(self):
+        client = Client('token', pool_maxsize=4, page_concurrency=8)
+        adapter = client.session.get_adapter('https://api.performline.com')
+
+        self.assertEqual(adapter._pool_maxsize, 8)
+        self.assertIsNot(client.session, Client('token').session)
+
+    def test_keep_alive_disabled(self):
+        client = Client('token', keep_alive=False)
+
+        self.assertEqual(client.session.headers.get('Connection'), 'close')
+
+    def test_rules_use_client_session(self):
+        client = Client('token')
+        adapter = requests_mock.Adapter()
+        client.session.mount('https://api.performline.com', adapter)
+        adapter.register_uri('GET', 'https://api.performline.com/common/brands/11/rules/',
+                             json={'Results': [{'Id': 1}]})
+
+        self.assertEqual(client.brand_rules(11), [{'Id': 1}])
+        self.assertEqual(adapter.call_count, 1)
+        self.assertEqual(adapter.last_request.headers['Authorization'], 'Token token')
+
+
+class TestCommonFetchers(unittest.TestCase):
+    def setUp(self):
+        self.client = mock_client()
+
+    def test_rules_are_paginated(self):
+        rules = [{'Id': i} for i in range(1, 6)]
+        calls = []
+        self.client.mock_request('get', '/common/campaigns/7/rules/', [paginated(rules, calls)])
+
+        self.assertEqual(self.client.campaign_rules(7, limit=2), rules)
+        self.assertEqual(calls, [0, 2, 4])
+
+        # repeated calls keep working (they no longer depend on, or clear, the environment)
+        self.assertEqual(self.client.campaign_rules(7), rules)
+        self.assertEqual(calls, [0, 2, 4, 0])
+
+    def test_bulk_rules(self):
+        for brand in (1, 2, 3):
+            self.client.mock_request('get', '/common/brands/{0}/rules/'.format(brand), [
+                {'Results': [{'Id': brand * 10}]},
+            ])
+
+        rules = BrandRules.get_many(self.client, [1, 2, 3, 2], concurrency=3)
+
+        self.assertEqual(list(rules.items()), [(1, [{'Id': 10}]), (2, [{'Id': 20}]),
+                                               (3, [{'Id': 30}])])
+
+    def test_remediation_statuses(self):
+        self.client.mock_request('get', '/common/remediation_status/', [
+            {'Results': {'Statuses': ['Opened', 'Closed']}},
+        ])
+
+        self.assertEqual(self.client.remediation_statuses(), ['Opened', 'Closed'])
+
+    def test_workflows(self):
+        self.client.mock_request('get', '/callcenter/calls/4/workflow/', [
+            {'Results': [{'Status': 'Open'}]},
+        ])
+        self.client.mock_request('get', '/common/items/5/workflow/', [
+            {'Results': [{'Status': 'Closed'}]},
+        ])
+
+        self.assertEqual(self.client.workflows(4, 'calls'), [{'Status': 'Open'}])
+        self.assertEqual(self.client.workflows(5, 'common'), [{'Status': 'Closed'}])
+
+    def test_errors_are_raised(self):
+        self.client._adapter.register_uri('GET', self.client.make_url('/common/items/6/workflow/'),
+                                          status_code=404, json={'Results': []})
+
+        self.assertRaises(NotFound, self.client.workflows, 6, 'common')
+
+
+class TestRateLimiting(unittest.TestCase):
+    def test_token_bucket_reservations(self):
+        bucket = TokenBucket(10, burst=2)
+
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertAlmostEqual(bucket.reserve(), 0.1, places=2)
+        self.assertAlmostEqual(bucket.reserve(), 0.2, places=2)
+
+    def test_every_page_is_limited(self):
+        class CountingBucket(TokenBucket):
+            acquired = 0
+
+            def acquire(self, tokens=1):
+                self.acquired += tokens
+                return super(CountingBucket, self).acquire(tokens)
+
+        bucket = CountingBucket(1000, burst=1)
+        client = mock_client(rate_limiter=bucket, page_concurrency=4)
+        client.mock_request('get', Item.rest_root, [paginated([{'Id': i} for i in range(1, 21)])])
+
+        self.assertEqual(len(list(Item.iall(client, params={'limit': 2}))), 20)
+        self.assertEqual(bucket.acquired, 10)
+
+
+class TestBatchRetrieval(unittest.TestCase):
+    def test_items_by_ids(self):
+        client = mock_client()
+        client.mock_request('get', '/common/items/1/', [{'Results': [{'Id': 1, 'Type': 'web'}]}])
+        client.mock_request('get', '/common/items/3/', [{'Results': [{'Id': 3, 'Type': 'web'}]}])
+        client._adapter.register_uri('GET', client.make_url('/common/items/2/'),
+                                     status_code=404, json={'Results': []})
+
+        results = client.items_by_ids([3, 1, 2, 3, 1], concurrency=2)
+
+        self.assertEqual(list(results.keys()), [3, 1, 2])
+        self.assertEqual(results[3].id, 3)
+        self.assertEqual(results[1].id, 1)
+        self.assertIsInstance(results[2], NotFound)
+        self.assertEqual(client._adapter.call_count, 3)
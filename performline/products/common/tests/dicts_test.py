@@ -0,0 +1,154 @@
+# Copyright (c) 2016, PerformLine, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the company nor the
+#       names of its contributors may be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL PERFORMLINE, INC. BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import unicode_literals
+import unittest
+from six import string_types
+from ....embedded.stdlib.utils import strings
+from ....embedded.stdlib.utils.dicts import camelize_dict, mutate_dict, underscore_dict
+
+PAYLOAD = {
+    'Id': 1,
+    'BrandId': 7,
+    'last_scored_at': None,
+    3: 'three',
+    (1, 2): 'pair',
+    'Meta': {'PageTitle': 'Example', 'Tags': ['a', {'TagName': 'b'}], 'Empty': {}},
+    'Grid': [[1, {'CellValue': 2}], [], [[{'DeepKey': 3}]]],
+    'Rows': [{'RowId': 1}, {'RowId': 2, 'Items': []}],
+    'Score': 85.5,
+}
+
+
+def reference_mutate_dict(inValue, keyFn, valueFn=lambda v: v, keyTypes=None, valueTypes=None,
+                          **kwargs):
+    # the general (unoptimized) algorithm, which mutate_dict must match
+    def recurse(value):
+        return reference_mutate_dict(value, keyFn, valueFn, keyTypes, valueTypes, **kwargs)
+
+    if isinstance(inValue, dict):
+        output = dict()
+
+        for k, v in inValue.items():
+            if keyTypes is None or (isinstance(keyTypes, tuple) and isinstance(k, keyTypes)):
+                k = keyFn(k, **kwargs)
+
+            if valueTypes is None or (isinstance(valueTypes, tuple) and isinstance(v, valueTypes)):
+                v = valueFn(v)
+
+            if isinstance(v, dict):
+                output[k] = recurse(v)
+            elif isinstance(v, list):
+                output[k] = [recurse(i) for i in v]
+            else:
+                output[k] = v
+
+        return output
+    elif isinstance(inValue, list) and len(inValue) > 0:
+        return [recurse(i) for i in inValue]
+
+    return inValue
+
+
+class TestMutateDict(unittest.TestCase):
+    def assertMatchesReference(self, value, keyFn, **kwargs):
+        self.assertEqual(mutate_dict(value, keyFn=keyFn, **kwargs),
+                         reference_mutate_dict(value, keyFn, **kwargs))
+
+    def test_camelize_and_underscore(self):
+        self.assertMatchesReference(PAYLOAD, strings.camelize, keyTypes=string_types,
+                                    upperFirst=True)
+        self.assertMatchesReference(PAYLOAD, strings.underscore, keyTypes=string_types,
+                                    joiner='-')
+        self.assertEqual(camelize_dict(PAYLOAD, upperFirst=True)['Grid'][0][1],
+                         {'CellValue': 2})
+        self.assertEqual(underscore_dict(PAYLOAD)['meta']['tags'][1], {'tag_name': 'b'})
+
+    def test_all_keys(self):
+        # without keyTypes, every key (including non-string ones) is passed to keyFn
+        self.assertMatchesReference(PAYLOAD, repr)
+        self.assertIn('3', mutate_dict(PAYLOAD, keyFn=str))
+
+    def test_value_fn(self):
+        def double(value):
+            return value * 2 if isinstance(value, (int, float)) else value
+
+        self.assertMatchesReference(PAYLOAD, strings.underscore, keyTypes=string_types,
+                                    valueFn=double)
+        self.assertMatchesReference(PAYLOAD, strings.underscore, keyTypes=string_types,
+                                    valueFn=double, valueTypes=(float,))
+
+        rv = mutate_dict(PAYLOAD, keyFn=str, valueFn=double, valueTypes=(int,))
+        self.assertEqual((rv['Id'], rv['Score']), (2, 85.5))
+
+    def test_lists_and_scalars(self):
+        for value in ([PAYLOAD, [PAYLOAD], 1], [[[]]], [], 'value', None):
+            self.assertMatchesReference(value, strings.camelize, keyTypes=string_types)
+
+    def test_input_is_not_modified(self):
+        rv = camelize_dict(PAYLOAD)
+
+        self.assertIsNot(rv['meta'], PAYLOAD['Meta'])
+        self.assertIsNot(rv['rows'][0], PAYLOAD['Rows'][0])
+        self.assertEqual(PAYLOAD['Meta']['PageTitle'], 'Example')
+
+
+class TestConversionCache(unittest.TestCase):
+    def setUp(self):
+        self.size = strings.CONVERSION_CACHE_SIZE
+        strings.CONVERSION_CACHE_SIZE = 8
+        strings._camelized.clear()
+        strings._underscored.clear()
+
+    def tearDown(self):
+        strings.CONVERSION_CACHE_SIZE = self.size
+        strings._camelized.clear()
+        strings._underscored.clear()
+
+    def test_results_match_uncached(self):
+        keys = ['brand_id', 'BrandId', 'page-title', 'Last Scored At', 'x', 'URL'] * 3
+
+        for key in keys:
+            self.assertEqual(strings.camelize(key), strings._camelize(key))
+            self.assertEqual(strings.camelize(key, True), strings._camelize(key, True))
+            self.assertEqual(strings.underscore(key), strings._underscore(key))
+            self.assertEqual(strings.underscore(key, '-'), strings._underscore(key, '-'))
+
+    def test_cache_is_bounded(self):
+        keys = ['key_{0}'.format(i) for i in range(20)]
+
+        for key in keys:
+            self.assertEqual(strings.camelize(key, True), 'Key{0}'.format(key[4:]))
+            self.assertLessEqual(len(strings._camelized), 8)
+
+        # the table is emptied once full, and refilled with subsequent conversions
+        self.assertEqual(len(strings._camelized), 20 % 8)
+        self.assertIn(('key_19', True), strings._camelized)
+
+        for key in keys:
+            self.assertEqual(strings.underscore('Page' + key), 'page' + key)
+
+        self.assertLessEqual(len(strings._underscored), 8)
+        self.assertEqual(strings.underscore('Pagekey_19'), 'pagekey_19')
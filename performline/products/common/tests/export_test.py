@@ -0,0 +1,159 @@
+# Copyright (c) 2016, PerformLine, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the company nor the
+#       names of its contributors may be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL PERFORMLINE, INC. BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import unicode_literals
+import csv
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from ..models import Item
+from .... import export
+
+try:
+    import pyarrow
+    import pyarrow.feather
+except ImportError:  # pragma: no cover
+    pyarrow = None
+from ....testing import mock_client, paginated
+
+RECORDS = [
+    {'Id': i, 'Type': 'web', 'Score': None if i == 3 else i * 10, 'Meta': {'Tags': ['a']}}
+    for i in range(1, 8)
+]
+
+
+class TestExport(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.client = mock_client()
+        self.client.mock_request('get', Item.rest_root, [paginated(RECORDS)])
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def path(self, name):
+        return os.path.join(self.tempdir, name)
+
+    def test_batches(self):
+        batches = list(export.iter_batches(RECORDS, batch_size=3, columns=['Id', 'Missing']))
+
+        self.assertEqual([len(b) for b in batches], [3, 3, 1])
+        self.assertEqual(batches[0].columns['Id'], [1, 2, 3])
+        self.assertEqual(batches[0].columns['Missing'], [None, None, None])
+
+    def test_csv(self):
+        rows = export.export_model(self.client, Item, self.path('items.csv'),
+                                   params={'limit': 2}, batch_size=3)
+
+        with io.open(self.path('items.csv'), newline='', encoding='utf-8') as f:
+            lines = list(csv.reader(f))
+
+        self.assertEqual(rows, 7)
+        self.assertEqual(lines[0], ['Id', 'Type', 'Score', 'Meta'])
+        self.assertEqual(lines[3], ['3', 'web', '', '{"Tags":["a"]}'])
+
+    def test_export_model_reads_every_page(self):
+        records = [{'Id': i, 'Type': 'web'} for i in range(1, 61)]
+        params = []
+        client = mock_client()
+        client.mock_request('get', Item.rest_root, [
+            lambda request, context: params.append(request.qs) or paginated(records)(
+                request, context)
+        ])
+
+        self.assertEqual(export.export_model(client, Item, self.path('items.csv')), 60)
+        self.assertEqual(params[0], {'limit': [str(export.DEFAULT_PAGE_SIZE)]})
+
+        self.assertEqual(export.export_model(client, Item, self.path('items.csv'),
+                                             params={'limit': 2}), 60)
+        self.assertEqual(len(params), 31)
+
+    @unittest.skipIf(export.numpy is None, 'numpy is not installed')
+    def test_numpy(self):
+        batch = next(export.iter_batches(RECORDS))
+        array = batch.to_numpy()
+
+        self.assertEqual(array.Id.dtype.kind, 'i')
+        self.assertEqual(array.Score.dtype.kind, 'f')
+        self.assertEqual(array.Type.dtype.kind, 'O')
+
+    @unittest.skipIf(export.pyarrow is None, 'pyarrow is not installed')
+    def test_arrow_formats(self):
+        import pyarrow.feather
+        import pyarrow.parquet
+
+        for name, read in (('items.parquet', pyarrow.parquet.read_table),
+                           ('items.feather', pyarrow.feather.read_table)):
+            # the first batch has no scores, so the type of the column is inferred from later ones
+            records = [dict(r, Score=None) for r in RECORDS[:2]] + RECORDS[2:]
+            rows = export.export(records, self.path(name), batch_size=2)
+            table = read(self.path(name))
+
+            self.assertEqual(rows, 7)
+            self.assertEqual(table.num_rows, 7)
+            self.assertEqual(table.column('Id').to_pylist(), list(range(1, 8)))
+            self.assertEqual(table.column('Score').to_pylist()[:4], [None, None, None, 40])
+            self.assertEqual(table.schema.field('Meta').type, pyarrow.string())
+
+    @unittest.skipIf(export.pyarrow is None, 'pyarrow is not installed')
+    def test_arrow_promotes_integers(self):
+        import pyarrow.parquet
+
+        # types are inferred once every column has a value, from all of the batches so far
+        records = [
+            {'Id': 1, 'Score': None, 'Type': None},
+            {'Id': 2, 'Score': 85, 'Type': None},
+            {'Id': 3, 'Score': 85.5, 'Type': 'web'},
+        ]
+        export.export(records, self.path('items.parquet'), batch_size=1)
+        table = pyarrow.parquet.read_table(self.path('items.parquet'))
+
+        self.assertEqual(table.schema.field('Id').type, pyarrow.int64())
+        self.assertEqual(table.schema.field('Score').type, pyarrow.float64())
+        self.assertEqual(table.column('Score').to_pylist(), [None, 85.0, 85.5])
+
+    @unittest.skipIf(export.pyarrow is None, 'pyarrow is not installed')
+    def test_arrow_lossy_conversion(self):
+        import pyarrow.parquet
+
+        records = [{'Id': 1, 'Score': 85}, {'Id': 2, 'Score': 85.5}]
+
+        with self.assertRaises(ValueError):
+            export.export(records, self.path('lossy.parquet'), batch_size=1)
+
+        export.export(records, self.path('items.parquet'), batch_size=1,
+                      schema={'Score': pyarrow.float64()})
+        table = pyarrow.parquet.read_table(self.path('items.parquet'))
+
+        self.assertEqual(table.column('Id').to_pylist(), [1, 2])
+        self.assertEqual(table.column('Score').to_pylist(), [85.0, 85.5])
+
+        schema = pyarrow.schema([('Id', pyarrow.int32()), ('Score', pyarrow.float32())])
+        export.export(records, self.path('items.feather'), batch_size=1, schema=schema)
+        table = pyarrow.feather.read_table(self.path('items.feather'))
+
+        self.assertEqual(table.schema, schema)
@@ -0,0 +1,107 @@
+# Copyright (c) 2016, PerformLine, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the company nor the
+#       names of its contributors may be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL PERFORMLINE, INC. BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import unicode_literals
+from datetime import datetime
+import os
+import unittest
+from ....embedded.stdlib.utils import json as codec
+
+
+class TestJSONBackends(unittest.TestCase):
+    def setUp(self):
+        self.selected = codec.backend
+
+    def tearDown(self):
+        codec.backend = self.selected
+
+    def test_backends_agree(self):
+        data = {'Id': 1, 'Name': 'café', 'At': datetime(2020, 1, 2, 3, 4, 5), 'Tags': [1.5, None]}
+        expected = {'Id': 1, 'Name': 'café', 'At': '2020-01-02T03:04:05', 'Tags': [1.5, None]}
+
+        for name in codec.BACKENDS:
+            try:
+                codec.select_backend(name)
+            except ImportError:
+                continue
+
+            self.assertEqual(codec.loads(codec.jsonify(data)), expected, name)
+            self.assertEqual(codec.loads(codec.jsonify(data).encode('utf-8')), expected, name)
+            self.assertEqual(codec.loads(codec.jsonify(data, indent=4)), expected, name)
+
+    def test_falls_back_to_stdlib(self):
+        class Failing(codec.JSONBackend):
+            def loads(self, data):
+                raise ValueError()
+
+            def dumps(self, obj, indent=None, sort_keys=False):
+                raise TypeError()
+
+        codec.backend = Failing()
+
+        self.assertEqual(codec.loads(b'{"Big": 18446744073709551616}'),
+                         {'Big': 18446744073709551616})
+        self.assertEqual(codec.jsonify([1]), '[1]')
+
+        with self.assertRaises(TypeError):
+            codec.jsonify(object())
+
+        with self.assertRaises(ValueError):
+            codec.loads('{')
+
+    def test_pretty_printing_uses_backend(self):
+        try:
+            codec.select_backend('orjson')
+        except ImportError:
+            raise unittest.SkipTest('orjson is not installed')
+
+        from ..models import Item
+        from ....cliutils import out
+        from ....testing import mock_client
+
+        stdlib = codec.STDLIB
+
+        class Unavailable(codec.JSONBackend):
+            def dumps(self, obj, indent=None, sort_keys=False):
+                raise AssertionError('fell back to the stdlib')
+
+        codec.STDLIB = Unavailable()
+
+        try:
+            self.assertEqual(repr(Item(mock_client(), {'Id': 1})), '{\n  "Id": 1\n}')
+            out(type(str('State'), (object,), {'fmt': 'json'}), {'Id': 1})
+        finally:
+            codec.STDLIB = stdlib
+
+    def test_environment_override(self):
+        os.environ[codec.BACKEND_ENV] = 'json'
+
+        try:
+            self.assertIs(type(codec.select_backend()), codec.JSONBackend)
+        finally:
+            del os.environ[codec.BACKEND_ENV]
+
+        with self.assertRaises(ValueError):
+            codec.select_backend('nope')
@@ -0,0 +1,134 @@
+# Copyright (c) 2016, PerformLine, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the company nor the
+#       names of its contributors may be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL PERFORMLINE, INC. BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import unicode_literals
+import unittest
+from ..models import Item, Campaign
+from ....embedded.stdlib.clients.rest.exceptions import NotFound
+from ....embedded.stdlib.clients.rest.loader import Deferred
+from ....testing import mock_client, paginated
+
+ITEMS = [
+    {'Id': i, 'Type': 'web', 'CampaignId': 10 + i % 3, 'BrandId': 1}
+    for i in range(1, 61)
+]
+
+
+class TestBatchLoading(unittest.TestCase):
+    def setUp(self):
+        self.client = mock_client(pool_maxsize=4)
+        self.client.mock_request('get', Item.rest_root, [paginated(ITEMS)])
+        self.requested = []
+
+        for campaign_id in (10, 11, 12):
+            self.client.mock_request(
+                'get',
+                '/common/campaigns/{0}/'.format(campaign_id),
+                [self.respond({'Id': campaign_id, 'BrandId': 1, 'Name': 'c%d' % campaign_id})]
+            )
+
+        self.client.mock_request('get', '/common/brands/1/', [
+            self.respond({'Id': 1, 'Name': 'Brand'}),
+        ])
+
+    def respond(self, result):
+        def fn(request, context):
+            self.requested.append(request.path)
+            return {'Results': [result]}
+
+        return fn
+
+    def items(self):
+        return Item.iall(self.client, params={'limit': 25})
+
+    def test_without_loader(self):
+        names = [item.campaign.name for item in self.items()]
+
+        self.assertEqual(names[:3], ['c11', 'c12', 'c10'])
+        self.assertEqual(len(self.requested), 60)
+
+    def test_batched(self):
+        with self.client.batch_loading() as loader:
+            campaigns = [item.campaign for item in self.items()]
+
+            self.assertTrue(all(isinstance(c, Deferred) for c in campaigns))
+            self.assertEqual(self.requested, [])
+
+            self.assertEqual([c.name for c in campaigns[:3]], ['c11', 'c12', 'c10'])
+            self.assertEqual(sorted(self.requested), [
+                '/common/campaigns/10/',
+                '/common/campaigns/11/',
+                '/common/campaigns/12/',
+            ])
+
+            # nested relationships are deferred (and deduplicated) as well
+            brands = [c.brand for c in campaigns]
+            self.assertEqual(set(b.name for b in brands), set(['Brand']))
+            self.assertEqual(len(self.requested), 4)
+
+        self.assertIsNone(self.client.loader)
+        self.assertIs(loader.client, self.client)
+
+    def test_deferred_behaves_as_instance(self):
+        with self.client.batch_loading() as loader:
+            deferred = loader.defer(Campaign, 10)
+
+            self.assertIsInstance(deferred, Campaign)
+            self.assertEqual(self.requested, [])
+
+            campaign = loader.load(Campaign, 10)
+
+            self.assertEqual(repr(deferred), repr(campaign))
+            self.assertEqual(str(deferred), str(campaign))
+            self.assertEqual(list(deferred), list(campaign))
+            self.assertEqual(deferred, campaign)
+            self.assertEqual(campaign, deferred)
+            self.assertEqual(deferred, loader.defer(Campaign, 10))
+            self.assertNotEqual(deferred, loader.defer(Campaign, 11))
+            self.assertEqual(len(set([deferred, campaign, loader.defer(Campaign, 10)])), 1)
+            self.assertIn('brand', dir(deferred))
+
+    def test_page_is_primed(self):
+        with self.client.batch_loading():
+            item = next(iter(self.items()))
+
+            self.assertEqual(item.campaign.name, 'c11')
+
+        # every campaign referenced on the first page is fetched in the same batch
+        self.assertEqual(len(self.requested), 3)
+
+    def test_missing(self):
+        with self.client.batch_loading() as loader:
+            campaign = Campaign(self.client, {'Id': 99, 'BrandId': None})
+
+            self.assertIsNone(campaign.brand)
+
+            deferred = loader.defer(Campaign, 404)
+            self.client._adapter.register_uri(
+                'GET', self.client.make_url('/common/campaigns/404/'),
+                status_code=404, json={'Results': []}
+            )
+
+            self.assertRaises(NotFound, getattr, deferred, 'name')
@@ -0,0 +1,199 @@
+# Copyright (c) 2016, PerformLine, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the company nor the
+#       names of its contributors may be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL PERFORMLINE, INC. BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import unicode_literals
+import random
+import threading
+import unittest
+import click
+from click.testing import CliRunner
+from ..cli.metrics import metrics
+from ....embedded.stdlib.clients.rest.exceptions import NotFound
+from ....embedded.stdlib.clients.rest.metrics import RequestMetrics, format_report
+from ....embedded.stdlib.clients.rest.retry import RetryPolicy
+from ....embedded.stdlib.clients.rest.utils import make_response
+from ....embedded.stdlib.utils.stats.histogram import Histogram
+from ....testing import mock_client
+
+
+class TestHistogram(unittest.TestCase):
+    def test_small_values_are_exact(self):
+        histogram = Histogram()
+
+        for value in range(1, 11):
+            histogram.record(value)
+
+        self.assertEqual(histogram.percentiles([10, 50, 90, 100]), [1, 5, 9, 10])
+        self.assertEqual(histogram.mean(), 5.5)
+
+    def test_relative_precision(self):
+        rng = random.Random(7)
+        values = [int(rng.lognormvariate(10, 1.5)) for _ in range(20000)]
+        histogram = Histogram()
+
+        for value in values:
+            histogram.record(value)
+
+        values.sort()
+
+        for q in (50, 95, 99, 99.9):
+            exact = values[int(q / 100.0 * len(values)) - 1]
+            self.assertAlmostEqual(histogram.percentile(q) / exact, 1, delta=0.04)
+
+        self.assertEqual((histogram.min, histogram.max), (values[0], values[-1]))
+        self.assertLess(len(histogram.buckets), 800)
+
+    def test_merge(self):
+        a, b = Histogram(), Histogram()
+        a.record(100)
+        b.record(5000, count=3)
+        a.merge(b)
+
+        self.assertEqual((a.count, a.min, a.max, a.total), (4, 100, 5000, 15100))
+        self.assertAlmostEqual(a.percentile(50), 5000, delta=5000 * 0.03)
+
+    def test_empty(self):
+        self.assertEqual(Histogram().percentiles([50, 99]), [None, None])
+        self.assertIsNone(Histogram().mean())
+
+
+class TestRequestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.client = mock_client(retry_policy=RetryPolicy(backoff_factor=0))
+
+    def register(self, path, responses):
+        self.client._adapter.register_uri('GET', self.client.make_url(path), responses)
+
+    def test_endpoint(self):
+        metrics = RequestMetrics()
+
+        self.assertEqual(metrics.endpoint('common/brands/12'), '/common/brands/:id/')
+        self.assertEqual(metrics.endpoint('/common/brands/12/rules/'), '/common/brands/:id/rules/')
+        self.assertEqual(metrics.endpoint('web/pages/5a0b1c2d3e4f5a6b7c8d9e0f/workflow'),
+                         '/web/pages/:id/workflow/')
+        self.assertEqual(metrics.endpoint('common/items'), '/common/items/')
+
+    def test_snapshot(self):
+        self.register('/common/brands/1/', [{'json': make_response({'Id': 1})}])
+        self.register('/common/brands/2/', [
+            {'status_code': 503, 'json': make_response(None, status_code=503)},
+            {'json': make_response({'Id': 2})},
+        ])
+        self.register('/common/brands/3/', [
+            {'status_code': 404, 'json': make_response(None, status_code=404)},
+        ])
+
+        self.client.get('/common/brands/1/')
+        self.client.get('/common/brands/2/')
+
+        with self.assertRaises(NotFound):
+            self.client.get('/common/brands/3/')
+
+        snapshot = self.client.metrics_snapshot()
+        series = dict((s['status'], s) for s in snapshot['endpoints'])
+
+        self.assertEqual(set(s['endpoint'] for s in snapshot['endpoints']),
+                         set(['/common/brands/:id/']))
+        self.assertEqual((snapshot['requests'], snapshot['retries']), (4, 1))
+        self.assertEqual((series['2xx']['requests'], series['2xx']['retries']), (2, 0))
+        self.assertEqual((series['5xx']['requests'], series['5xx']['retries']), (1, 1))
+        self.assertEqual(series['4xx']['requests'], 1)
+
+        latency = series['2xx']['latency']
+        self.assertEqual(latency['count'], 2)
+        self.assertTrue(latency['min'] <= latency['p50'] <= latency['p99'] <= latency['max'])
+        self.assertIn('ttfb', series['2xx']['phases'])
+        self.assertGreater(series['2xx']['rate'], 0)
+
+    def test_disabled(self):
+        client = mock_client(metrics=False)
+        self.assertIsNone(client.metrics_snapshot())
+
+    def test_threads(self):
+        metrics = RequestMetrics()
+
+        def record():
+            for i in range(1000):
+                metrics.record('get', 'common/items/{0}'.format(i), 200, i * 1000)
+
+        threads = [threading.Thread(target=record) for _ in range(8)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        series, = metrics.snapshot()['endpoints']
+
+        self.assertEqual(series['requests'], 8000)
+        self.assertEqual(series['latency']['count'], 8000)
+        self.assertEqual(series['latency']['max'], 0.999)
+
+    def test_report(self):
+        metrics = RequestMetrics()
+        metrics.record('get', 'common/items', 200, 12 * 10 ** 6)
+        metrics.record_retry('get', 'common/items', 503)
+
+        report = [line.split() for line in format_report(metrics.snapshot()).splitlines()]
+
+        self.assertEqual(report[0], ['METHOD', 'ENDPOINT', 'STATUS', 'REQUESTS', 'REQ/S',
+                                     'RETRIES', 'P50', 'MS', 'P95', 'MS', 'P99', 'MS'])
+        self.assertEqual(report[1][:4] + report[1][5:], ['GET', '/common/items/', '2xx', '1',
+                                                         '0', '12.0', '12.0', '12.0'])
+        self.assertEqual(report[2][:4] + report[2][5:], ['GET', '/common/items/', '5xx', '0',
+                                                         '1', '-', '-', '-'])
+        self.assertEqual(report[3][:2] + report[3][3:5], ['1', 'requests', 'and', '1'])
+
+
+class State(object):
+    def __init__(self, client):
+        self.client = client
+
+
+class TestMetricsCommand(unittest.TestCase):
+    def test_reports_after_command(self):
+        client = mock_client()
+        client.mock_request('get', '/common/brands/', [make_response([{'Id': 1}])])
+
+        @click.group()
+        @click.pass_context
+        def main(ctx):
+            ctx.obj = State(client)
+
+        @main.command()
+        @click.option('--limit', type=int)
+        @click.pass_obj
+        def brands(state, limit):
+            state.client.get('/common/brands/', params={'limit': limit})
+            click.echo('done')
+
+        main.add_command(metrics)
+        result = CliRunner().invoke(main, ['metrics', 'brands', '--limit', '5'])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('done', result.output)
+        self.assertIn('/common/brands/', result.output)
+        self.assertIn('1 requests', result.output)
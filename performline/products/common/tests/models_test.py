@@ -0,0 +1,113 @@
+# Copyright (c) 2016, PerformLine, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the company nor the
+#       names of its contributors may be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL PERFORMLINE, INC. BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import unicode_literals
+import unittest
+from ..models import Item
+from ....testing import mock_client, paginated
+
+
+class TestModelAttributes(unittest.TestCase):
+    def setUp(self):
+        self.client = mock_client()
+        self.item = Item(self.client, {
+            'Id': 1,
+            'BrandId': 7,
+            'LastScoredAt': None,
+            'Meta': {'PageTitle': 'Example'},
+        })
+
+    def test_aliases(self):
+        for name in ('brand_id', 'brandId', 'BrandId'):
+            self.assertEqual(getattr(self.item, name), 7)
+
+        self.assertEqual(getattr(self.item, 'Meta/PageTitle'), 'Example')
+        self.assertIsNone(self.item.last_scored_at)
+        self.assertIsNone(self.item.not_a_field)
+
+    def test_set_existing_key(self):
+        self.item.brand_id = 8
+
+        self.assertEqual(self.item._data['BrandId'], 8)
+        self.assertEqual(self.item.BrandId, 8)
+
+    def test_set_unknown_key(self):
+        self.item.unrelated = True
+
+        self.assertNotIn('Unrelated', self.item._data)
+
+    def test_set_field_key(self):
+        class Product(Item):
+            fields = ('score',)
+
+        item = Product(self.client, {'Id': 1})
+        item.score = 90
+
+        self.assertEqual(item._data['Score'], 90)
+        self.assertEqual(item.Score, 90)
+
+    def test_private_attributes_are_not_data(self):
+        item = Item(self.client, {'Id': 1, 'Client': 'x'})
+
+        self.assertEqual(item._data['Client'], 'x')
+        self.assertIs(item.client, self.client)
+
+    def test_index_follows_set_data(self):
+        self.item.set_data({'Id': 2, 'Score': 50})
+
+        self.assertEqual(self.item.score, 50)
+        self.assertIsNone(self.item.brand_id)
+
+
+class TestCompactModel(unittest.TestCase):
+    def test_compact_results(self):
+        client = mock_client()
+        client.mock_request('get', Item.rest_root, [paginated([
+            {'Id': 1, 'BrandId': 7, 'Type': 'web'},
+            {'Id': 2, 'BrandId': 8, 'Type': 'web'},
+            {'BrandId': 9},
+        ])])
+
+        items = list(Item.iall(client, compact=True))
+
+        self.assertEqual([i.id for i in items], [1, 2])
+        self.assertIs(type(items[0]), type(items[1]))
+        self.assertEqual(items[0].brand_id, 7)
+        self.assertEqual(items[0].BrandId, 7)
+        self.assertEqual(items[0].pk, 1)
+        self.assertIsNone(items[0].score)
+        self.assertFalse(hasattr(items[0], '__dict__'))
+
+        with self.assertRaises(AttributeError):
+            items[0].brand_id = 1
+
+        model = items[1].to_model(client)
+
+        self.assertIsInstance(model, Item)
+        self.assertEqual(model.brand_id, 8)
+
+    def test_compact_autoload(self):
+        with self.assertRaises(AttributeError):
+            list(Item.iall(mock_client(), compact=True, autoload=True))
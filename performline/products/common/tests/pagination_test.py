@@ -0,0 +1,129 @@
+# Copyright (c) 2016, PerformLine, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the company nor the
+#       names of its contributors may be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL PERFORMLINE, INC. BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import unicode_literals
+import threading
+import unittest
+from ..models import Brand, Item
+from ....embedded.stdlib.clients.rest.utils import make_response
+from ....testing import mock_client, paginated
+
+ITEMS = [{'Id': i, 'Score': i % 100} for i in range(1, 48)]
+
+
+class TestPagination(unittest.TestCase):
+    def setUp(self):
+        self.client = mock_client()
+        self.offsets = []
+        self.client.mock_request('get', Item.rest_root, [paginated(ITEMS, self.offsets)])
+
+    def test_sequential_pages(self):
+        items = list(Item.iall(self.client, params={'limit': 10}))
+
+        self.assertEqual([i.id for i in items], [i['Id'] for i in ITEMS])
+        self.assertEqual(self.offsets, [0, 10, 20, 30, 40])
+
+    def test_concurrent_pages(self):
+        items = list(Item.iall(self.client, params={'limit': 10}, concurrency=4))
+
+        self.assertEqual([i.id for i in items], [i['Id'] for i in ITEMS])
+        self.assertEqual(sorted(self.offsets), [0, 10, 20, 30, 40])
+
+    def test_server_page_size(self):
+        client = mock_client()
+        offsets = []
+        client.mock_request('get', Item.rest_root, [paginated(ITEMS, offsets, page_size=10)])
+
+        for concurrency in (None, 4):
+            del offsets[:]
+            items = list(Item.iall(client, concurrency=concurrency))
+
+            self.assertEqual([i.id for i in items], [i['Id'] for i in ITEMS])
+            self.assertEqual(sorted(offsets), [0, 10, 20, 30, 40])
+
+    def test_concurrent_pages_client_default(self):
+        self.client.page_concurrency = 3
+        items = list(Item.iall(self.client, params={'limit': 5, 'offset': 20}))
+
+        self.assertEqual([i.id for i in items], [i['Id'] for i in ITEMS[20:]])
+
+    def test_concurrent_pages_max_iterations(self):
+        from ....embedded.stdlib.clients.rest.exceptions import TooManyIterations
+
+        with self.assertRaises(TooManyIterations):
+            list(Item.iall(self.client, params={'limit': 10}, concurrency=4, max_iterations=3))
+
+    def test_pages_are_streamed(self):
+        items = Item.iall(self.client, params={'limit': 10})
+
+        self.assertEqual(next(items).id, 1)
+        self.assertEqual(self.offsets, [0])
+
+    def test_max_results_stops_paging(self):
+        items = list(self.client.items(limit=10))
+
+        self.assertEqual(len(items), 10)
+        self.assertEqual(self.offsets, [0])
+
+    def test_abandoned_pages_stop_workers(self):
+        # (the first request may start long-lived threads of its own, such as for stats)
+        next(Item.iall(self.client, params={'limit': 5}))
+        threads = threading.active_count()
+
+        for consumed in (1, 2):
+            del self.offsets[:]
+            responses = self.client.iget_until(Item.rest_root, params={'limit': 5}, concurrency=2)
+
+            for _ in range(consumed):
+                next(responses)
+
+            responses.close()
+
+            self.assertEqual(threading.active_count(), threads)
+            self.assertLess(len(self.offsets), 10)
+
+    def test_get_many_empty(self):
+        next(Item.iall(self.client, params={'limit': 5}))
+        threads = threading.active_count()
+
+        self.assertEqual(Brand.get_many(self.client, []), {})
+        self.assertEqual(threading.active_count(), threads)
+
+    def test_remaining_offsets_follow_request(self):
+        offsets = []
+
+        # a server that does not report the offset of each page
+        def respond(request, context):
+            limit = int(request.qs['limit'][0])
+            offset = int(request.qs.get('offset', [0])[0])
+            offsets.append(offset)
+
+            return make_response(ITEMS[offset:offset + limit], limit=limit, total=len(ITEMS))
+
+        self.client.mock_request('get', Item.rest_root, [respond])
+        items = list(Item.iall(self.client, params={'limit': 10, 'offset': 20}, concurrency=3))
+
+        self.assertEqual([i.id for i in items], [i['Id'] for i in ITEMS[20:]])
+        self.assertEqual(sorted(offsets), [20, 30, 40])
@@ -0,0 +1,127 @@
+# Copyright (c) 2016, PerformLine, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the company nor the
+#       names of its contributors may be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL PERFORMLINE, INC. BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import unicode_literals
+import json
+import unittest
+import requests
+from ..models import Item
+from ....embedded.stdlib.clients.rest import responses
+from ....embedded.stdlib.clients.rest.responses import SuccessResponse, scan_result_count
+from ....embedded.stdlib.clients.rest.utils import make_response
+from ....testing import mock_client, paginated
+
+
+def raw_response(body):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    return response
+
+
+class TestLazyDecoding(unittest.TestCase):
+    def test_result_count_without_decoding(self):
+        body = json.dumps(make_response([{'Id': i} for i in range(50)], total=500, limit=50))
+        response = SuccessResponse(raw_response(body.encode('utf-8')))
+
+        self.assertEqual(response.total_length, 500)
+        self.assertEqual(response.length, 50)
+        self.assertEqual(response.limit, 50)
+        self.assertEqual(response.offset, 0)
+        self.assertFalse(response.decoded)
+
+        self.assertEqual(len(response.results()), 50)
+        self.assertTrue(response.decoded)
+
+    def test_ambiguous_result_count(self):
+        body = b'{"Results": [{"ResultCount": {"Total": 1}}], "ResultCount": {"Total": 2}}'
+
+        self.assertIsNone(scan_result_count(body))
+        self.assertEqual(SuccessResponse(raw_response(body)).total_length, 2)
+
+    def test_nested_result_count(self):
+        body = b'{"Results": [{"ResultCount": {"Total": 1}}]}'
+
+        self.assertIsNone(scan_result_count(body))
+        self.assertEqual(SuccessResponse(raw_response(body)).total_length, 0)
+
+    def test_empty_body(self):
+        response = SuccessResponse(raw_response(b''))
+
+        self.assertIsNone(response.payload)
+        self.assertEqual(response.total_length, 0)
+
+    def test_client_exposes_raw_body(self):
+        client = mock_client()
+        client.mock_request('get', '/common/brands/', [make_response([{'Id': 1}])])
+        response = client.get('/common/brands/')
+
+        self.assertFalse(response.decoded)
+        self.assertEqual(json.loads(response.content.decode('utf-8'))['Results'], [{'Id': 1}])
+
+
+@unittest.skipIf(responses.ijson is None, 'ijson is not installed')
+class TestStreaming(unittest.TestCase):
+    def test_iter_results(self):
+        client = mock_client()
+        client.mock_request('get', '/common/items/', [{
+            'Status': 'success',
+            'Results': [{'Id': 1, 'Meta': {'Score': 1.5, 'Tags': ['a']}}, {'Id': 2}],
+            'ResultCount': {'Total': 2, 'Limit': 2},
+        }])
+
+        response = client.get('/common/items/', stream=True)
+        results = response.iter_results(chunk_size=8)
+
+        self.assertEqual(next(results), {'Id': 1, 'Meta': {'Score': 1.5, 'Tags': ['a']}})
+        self.assertFalse(response.decoded)
+        self.assertEqual(list(results), [{'Id': 2}])
+        self.assertEqual(response.total_length, 2)
+        self.assertEqual(response.response_status, 'success')
+
+    def test_single_result(self):
+        client = mock_client()
+        client.mock_request('get', '/common/items/1/', [{'Results': {'Id': 1}}])
+
+        response = client.get('/common/items/1/', stream=True)
+
+        self.assertEqual(list(response.iter_results()), [{'Id': 1}])
+
+    def test_stream_models(self):
+        calls = []
+        client = mock_client()
+        client.mock_request('get', Item.rest_root, [
+            paginated([{'Id': i, 'Type': 'web'} for i in range(1, 8)], calls)
+        ])
+
+        items = list(Item.iall(client, stream=True, params={'limit': 3}))
+
+        self.assertEqual([i.id for i in items], list(range(1, 8)))
+        self.assertEqual(calls, [0, 3, 6])
+
+    def test_decoded_response(self):
+        response = SuccessResponse(raw_response(b'{"Results": [{"Id": 1}]}'))
+
+        self.assertEqual(list(response.iter_results()), [{'Id': 1}])
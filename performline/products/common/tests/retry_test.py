@@ -0,0 +1,96 @@
+# Copyright (c) 2016, PerformLine, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the company nor the
+#       names of its contributors may be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL PERFORMLINE, INC. BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import unicode_literals
+import unittest
+from ..models import Item
+from ....embedded.stdlib.clients.rest.exceptions import ServiceUnavailable, NotFound
+from ....embedded.stdlib.clients.rest.retry import RetryPolicy, parse_retry_after
+from ....embedded.stdlib.clients.rest.utils import make_response
+from ....testing import mock_client
+
+
+def page(offset):
+    return {
+        'json': make_response([{'Id': offset + 1}], limit=1, offset=offset, total=3),
+    }
+
+
+class TestRetry(unittest.TestCase):
+    def setUp(self):
+        self.client = mock_client(retry_policy=RetryPolicy(backoff_factor=0))
+
+    def register(self, path, responses):
+        self.client._adapter.register_uri('GET', self.client.make_url(path), responses)
+
+    def test_retries_failed_page_only(self):
+        self.register(Item.rest_root, [
+            page(0),
+            {'status_code': 503, 'json': make_response(None, status_code=503)},
+            {'status_code': 429, 'headers': {'Retry-After': '0'}, 'json': {}},
+            page(1),
+            page(2),
+        ])
+
+        items = list(Item.iall(self.client, params={'limit': 1}))
+        offsets = [r.qs.get('offset', ['0'])[0] for r in self.client._adapter.request_history]
+
+        self.assertEqual([i.id for i in items], [1, 2, 3])
+        self.assertEqual(offsets, ['0', '1', '1', '1', '2'])
+
+    def test_gives_up_after_max_attempts(self):
+        self.register('/common/brands/1', [
+            {'status_code': 503, 'json': make_response(None, status_code=503)},
+        ])
+
+        with self.assertRaises(ServiceUnavailable):
+            self.client.get('/common/brands/1')
+
+        self.assertEqual(self.client._adapter.call_count, 3)
+
+    def test_does_not_retry_client_errors(self):
+        self.register('/common/brands/1', [
+            {'status_code': 404, 'json': make_response(None, status_code=404)},
+        ])
+
+        with self.assertRaises(NotFound):
+            self.client.get('/common/brands/1')
+
+        self.assertEqual(self.client._adapter.call_count, 1)
+
+    def test_backoff(self):
+        policy = RetryPolicy(backoff_factor=1, max_backoff=3, jitter=False)
+
+        self.assertEqual([policy.get_delay(i) for i in (1, 2, 3)], [1, 2, 3])
+        self.assertEqual(policy.should_retry('post', 1, ServiceUnavailable()), False)
+
+    def test_parse_retry_after(self):
+        class Response(object):
+            def __init__(self, value):
+                self.headers = {'Retry-After': value}
+
+        self.assertEqual(parse_retry_after(Response('5')), 5.0)
+        self.assertEqual(parse_retry_after(Response('Wed, 21 Oct 2015 07:28:00 GMT')), 0.0)
+        self.assertEqual(parse_retry_after(Response('soon')), None)
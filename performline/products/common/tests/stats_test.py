@@ -0,0 +1,157 @@
+# Copyright (c) 2016, PerformLine, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the company nor the
+#       names of its contributors may be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL PERFORMLINE, INC. BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import unicode_literals
+import time
+import unittest
+from ....embedded.stdlib.utils import stats
+from ....embedded.stdlib.utils.stats import Stats, StatsBuffer
+
+
+class FakeStatsClient(object):
+    def __init__(self):
+        self.packets = []
+
+    def _send(self, data):
+        self.packets.append(data)
+
+    def incr(self, stat, count=1, rate=1):
+        self.packets.append('{0}:{1}|c'.format(stat, count))
+
+
+class TestStats(unittest.TestCase):
+    def make_stats(self, **kwargs):
+        rv = Stats(prefix='test', tags={'env': 'unit test'}, **kwargs)
+        rv._statsd = FakeStatsClient()
+        return rv
+
+    def lines(self, collector):
+        return [line for packet in collector._statsd.packets for line in packet.split('\n')]
+
+    def test_metric_names_are_memoized(self):
+        collector = self.make_stats()
+        name = collector.get_metric_name('requests', {'path': 'http://a/b'})
+
+        self.assertEqual(name, 'test.requests,env=unit_test,path=http_a_b')
+        self.assertIs(collector.get_metric_name('requests', {'path': 'http://a/b'}), name)
+        self.assertEqual(collector.get_metric_name('requests', ['unhashable']),
+                         'test.requests,env=unit_test')
+
+        collector.tags = {'env': 'prod'}
+        self.assertEqual(collector.get_metric_name('requests', {'path': 'http://a/b'}),
+                         'test.requests,env=prod,path=http_a_b')
+
+    def test_buffered_aggregation(self):
+        collector = self.make_stats(flush_interval=60)
+
+        for _ in range(5):
+            collector.increment('hits', tags={'a': 1})
+
+        collector.decrement('hits', 2, tags={'a': 1})
+        collector.gauge('queue', 10)
+        collector.gauge('queue', 3, delta=True)
+        collector.gauge('depth', -4)
+        collector.timing('latency', 12.5)
+        collector.timing('latency', 7)
+
+        self.assertEqual(collector._statsd.packets, [])
+
+        collector.flush()
+
+        self.assertEqual(len(collector._statsd.packets), 1)
+        self.assertEqual(self.lines(collector), [
+            'test.hits,a=1,env=unit_test:3|c',
+            'test.queue,env=unit_test:13|g',
+            'test.depth,env=unit_test:0|g',
+            'test.depth,env=unit_test:-4|g',
+            'test.latency,env=unit_test:12.500000|ms',
+            'test.latency,env=unit_test:7.000000|ms',
+        ])
+
+        collector.flush()
+        self.assertEqual(len(collector._statsd.packets), 1)
+
+    def test_packets_are_bounded(self):
+        collector = self.make_stats(flush_interval=60)
+
+        for i in range(100):
+            collector.timing('latency', i)
+
+        collector.flush()
+
+        self.assertGreater(len(collector._statsd.packets), 1)
+        self.assertTrue(all(len(p) <= 512 for p in collector._statsd.packets))
+        self.assertEqual(len(self.lines(collector)), 100)
+
+    def test_background_flush_on_size(self):
+        collector = self.make_stats(flush_interval=60, max_buffer_size=10)
+
+        for _ in range(10):
+            collector.increment('hits')
+
+        deadline = time.time() + 2
+
+        while not collector._statsd.packets and time.time() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(self.lines(collector), ['test.hits,env=unit_test:10|c'])
+
+    def test_unbuffered(self):
+        collector = self.make_stats(buffered=False)
+        collector.increment('hits')
+
+        self.assertIsNone(collector.buffer)
+        self.assertEqual(collector._statsd.packets, ['test.hits,env=unit_test:1|c'])
+
+    def test_disabled(self):
+        collector = self.make_stats(enabled=False)
+        collector.increment('hits')
+        collector.timing('latency', 1)
+        collector.flush()
+
+        self.assertEqual(collector._statsd.packets, [])
+
+    def test_sampled_counters_keep_their_rate(self):
+        buffer = StatsBuffer(lambda packet: None)
+        buffer.count('hits', 1, 0.5)
+        buffer.count('hits', 1, 0.5)
+        buffer.count('hits', 1)
+
+        self.assertEqual(sorted(buffer.lines()), ['hits:1|c', 'hits:2|c|@0.5'])
+
+    def test_module_functions(self):
+        previous = stats.default
+        stats.default = self.make_stats()
+
+        try:
+            stats.increment('hits')
+            stats.disable()
+            stats.increment('hits')
+            stats.enable()
+            stats.flush()
+
+            self.assertEqual(self.lines(stats.default), ['test.hits,env=unit_test:1|c'])
+        finally:
+            stats.default = previous
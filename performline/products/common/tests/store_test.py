@@ -0,0 +1,113 @@
+# Copyright (c) 2016, PerformLine, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the company nor the
+#       names of its contributors may be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL PERFORMLINE, INC. BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import unicode_literals
+import unittest
+from ....embedded.stdlib.clients.rest.exceptions import NotFound
+from ....embedded.stdlib.clients.rest.utils import make_response
+from ....store import Store
+from ....testing import mock_client, paginated
+
+
+class TestStore(unittest.TestCase):
+    def setUp(self):
+        self.client = mock_client()
+        self.records = {
+            'brands': [{'Id': 1, 'Name': 'One'}, {'Id': 2, 'Name': 'Two'}],
+            'campaigns': [
+                {'Id': 10, 'BrandId': 1, 'Name': 'A'},
+                {'Id': 20, 'BrandId': 2, 'Name': 'B'},
+            ],
+            'rules': [],
+            'trafficsources': [{'Id': 5, 'Name': 'Source'}],
+            'items': [
+                {'Id': i, 'Type': 'web', 'BrandId': 1, 'CampaignId': 10, 'Score': i * 10}
+                for i in range(1, 6)
+            ] + [{'Id': 6, 'Type': 'call', 'BrandId': 2, 'CampaignId': 20, 'Score': None}],
+        }
+
+        for table, records in self.records.items():
+            self.client.mock_request('get', '/common/{0}/'.format(table), [paginated(records)])
+
+        self.store = Store(self.client, ':memory:', page_size=2)
+
+    def test_load_and_query(self):
+        loaded = self.store.load()
+
+        self.assertEqual(dict(loaded), {
+            'brands': 2, 'campaigns': 2, 'rules': 0, 'trafficsources': 1, 'items': 6,
+        })
+        self.assertEqual([i.id for i in self.store.items_by_campaign(10)], [1, 2, 3, 4, 5])
+        self.assertEqual([i.id for i in self.store.items_below_score(30)], [1, 2])
+        self.assertEqual([i.id for i in self.store.items(type='call')], [6])
+
+        tree = self.store.brand_tree()
+
+        self.assertEqual([b['brand'].name for b in tree], ['One', 'Two'])
+        self.assertEqual([c['campaign'].name for c in tree[0]['campaigns']], ['A'])
+        self.assertEqual(len(tree[0]['campaigns'][0]['items']), 5)
+        self.assertEqual(tree[1]['campaigns'][0]['items'][0].score, None)
+
+    def test_load_many_pages(self):
+        self.records['items'].extend(
+            {'Id': i, 'BrandId': 1, 'CampaignId': 10, 'Score': 50} for i in range(7, 61)
+        )
+
+        self.assertEqual(self.store.load(['items'])['items'], 60)
+        self.assertEqual(len(self.store.items()), 60)
+
+    def test_refresh(self):
+        self.store.load()
+        self.records['items'][0]['Score'] = 95
+        self.records['items'].append({'Id': 7, 'BrandId': 1, 'CampaignId': 10, 'Score': 0})
+
+        # an incremental refresh only reads the end of the result set
+        self.assertEqual(self.store.refresh(['items'])['items'], 1)
+        self.assertEqual([i.id for i in self.store.items_below_score(30)], [7, 1, 2])
+        self.assertEqual(self.store.refresh(['items'], full=True)['items'], 1)
+        self.assertEqual([i.id for i in self.store.items_below_score(30)], [7, 2])
+        self.assertEqual(self.store.count('items'), 7)
+
+    def test_failed_load_keeps_records(self):
+        self.store.load()
+        state = self.store.state.get('items')
+        respond = paginated(self.records['items'])
+
+        def failing(request, context):
+            if int(request.qs.get('offset', [0])[0]) >= 2:
+                context.status_code = 404
+                return make_response(None, status_code=404)
+
+            return respond(request, context)
+
+        self.client.mock_request('get', '/common/items/', [failing])
+
+        with self.assertRaises(NotFound):
+            self.store.load()
+
+        # the entities before the failure were reloaded, and the failed one was left as it was
+        self.assertEqual(self.store.count('brands'), 2)
+        self.assertEqual(self.store.count('items'), 6)
+        self.assertEqual(self.store.state.get('items'), state)
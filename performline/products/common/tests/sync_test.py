@@ -0,0 +1,140 @@
+# Copyright (c) 2016, PerformLine, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the company nor the
+#       names of its contributors may be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL PERFORMLINE, INC. BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import unicode_literals
+import os
+import shutil
+import tempfile
+import unittest
+from ..models import Item
+from ....sync import Endpoint, Syncer, SyncState, DESCENDING, record_fingerprint
+from ....testing import mock_client, paginated
+
+
+class TestIncrementalSync(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tempdir, 'state.json')
+        self.client = mock_client()
+        self.records = [{'Id': i, 'Score': 1, 'CreatedAt': '2020-01-%02d' % i} for i in range(1, 8)]
+        self.calls = []
+        self.client.mock_request('get', Item.rest_root, [paginated(self.records, self.calls)])
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def sync(self, endpoint, **kwargs):
+        del self.calls[:]
+        return [i.id for i in Syncer(self.client, self.path).sync(endpoint, **kwargs)]
+
+    def test_ascending(self):
+        endpoint = Endpoint('items', Item, params={'limit': 2}, timestamp_field='CreatedAt')
+
+        self.assertEqual(self.sync(endpoint), [1, 2, 3, 4, 5, 6, 7])
+        self.assertEqual(SyncState(self.path).get('items')['watermark'], '2020-01-07')
+
+        self.assertEqual(self.sync(endpoint), [])
+        self.assertEqual(self.calls, [5])
+
+        self.records.append({'Id': 8, 'Score': 1})
+        self.records[0]['Score'] = 2
+
+        self.assertEqual(self.sync(endpoint), [8])
+        self.assertEqual(self.sync(endpoint, full=True), [1])
+        self.assertEqual(self.calls, [0, 2, 4, 6])
+
+    def test_descending(self):
+        self.records.reverse()
+        endpoint = Endpoint('items', Item, params={'limit': 2}, order=DESCENDING)
+
+        self.assertEqual(self.sync(endpoint), [7, 6, 5, 4, 3, 2, 1])
+
+        self.records.insert(0, {'Id': 8})
+
+        self.assertEqual(self.sync(endpoint), [8])
+        self.assertEqual(self.calls, [0])
+
+    def test_interrupted_sync_is_repeated(self):
+        endpoint = Endpoint('items', Item, params={'limit': 2})
+        syncer = Syncer(self.client, self.path)
+
+        for item in syncer.sync(endpoint):
+            break
+
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(syncer.state.endpoints, {})
+        self.assertEqual(len(list(syncer.sync(endpoint))), 7)
+        self.assertEqual(len(self.sync(endpoint)), 0)
+
+    def test_state_is_updated_after_endpoint(self):
+        endpoint = Endpoint('items', Item, params={'limit': 2})
+        syncer = Syncer(self.client, self.path)
+        items = syncer.sync(endpoint)
+
+        for _ in range(5):
+            next(items)
+            self.assertEqual(syncer.state.get('items'), {})
+
+        self.assertEqual(len(list(items)), 2)
+        self.assertEqual(len(syncer.state.get('items')['fingerprints']), 7)
+
+    def test_server_page_size(self):
+        # the server pages requests without a limit, and the result set spans over 25 pages
+        records = [{'Id': i, 'Score': 1} for i in range(1, 301)]
+        calls = []
+        client = mock_client()
+        client.mock_request('get', Item.rest_root, [paginated(records, calls, page_size=10)])
+        endpoint = Endpoint('items', Item)
+
+        self.assertEqual(len(list(Syncer(client, self.path).sync(endpoint))), 300)
+        self.assertEqual(len(calls), 30)
+
+        del calls[:]
+        records.append({'Id': 301, 'Score': 1})
+
+        self.assertEqual([i.id for i in Syncer(client, self.path).sync(endpoint)], [301])
+        self.assertEqual(calls[0], 200)
+
+    def test_default_endpoints(self):
+        self.records.extend({'Id': i, 'Score': 1} for i in range(8, 3001))
+        params = []
+        self.client.mock_request('get', Item.rest_root, [
+            lambda request, context: params.append(request.qs) or paginated(self.records)(
+                request, context)
+        ])
+
+        items = Syncer(self.client, self.path).sync('items', params={'brand': 1}, concurrency=4)
+
+        self.assertEqual(len(list(items)), 3000)
+        self.assertEqual(len(params), 30)
+        self.assertEqual(params[0], {'limit': ['100'], 'brand': ['1']})
+
+    def test_fingerprint(self):
+        a = Item(self.client, {'Id': 1, 'Score': 85.5, 'Name': 'caf\u00e9'})
+        b = Item(self.client, {'Name': 'caf\u00e9', 'Score': 85.5, 'Id': 1})
+        c = Item(self.client, {'Id': 1, 'Score': 85, 'Name': 'caf\u00e9'})
+
+        self.assertEqual(record_fingerprint(a), record_fingerprint(b))
+        self.assertNotEqual(record_fingerprint(a), record_fingerprint(c))
@@ -0,0 +1,155 @@
+# Copyright (c) 2016, PerformLine, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the company nor the
+#       names of its contributors may be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL PERFORMLINE, INC. BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import unicode_literals
+import json
+import threading
+import unittest
+from six.moves.BaseHTTPServer import BaseHTTPRequestHandler
+from six.moves.socketserver import ThreadingMixIn
+from six.moves.BaseHTTPServer import HTTPServer as BaseHTTPServer
+from ..models import Item
+from ....client import Client
+from ....embedded.stdlib.utils import stats
+from ....embedded.stdlib.utils.stats import Stats
+from ....testing import mock_client, paginated
+
+
+class HTTPServer(ThreadingMixIn, BaseHTTPServer):
+    daemon_threads = True
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = json.dumps({
+            'Results': [{'Id': 1}, {'Id': 2}],
+            'ResultCount': {'Total': 2},
+        }).encode('utf-8')
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestTiming(unittest.TestCase):
+    def setUp(self):
+        self.previous = stats.default
+        stats.default = Stats(flush_interval=60)
+
+    def tearDown(self):
+        stats.default = self.previous
+
+    def timings(self):
+        rv = {}
+
+        for line in stats.default.buffer.lines():
+            name, value = line.split(':', 1)
+
+            if value.endswith('|ms'):
+                rv.setdefault(name.split(',')[0], []).append(float(value[:-3]))
+
+        return rv
+
+    def test_time_reports_errors(self):
+        @stats.time('decorated')
+        def fail():
+            raise ValueError()
+
+        self.assertRaises(ValueError, fail)
+        self.assertEqual(fail.__name__, 'fail')
+
+        timer = stats.time('block')
+
+        with self.assertRaises(KeyError):
+            with timer:
+                {}['missing']
+
+        self.assertGreaterEqual(timer.elapsed_ms, 0)
+        self.assertEqual(sorted(self.timings()), ['block', 'decorated'])
+
+    def test_phases(self):
+        client = mock_client()
+        client.mock_request('get', Item.rest_root, [paginated([{'Id': 1}, {'Id': 2}])])
+
+        self.assertEqual(len(list(Item.iall(client))), 2)
+
+        timings = self.timings()
+
+        for metric in ('request', 'request.ttfb', 'request.download', 'response.decode',
+                       'models.build'):
+            self.assertIn('performline.clients.rest.{0}.time'.format(metric), timings)
+
+        # requests_mock doesn't open connections
+        self.assertNotIn('performline.clients.rest.request.connect.time', timings)
+
+    def test_connect_phase(self):
+        server = HTTPServer(('127.0.0.1', 0), Handler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+        client = Client('token')
+        client.url = 'http://127.0.0.1:{0}'.format(server.server_port)
+
+        try:
+            self.assertEqual(client.get('/common/items/').results(), [{'Id': 1}, {'Id': 2}])
+            self.assertEqual(client.get('/common/items/').total_length, 2)
+        finally:
+            client.session.close()
+            server.shutdown()
+            server.server_close()
+
+        timings = self.timings()
+        total = timings['performline.clients.rest.request.time']
+
+        # the second request reuses the pooled connection
+        self.assertEqual(len(timings['performline.clients.rest.request.connect.time']), 1)
+        self.assertEqual(len(timings['performline.clients.rest.request.ttfb.time']), 2)
+        self.assertEqual(len(total), 2)
+        self.assertLessEqual(
+            timings['performline.clients.rest.request.connect.time'][0] +
+            timings['performline.clients.rest.request.ttfb.time'][0],
+            total[0]
+        )
+
+    def test_error_phases(self):
+        client = mock_client()
+        client.retry_policy = None
+        client._adapter.register_uri('GET', client.make_url('/common/items/9/'),
+                                     status_code=404, json={'Results': []})
+
+        self.assertRaises(Exception, Item.get, client, 9)
+
+        timings = self.timings()
+
+        self.assertIn('performline.clients.rest.request.time', timings)
+        self.assertIn('performline.clients.rest.request.download.time', timings)
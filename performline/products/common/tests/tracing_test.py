@@ -0,0 +1,308 @@
+# Copyright (c) 2016, PerformLine, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the company nor the
+#       names of its contributors may be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL PERFORMLINE, INC. BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import unicode_literals
+import unittest
+from ..models import Brand, Item
+from ....embedded.stdlib.clients.rest.exceptions import NotFound, ServiceUnavailable
+from ....embedded.stdlib.clients.rest.hooks import RequestHooks
+from ....embedded.stdlib.clients.rest.retry import RetryPolicy
+from ....embedded.stdlib.clients.rest.utils import make_response
+from ....testing import mock_client, paginated
+
+try:
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+    from opentelemetry.trace import StatusCode
+    from ....embedded.stdlib.clients.rest.tracing import OpenTelemetryHooks
+except ImportError:
+    TracerProvider = None
+
+try:
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+    from ....aio import AsyncClient
+except ImportError:
+    web = None
+
+ITEMS = [{'Id': i} for i in range(1, 8)]
+
+
+class RecordingHooks(RequestHooks):
+    def __init__(self):
+        self.calls = []
+
+    def before_request(self, event):
+        self.calls.append(('before_request', event))
+
+    def after_response(self, event):
+        self.calls.append(('after_response', event))
+
+    def on_error(self, event):
+        self.calls.append(('on_error', event))
+
+    def on_retry(self, event):
+        self.calls.append(('on_retry', event))
+
+    def before_pages(self, event):
+        self.calls.append(('before_pages', event))
+
+    def after_pages(self, event):
+        self.calls.append(('after_pages', event))
+
+    def names(self):
+        return [name for name, _ in self.calls]
+
+    def events(self, name):
+        return [event for n, event in self.calls if n == name]
+
+
+class TestRequestHooks(unittest.TestCase):
+    def setUp(self):
+        self.hooks = RecordingHooks()
+        self.client = mock_client(hooks=self.hooks, retry_policy=RetryPolicy(backoff_factor=0))
+
+    def register(self, path, responses):
+        self.client._adapter.register_uri('GET', self.client.make_url(path), responses)
+
+    def test_success(self):
+        self.register('/common/brands/1', [{'json': make_response({'Id': 1})}])
+        self.client.get('/common/brands/1', params={'x': 1})
+
+        self.assertEqual(self.hooks.names(), ['before_request', 'after_response'])
+
+        event = self.hooks.events('after_response')[0]
+        self.assertIs(event, self.hooks.events('before_request')[0])
+        self.assertEqual(event.method, 'get')
+        self.assertEqual(event.path, 'common/brands/1')
+        self.assertEqual(event.params, {'x': 1})
+        self.assertEqual(event.attempt, 1)
+        self.assertEqual(event.status, 200)
+        self.assertGreater(event.response_bytes, 0)
+        self.assertGreaterEqual(event.elapsed_ms, 0)
+        self.assertIn('ttfb', event.phases)
+        self.assertIsNone(event.error)
+        self.assertIsNone(event.parent)
+
+    def test_error(self):
+        self.register('/common/brands/1', [
+            {'status_code': 404, 'json': make_response(None, status_code=404)},
+        ])
+
+        with self.assertRaises(NotFound):
+            self.client.get('/common/brands/1')
+
+        self.assertEqual(self.hooks.names(), ['before_request', 'on_error'])
+
+        event = self.hooks.events('on_error')[0]
+        self.assertEqual(event.status, 404)
+        self.assertIsInstance(event.error, NotFound)
+        self.assertIsNotNone(event.elapsed_ms)
+
+    def test_retry(self):
+        self.register('/common/brands/1', [
+            {'status_code': 503, 'json': make_response(None, status_code=503)},
+            {'json': make_response({'Id': 1})},
+        ])
+
+        self.client.get('/common/brands/1')
+
+        self.assertEqual(self.hooks.names(), [
+            'before_request', 'on_retry', 'before_request', 'after_response',
+        ])
+
+        retried, succeeded = self.hooks.events('before_request')
+        self.assertEqual((retried.attempt, retried.status, retried.delay), (1, 503, 0))
+        self.assertIsInstance(retried.error, ServiceUnavailable)
+        self.assertEqual((succeeded.attempt, succeeded.status), (2, 200))
+
+    def test_retries_exhausted(self):
+        self.register('/common/brands/1', [
+            {'status_code': 503, 'json': make_response(None, status_code=503)},
+        ])
+
+        with self.assertRaises(ServiceUnavailable):
+            self.client.get('/common/brands/1')
+
+        self.assertEqual(self.hooks.names(), [
+            'before_request', 'on_retry',
+            'before_request', 'on_retry',
+            'before_request', 'on_error',
+        ])
+
+    def test_pages(self):
+        for concurrency in (1, 3):
+            self.hooks.calls = []
+            self.client.mock_request('get', Item.rest_root, [paginated(ITEMS)])
+
+            items = list(Item.iall(self.client, params={'limit': 2}, concurrency=concurrency))
+
+            self.assertEqual(len(items), len(ITEMS))
+
+            pages, = self.hooks.events('before_pages')
+            requests = self.hooks.events('after_response')
+
+            self.assertEqual(self.hooks.names()[0], 'before_pages')
+            self.assertEqual(self.hooks.names()[-1], 'after_pages')
+            self.assertEqual(pages.pages, 4)
+            self.assertIsNone(pages.error)
+            self.assertEqual(sorted(r.params.get('offset', 0) for r in requests), [0, 2, 4, 6])
+            self.assertTrue(all(r.parent is pages for r in requests))
+
+    def test_pages_abandoned(self):
+        self.client.mock_request('get', Item.rest_root, [paginated(ITEMS)])
+
+        pages = self.client.iget_until(Item.rest_root, params={'limit': 2})
+        next(pages)
+        pages.close()
+
+        self.assertEqual(self.hooks.names(), ['before_pages', 'before_request', 'after_response',
+                                              'after_pages'])
+        self.assertEqual(self.hooks.events('after_pages')[0].pages, 1)
+
+    def test_no_hooks(self):
+        client = mock_client()
+        client.mock_request('get', Item.rest_root, [paginated(ITEMS)])
+
+        self.assertEqual(len(client.request_until('get', Item.rest_root, params={'limit': 2})), 4)
+
+
+@unittest.skipIf(TracerProvider is None, 'opentelemetry-sdk is not installed')
+class TestOpenTelemetryHooks(unittest.TestCase):
+    def setUp(self):
+        self.exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(self.exporter))
+
+        self.client = mock_client(
+            hooks=OpenTelemetryHooks(tracer_provider=provider),
+            retry_policy=RetryPolicy(backoff_factor=0)
+        )
+
+    def register(self, path, responses):
+        self.client._adapter.register_uri('GET', self.client.make_url(path), responses)
+
+    def test_request_span(self):
+        self.register('/common/brands/1/', [{'json': make_response({'Id': 1, 'Name': 'B'})}])
+        Brand.get(self.client, 1)
+
+        span, = self.exporter.get_finished_spans()
+
+        self.assertEqual(span.name, 'GET common/brands/1')
+        self.assertEqual(span.attributes['http.request.method'], 'GET')
+        self.assertEqual(span.attributes['http.response.status_code'], 200)
+        self.assertGreater(span.attributes['http.response.body.size'], 0)
+        self.assertIsNone(span.parent)
+
+    def test_error_and_retry_spans(self):
+        self.register('/common/brands/1/', [
+            {'status_code': 503, 'json': make_response(None, status_code=503)},
+            {'status_code': 404, 'json': make_response(None, status_code=404)},
+        ])
+
+        with self.assertRaises(NotFound):
+            self.client.get('/common/brands/1/')
+
+        retried, failed = self.exporter.get_finished_spans()
+
+        self.assertEqual(retried.attributes['performline.attempt'], 1)
+        self.assertEqual(retried.attributes['performline.retry.delay'], 0)
+        self.assertEqual(retried.status.status_code, StatusCode.ERROR)
+        self.assertEqual(failed.attributes['performline.attempt'], 2)
+        self.assertEqual(failed.attributes['http.response.status_code'], 404)
+        self.assertEqual(failed.attributes['error.type'], 'NotFound')
+
+    def test_page_spans_are_children(self):
+        self.client.mock_request('get', Item.rest_root, [paginated(ITEMS)])
+        list(Item.iall(self.client, params={'limit': 2}, concurrency=3))
+
+        spans = self.exporter.get_finished_spans()
+        parents = [s for s in spans if s.name.endswith('(paginated)')]
+        children = [s for s in spans if s not in parents]
+
+        self.assertEqual(len(parents), 1)
+        self.assertEqual(parents[0].attributes['performline.pages'], 4)
+        self.assertEqual(len(children), 4)
+
+        for span in children:
+            self.assertEqual(span.parent.span_id, parents[0].context.span_id)
+            self.assertEqual(span.context.trace_id, parents[0].context.trace_id)
+
+
+async def list_items(request):
+    limit = int(request.query.get('limit', len(ITEMS)))
+    offset = int(request.query.get('offset', 0))
+
+    return web.json_response(make_response(ITEMS[offset:offset + limit],
+                                           limit=limit,
+                                           offset=offset,
+                                           total=len(ITEMS)))
+
+
+async def get_brand(request):
+    return web.json_response(make_response(None, status_code=404), status=404)
+
+
+@unittest.skipIf(web is None, 'aiohttp is not installed')
+class TestAsyncRequestHooks(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        app = web.Application()
+        app.router.add_get('/common/items/', list_items)
+        app.router.add_get('/common/brands/{id}/', get_brand)
+
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+        self.hooks = RecordingHooks()
+        self.client = AsyncClient('mock', url=str(self.server.make_url('/')), hooks=self.hooks)
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.server.close()
+
+    async def test_error(self):
+        with self.assertRaises(NotFound):
+            await self.client.get('/common/brands/1/')
+
+        self.assertEqual(self.hooks.names(), ['before_request', 'on_error'])
+        self.assertEqual(self.hooks.events('on_error')[0].status, 404)
+
+    async def test_pages(self):
+        responses = []
+
+        async for response in self.client.iget_until(Item.rest_root, params={'limit': 2},
+                                                     concurrency=3):
+            responses.append(response)
+
+        pages, = self.hooks.events('before_pages')
+        requests = self.hooks.events('after_response')
+
+        self.assertEqual(len(responses), 4)
+        self.assertEqual(pages.pages, 4)
+        self.assertEqual(self.hooks.names()[-1], 'after_pages')
+        self.assertEqual(len(requests), 4)
+        self.assertTrue(all(r.parent is pages for r in requests))
+        self.assertTrue(all(r.status == 200 and r.response_bytes > 0 for r in requests))
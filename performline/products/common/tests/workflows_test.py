@@ -0,0 +1,131 @@
+# Copyright (c) 2016, PerformLine, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the company nor the
+#       names of its contributors may be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL PERFORMLINE, INC. BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import unicode_literals
+import json
+import threading
+import time
+import unittest
+from click.testing import CliRunner
+from ..cli.workflows import bulk
+from ....embedded.stdlib.clients.rest.exceptions import NotFound
+from ....embedded.stdlib.utils.threading import imap_unordered_bounded
+from ....testing import mock_client
+
+
+class State(object):
+    def __init__(self, client):
+        self.client = client
+        self.fmt = 'json'
+
+
+class TestWorkflowsMany(unittest.TestCase):
+    def setUp(self):
+        self.client = mock_client()
+
+        for id, root in ((1, '/web/pages/'), (2, '/callcenter/calls/'), (3, '/common/items/')):
+            self.client.mock_request('get', '{0}{1}/workflow/'.format(root, id), [
+                {'Results': [{'Status': 'Open', 'Item': id}]},
+            ])
+
+        self.client._adapter.register_uri('GET', self.client.make_url('/chatscout/chats/4/workflow/'),
+                                          status_code=404, json={'Results': []})
+
+    def test_workflows_many(self):
+        results = list(self.client.workflows_many(
+            [(1, 'web'), (2, 'callcenter'), 3, (4, 'chat'), (1, 'web')],
+            concurrency=3
+        ))
+
+        self.assertEqual(len(results), 4)
+        self.assertEqual(self.client._adapter.call_count, 4)
+
+        by_id = dict((id, (product, result)) for id, product, result in results)
+
+        self.assertEqual(by_id[1], ('web', [{'Status': 'Open', 'Item': 1}]))
+        self.assertEqual(by_id[2], ('callcenter', [{'Status': 'Open', 'Item': 2}]))
+        self.assertEqual(by_id[3], (None, [{'Status': 'Open', 'Item': 3}]))
+        self.assertIsInstance(by_id[4][1], NotFound)
+
+    def test_cli_bulk(self):
+        result = CliRunner().invoke(
+            bulk,
+            ['--product', 'web', '--concurrency', '2'],
+            input='1\n2,calls\n\nabc chat\n4 chat\n',
+            obj=State(self.client)
+        )
+
+        self.assertEqual(result.exit_code, 0, result.output)
+
+        records = [json.loads(line) for line in result.output.splitlines()]
+        by_id = dict((r['Id'], r) for r in records)
+
+        self.assertEqual(len(records), 4)
+        self.assertEqual(by_id[1], {
+            'Id': 1,
+            'Product': 'web',
+            'Results': [{'Status': 'Open', 'Item': 1}],
+        })
+        self.assertEqual(by_id[2]['Product'], 'calls')
+        self.assertEqual(by_id['abc']['Error']['Message'], 'Invalid item ID')
+        self.assertEqual(by_id[4]['Error']['StatusCode'], 404)
+
+
+class TestImapUnordered(unittest.TestCase):
+    def test_results_in_completion_order(self):
+        def fn(delay):
+            time.sleep(delay)
+            return delay
+
+        self.assertEqual(list(imap_unordered_bounded(fn, [0.05, 0.0, 0.02], 3)), [0.0, 0.02, 0.05])
+        self.assertEqual(list(imap_unordered_bounded(fn, [], 3)), [])
+
+    def test_bounded(self):
+        lock = threading.Lock()
+        active = [0, 0]
+
+        def fn(value):
+            with lock:
+                active[0] += 1
+                active[1] = max(active)
+
+            time.sleep(0.005)
+
+            with lock:
+                active[0] -= 1
+
+            return value
+
+        self.assertEqual(sorted(imap_unordered_bounded(fn, range(20), 3)), list(range(20)))
+        self.assertLessEqual(active[1], 3)
+
+    def test_exceptions_are_raised(self):
+        def fn(value):
+            if value == 2:
+                raise ValueError(value)
+
+            return value
+
+        self.assertRaises(ValueError, list, imap_unordered_bounded(fn, [1, 2, 3], 1))
@@ -42,7 +42,7 @@ class WebClientMethods(object):
         Returns:
             An instance of :class:`~performline.products.web.models.WebPage`
             if ``id`` is not `None` representing the page with that ID.
-            Otherwise, retrieve a list of
+            Otherwise, return an iterator of
             :class:`~performline.products.web.models.WebPage` instances of all
             pages associated with the account.
 
@@ -58,3 +58,21 @@ class WebClientMethods(object):
             }))
         else:
             return WebPage.get(self, id)
+
+    def webpages_by_ids(self, ids, concurrency=None):
+        """
+        Retrieve several web pages by ID in parallel.
+
+        Args:
+            ids (iterable): The IDs of the pages to retrieve.
+
+            concurrency (int, optional): The maximum number of simultaneous
+                requests.  Defaults to the client's ``pool_maxsize``.
+
+        Returns:
+            An ordered dict mapping each distinct ID to its
+            :class:`~performline.products.web.models.WebPage`, or to the
+            :class:`~performline.clients.rest.exceptions.ErrorResponse`
+            raised while retrieving it (e.g.: ``NotFound``).
+        """
+        return WebPage.get_many(self, ids, concurrency=concurrency)
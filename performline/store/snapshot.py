@@ -0,0 +1,387 @@
+# Copyright (c) 2016, PerformLine, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the company nor the
+#       names of its contributors may be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL PERFORMLINE, INC. BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+from __future__ import absolute_import
+from collections import OrderedDict
+from contextlib import contextmanager
+import sqlite3
+from ..embedded.stdlib.utils.json import jsonify, loads
+from ..products.common.models import Brand, Campaign, Rule, TrafficSource, Item
+from ..sync import Endpoint, Syncer, SyncState
+
+# the entities mirrored by a store, in load order: each is stored in a table of the same name
+# with an ``id`` primary key, the record's JSON in ``data``, and the listed (column, attribute)
+# pairs extracted for indexing and querying
+ENTITIES = OrderedDict([
+    ('brands', (Brand, [
+        ('name', 'name'),
+    ])),
+    ('campaigns', (Campaign, [
+        ('brand_id', 'brand_id'),
+        ('name', 'name'),
+    ])),
+    ('rules', (Rule, [
+        ('name', 'name'),
+    ])),
+    ('trafficsources', (TrafficSource, [
+        ('name', 'name'),
+    ])),
+    ('items', (Item, [
+        ('type', 'type'),
+        ('brand_id', 'brand_id'),
+        ('campaign_id', 'campaign_id'),
+        ('traffic_source_id', 'traffic_source_id'),
+        ('score', 'score'),
+        ('created_at', 'created_at'),
+        ('last_scored_at', 'last_scored_at'),
+    ])),
+])
+
+INDEXES = [
+    ('campaigns', 'brand_id'),
+    ('items', 'brand_id'),
+    ('items', 'campaign_id'),
+    ('items', 'traffic_source_id'),
+    ('items', 'score'),
+]
+
+
+class StoreSyncState(SyncState):
+    """
+    A :class:`~performline.sync.SyncState` kept in the store's database.  Saving it does not
+    commit, so that it is committed together with the data it describes.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.endpoints = {}
+
+        row = db.execute("SELECT value FROM meta WHERE key = 'sync'").fetchone()
+
+        if row is not None:
+            self.endpoints = loads(row[0]).get('endpoints', {})
+
+    def save(self):
+        self.db.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('sync', ?)",
+            (jsonify({'endpoints': self.endpoints}),)
+        )
+
+
+class Store(object):
+    """
+    Mirrors the brands, campaigns, rules, traffic sources and items of an account into an
+    indexed SQLite database.
+
+    Records returned by the query methods are read-only
+    :class:`~performline.clients.rest.models.CompactModel` instances of the corresponding model.
+
+    Args:
+        client (:class:`~performline.client.Client`): The client used to read the account.
+
+        path (str): The path of the database file (created if it does not exist), or
+            ``:memory:``.
+
+        page_size (int): The number of records requested per page.
+
+        batch_size (int): The number of records written to the database at a time.
+    """
+
+    page_size = 1000
+    batch_size = 500
+
+    def __init__(self, client, path, page_size=None, batch_size=None):
+        self.client = client
+        self.path = path
+
+        if page_size is not None:
+            self.page_size = page_size
+
+        if batch_size is not None:
+            self.batch_size = batch_size
+
+        self.db = sqlite3.connect(path, check_same_thread=False)
+
+        if path != ':memory:':
+            # lets readers query the snapshot while it is being refreshed
+            self.db.execute('PRAGMA journal_mode=WAL')
+
+        self.create_schema()
+        self.state = StoreSyncState(self.db)
+
+    def create_schema(self):
+        """
+        Creates any tables and indexes that do not exist yet.
+        """
+        self.db.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+
+        for table, (model, columns) in ENTITIES.items():
+            self.db.execute('CREATE TABLE IF NOT EXISTS {0} (id PRIMARY KEY, {1}, data TEXT)'.format(
+                table,
+                ', '.join(column for column, _ in columns)
+            ))
+
+        for table, column in INDEXES:
+            self.db.execute('CREATE INDEX IF NOT EXISTS {0}_{1} ON {0} ({1})'.format(table, column))
+
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+    def load(self, entities=None, **kwargs):
+        """
+        Replaces the stored records with a complete copy read from the server (one paginated pass
+        per entity).  Each entity is replaced in a single transaction, so if reading it fails its
+        previously stored records are kept.
+
+        Args:
+            entities (list, optional): The names of the :data:`ENTITIES` to load.  Defaults to all.
+
+            **kwargs: Passed to :func:`~performline.clients.rest.models.RestModel.iall`; e.g.:
+                ``concurrency``.
+
+        Returns:
+            dict mapping each entity name to the number of records stored.
+        """
+        written = OrderedDict()
+
+        for table in (entities or ENTITIES):
+            with self._transaction():
+                self.db.execute('DELETE FROM {0}'.format(table))
+                self.state.reset(table)
+                written[table] = self._write(table, full=True, **kwargs)
+
+        return written
+
+    def refresh(self, entities=None, full=False, **kwargs):
+        """
+        Updates the stored records with those that are new or have changed on the server.  See:
+        :func:`~performline.sync.Syncer.sync`.  Records deleted on the server are only removed by
+        :func:`load`.
+
+        Args:
+            entities (list, optional): The names of the :data:`ENTITIES` to refresh.  Defaults to
+                all.
+
+            full (bool): Whether to read every record rather than only the part of each result
+                set that follows the records already stored.
+
+            **kwargs: Passed to :func:`~performline.clients.rest.models.RestModel.iall`.
+
+        Returns:
+            dict mapping each entity name to the number of records written.
+        """
+        written = OrderedDict()
+
+        for table in (entities or ENTITIES):
+            with self._transaction():
+                written[table] = self._write(table, full=full, **kwargs)
+
+        return written
+
+    @contextmanager
+    def _transaction(self):
+        """
+        Commits the changes made within the block (including the sync state), or if it fails,
+        rolls them back and reloads the sync state as it was last committed.
+        """
+        try:
+            yield
+        except BaseException:
+            self.db.rollback()
+            self.state = StoreSyncState(self.db)
+            raise
+
+        self.db.commit()
+
+    def _write(self, table, full=False, **kwargs):
+        """
+        Writes the new or changed records of an entity (without committing them), returning the
+        number written.
+        """
+        model, columns = ENTITIES[table]
+        syncer = Syncer(self.client, self.state)
+        endpoint = Endpoint(table, model, params={'limit': self.page_size})
+        statement = 'INSERT OR REPLACE INTO {0} (id, {1}, data) VALUES ({2})'.format(
+            table,
+            ', '.join(column for column, _ in columns),
+            ', '.join('?' * (len(columns) + 2))
+        )
+
+        rows = []
+        written = 0
+
+        # entities are read to the end, however many pages they span
+        kwargs.setdefault('max_iterations', None)
+
+        for record in syncer.sync(endpoint, full=full, compact=True, **kwargs):
+            values = [_column_value(getattr(record, attr)) for _, attr in columns]
+            rows.append([record.pk] + values + [jsonify(record._data)])
+
+            if len(rows) >= self.batch_size:
+                self.db.executemany(statement, rows)
+                written += len(rows)
+                rows = []
+
+        if len(rows):
+            self.db.executemany(statement, rows)
+            written += len(rows)
+
+        return written
+
+    def query(self, table, where=None, params=(), order_by='id'):
+        """
+        Returns the stored records of an entity matching an SQL condition.
+
+        Args:
+            table (str): The name of one of the :data:`ENTITIES`.
+
+            where (str, optional): An SQL expression over the entity's columns.
+
+            params (tuple): Values for the placeholders in ``where``.
+
+            order_by (str): An SQL ``ORDER BY`` clause.
+
+        Returns:
+            list of :class:`~performline.clients.rest.models.CompactModel`
+        """
+        model = ENTITIES[table][0]
+        sql = 'SELECT data FROM {0}'.format(table)
+
+        if where:
+            sql += ' WHERE {0}'.format(where)
+
+        if order_by:
+            sql += ' ORDER BY {0}'.format(order_by)
+
+        return [
+            model.compact_from_result(loads(data))
+            for (data,) in self.db.execute(sql, params)
+        ]
+
+    def count(self, table):
+        """
+        Returns the number of stored records of an entity.
+
+        Returns:
+            int
+        """
+        return self.db.execute('SELECT COUNT(*) FROM {0}'.format(table)).fetchone()[0]
+
+    def brands(self):
+        """
+        Returns the stored brands.
+        """
+        return self.query('brands')
+
+    def campaigns(self, brand=None):
+        """
+        Returns the stored campaigns, optionally only those of the given brand.
+        """
+        if brand is None:
+            return self.query('campaigns')
+
+        return self.query('campaigns', 'brand_id = ?', (brand,))
+
+    def items(self, brand=None, campaign=None, type=None):
+        """
+        Returns the stored items, optionally filtered by brand, campaign and/or type.
+        """
+        conditions = []
+        params = []
+
+        for column, value in (('brand_id', brand), ('campaign_id', campaign), ('type', type)):
+            if value is not None:
+                conditions.append('{0} = ?'.format(column))
+                params.append(value)
+
+        return self.query('items', ' AND '.join(conditions), tuple(params))
+
+    def items_by_campaign(self, campaign):
+        """
+        Returns the stored items of a campaign.
+        """
+        return self.items(campaign=campaign)
+
+    def items_below_score(self, threshold, brand=None, campaign=None):
+        """
+        Returns the stored items whose score is less than ``threshold``, lowest first.  Items
+        that have not been scored are excluded.
+        """
+        conditions = ['score < ?']
+        params = [threshold]
+
+        for column, value in (('brand_id', brand), ('campaign_id', campaign)):
+            if value is not None:
+                conditions.append('{0} = ?'.format(column))
+                params.append(value)
+
+        return self.query('items', ' AND '.join(conditions), tuple(params), order_by='score, id')
+
+    def brand_tree(self, brand=None):
+        """
+        Returns the stored brands with their campaigns, and each campaign's items.
+
+        Args:
+            brand (int, optional): If set, only include the brand with this ID.
+
+        Returns:
+            list of dicts with the keys ``brand`` and ``campaigns``; the latter is a list of dicts
+            with the keys ``campaign`` and ``items``.
+        """
+        if brand is None:
+            brands = self.brands()
+            campaigns = self.campaigns()
+            items = self.items()
+        else:
+            brands = self.query('brands', 'id = ?', (brand,))
+            campaigns = self.campaigns(brand=brand)
+            items = self.items(brand=brand)
+
+        items_by_campaign = {}
+
+        for item in items:
+            items_by_campaign.setdefault(item.campaign_id, []).append(item)
+
+        campaigns_by_brand = {}
+
+        for campaign in campaigns:
+            campaigns_by_brand.setdefault(campaign.brand_id, []).append({
+                'campaign': campaign,
+                'items': items_by_campaign.get(campaign.id, []),
+            })
+
+        return [{
+            'brand': b,
+            'campaigns': campaigns_by_brand.get(b.id, []),
+        } for b in brands]
+
+
+def _column_value(value):
+    # nested values are only available through ``data``
+    if isinstance(value, (dict, list)):
+        return jsonify(value)
+
+    return value
@@ -0,0 +1,339 @@
+# Copyright (c) 2016, PerformLine, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the company nor the
+#       names of its contributors may be used to endorse or promote products
+#       derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL PERFORMLINE, INC. BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+Incremental synchronization of list endpoints.
+
+A :class:`Syncer` remembers, in a local JSON state file, how far it has read each endpoint and a
+fingerprint of every record it has emitted, so that subsequent runs only download the part of a
+result set that may have changed and only emit models that are new or have changed since they
+were last seen.
+
+Example::
+
+    syncer = Syncer(client, 'performline-sync.json')
+
+    for item in syncer.sync('items'):
+        ...
+
+    # a periodic full sweep also picks up changes to records that have already been passed
+    for item in syncer.sync('items', full=True):
+        ...
+
+Records are emitted at least once: the state of an endpoint is only updated (and saved) once it
+has been read to the end, so an interrupted sync re-emits the same records on its next run.
+"""
+from __future__ import absolute_import
+from datetime import datetime
+import hashlib
+import json
+import numbers
+import os
+from .embedded.stdlib.utils.json import jsonify, loads
+from .products.common.models import Brand, Campaign, Rule, TrafficSource, Item
+from .products.web.models import WebPage
+from .products.callcenter.models import Call
+from .products.chatscout.models import Chat
+
+ASCENDING = 'asc'
+DESCENDING = 'desc'
+PAGE_SIZE = 100
+
+
+class Endpoint(object):
+    """
+    Describes how a list endpoint can be read incrementally.
+
+    Args:
+        name (str): The name the endpoint's state is stored under.  Endpoints read with different
+            ``params`` (e.g.: a ``brand`` filter) must have different names.
+
+        model (type): The :class:`~performline.clients.rest.models.RestModel` subclass listed.
+
+        params (dict, optional): Query string parameters included in every request, such as the
+            page size (``limit``).
+
+        order (str): The order in which the server returns records.  With :data:`ASCENDING` (new
+            records are appended to the end of the result set), a sync resumes paging from where
+            the previous one ended, less ``overlap`` records.  With :data:`DESCENDING` (new records
+            come first), a sync stops paging at the first record whose primary key is not greater
+            than the largest one previously seen.
+
+        overlap (int, optional): The number of already-read records to read again when resuming
+            an ascending endpoint, which guards against records having been removed from the
+            earlier part of the result set.  Defaults to the page size (``limit``), or
+            :data:`PAGE_SIZE`.
+
+        timestamp_field (str, optional): A field whose largest value is recorded as the
+            endpoint's watermark (e.g.: ``CreatedAt``).
+
+        timestamp_param (str, optional): A server-side filter that the watermark is passed to,
+            so that only records at or after it are returned (e.g.: ``create_date``).
+    """
+
+    def __init__(
+        self,
+        name,
+        model,
+        params=None,
+        order=ASCENDING,
+        overlap=None,
+        timestamp_field=None,
+        timestamp_param=None
+    ):
+        if order not in (ASCENDING, DESCENDING):
+            raise ValueError('order must be {0!r} or {1!r}'.format(ASCENDING, DESCENDING))
+
+        self.name = name
+        self.model = model
+        self.params = dict(params or {})
+        self.order = order
+        self.timestamp_field = timestamp_field
+        self.timestamp_param = timestamp_param
+
+        if overlap is None:
+            overlap = int(self.params.get('limit', PAGE_SIZE))
+
+        self.overlap = overlap
+
+
+ENDPOINTS = dict((e.name, e) for e in [
+    Endpoint('brands', Brand, params={'limit': PAGE_SIZE}, timestamp_field='CreatedAt',
+             timestamp_param='create_date'),
+    Endpoint('campaigns', Campaign, params={'limit': PAGE_SIZE}),
+    Endpoint('rules', Rule, params={'limit': PAGE_SIZE}),
+    Endpoint('trafficsources', TrafficSource, params={'limit': PAGE_SIZE}),
+    Endpoint('items', Item, params={'limit': PAGE_SIZE}, timestamp_field='CreatedAt'),
+    Endpoint('webpages', WebPage, params={'limit': PAGE_SIZE}, timestamp_field='CreatedAt'),
+    Endpoint('calls', Call, params={'limit': PAGE_SIZE}, timestamp_field='CreatedAt'),
+    Endpoint('chats', Chat, params={'limit': PAGE_SIZE}, timestamp_field='CreatedAt'),
+])
+
+
+class SyncState(object):
+    """
+    The per-endpoint sync state, persisted as a JSON file.
+
+    Args:
+        path (str): The path of the state file.  It is created when first saved.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.endpoints = {}
+
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                self.endpoints = loads(f.read()).get('endpoints', {})
+
+    def get(self, name):
+        """
+        Returns the state of the named endpoint, which is empty if it has never been synced.
+
+        Returns:
+            dict
+        """
+        return self.endpoints.setdefault(name, {})
+
+    def reset(self, name=None):
+        """
+        Discards the state of the named endpoint (or of all endpoints), so that the next sync
+        reads (and emits) everything.
+        """
+        if name is None:
+            self.endpoints.clear()
+        else:
+            self.endpoints.pop(name, None)
+
+    def save(self):
+        """
+        Writes the state file.  The file is replaced atomically, so an interrupted save does not
+        corrupt existing state.
+        """
+        temp = '{0}.tmp'.format(self.path)
+
+        with open(temp, 'w') as f:
+            f.write(jsonify({'endpoints': self.endpoints}))
+
+        getattr(os, 'replace', os.rename)(temp, self.path)
+
+
+class Syncer(object):
+    """
+    Reads endpoints incrementally, emitting only new or changed models.
+
+    Args:
+        client (:class:`~performline.client.Client`): The client used to perform requests.
+
+        state (str, :class:`SyncState`): The sync state, or the path of its state file.
+    """
+
+    def __init__(self, client, state):
+        if not isinstance(state, SyncState):
+            state = SyncState(state)
+
+        self.client = client
+        self.state = state
+
+    def sync(self, endpoint, full=False, params=None, **kwargs):
+        """
+        Iterate over the models of an endpoint that are new or have changed since the last sync.
+
+        Args:
+            endpoint (str, :class:`Endpoint`): The endpoint (or the name of one of
+                :data:`ENDPOINTS`) to read.
+
+            full (bool): Whether to read the entire result set rather than only the part that
+                follows (or precedes) the records already seen.  Only new or changed models are
+                emitted either way.
+
+            params (dict, optional): Query string parameters to add to (or override) those of
+                the endpoint.  Parameters that filter the result set should be given to an
+                :class:`Endpoint` of their own instead, so that its state is kept separately.
+
+            **kwargs: Passed to :func:`~performline.clients.rest.models.RestModel.iall`; e.g.:
+                ``concurrency`` or ``stream``.  Every page is read, however many there are,
+                unless ``max_iterations`` is given.
+
+        Returns:
+            iterator of :class:`~performline.clients.rest.models.RestModel`
+        """
+        if not isinstance(endpoint, Endpoint):
+            endpoint = ENDPOINTS[endpoint]
+
+        # changes are staged, and only merged into the shared state once the endpoint has been
+        # read to the end
+        state = self.state.endpoints.get(endpoint.name, {})
+        fingerprints = state.get('fingerprints', {})
+        changed = {}
+        seen_id = max_id = state.get('max_id')
+        watermark = state.get('watermark')
+        params = dict(endpoint.params, **(params or {}))
+        resume = 'offset' not in params
+        start = 0
+
+        kwargs.setdefault('max_iterations', None)
+
+        if not full:
+            if endpoint.timestamp_param is not None and watermark is not None:
+                params[endpoint.timestamp_param] = watermark
+            elif endpoint.order == ASCENDING and resume:
+                start = max(state.get('offset', 0) - endpoint.overlap, 0)
+
+        if start > 0:
+            params['offset'] = start
+
+        seen = 0
+
+        for instance in endpoint.model.iall(self.client, params=params, **kwargs):
+            pk = instance.pk
+
+            if not full and endpoint.order == DESCENDING and seen_id is not None and \
+                    _comparable(pk) and pk <= seen_id:
+                break
+
+            seen += 1
+            key = record_key(instance)
+            fingerprint = record_fingerprint(instance)
+
+            if _comparable(pk) and (max_id is None or pk > max_id):
+                max_id = pk
+
+            if endpoint.timestamp_field is not None:
+                timestamp = getattr(instance, endpoint.timestamp_field)
+
+                if timestamp is not None and (watermark is None or timestamp > watermark):
+                    watermark = timestamp
+
+            if changed.get(key, fingerprints.get(key)) != fingerprint:
+                changed[key] = fingerprint
+                yield instance
+
+        state = dict(state)
+
+        if endpoint.order == ASCENDING and resume:
+            state['offset'] = start + seen
+
+        if changed:
+            fingerprints = dict(fingerprints)
+            fingerprints.update(changed)
+
+        state['fingerprints'] = fingerprints
+        state['max_id'] = max_id
+        state['watermark'] = watermark
+        state['synced_at'] = datetime.utcnow().isoformat()
+
+        self.state.endpoints[endpoint.name] = state
+        self.state.save()
+
+    def sync_all(self, endpoints=None, full=False, **kwargs):
+        """
+        Sync several endpoints in turn.  See: :func:`sync`.
+
+        Args:
+            endpoints (list, optional): The endpoints (or names of :data:`ENDPOINTS`) to read.
+                Defaults to all of :data:`ENDPOINTS`.
+
+        Returns:
+            iterator of (endpoint name, :class:`~performline.clients.rest.models.RestModel`)
+            tuples.
+        """
+        if endpoints is None:
+            endpoints = sorted(ENDPOINTS)
+
+        for endpoint in endpoints:
+            name = getattr(endpoint, 'name', endpoint)
+
+            for instance in self.sync(endpoint, full=full, **kwargs):
+                yield (name, instance)
+
+
+def record_key(instance):
+    """
+    Returns the key a model's fingerprint is stored under.
+
+    Returns:
+        str
+    """
+    if instance.sk is not None:
+        return '{0}/{1}'.format(instance.pk, instance.sk)
+
+    return str(instance.pk)
+
+
+def record_fingerprint(instance):
+    """
+    Returns a digest of a model's data, which changes whenever any of its values do.  The data
+    is serialized with the standard library's encoder, so the digest does not depend on which
+    JSON backend is installed.
+
+    Returns:
+        str
+    """
+    data = json.dumps(instance._data, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()[:16]
+
+
+def _comparable(pk):
+    return isinstance(pk, numbers.Real) and not isinstance(pk, bool)
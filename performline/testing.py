@@ -25,6 +25,7 @@
 from __future__ import absolute_import
 import os
 from .client import Client
+from .embedded.stdlib.clients.rest.utils import make_response
 
 
 def client():
@@ -43,4 +44,36 @@ def client():
     if prefix is not None:
         c.prefix = prefix
 
-    return c
\ No newline at end of file
+    return c
+
+
+def mock_client(**kwargs):
+    # build a client whose requests are answered by registered mock routes; an http:// URL is
+    # used because requests does not encode query strings into URLs with unknown schemes
+    c = Client('mock', **kwargs)
+    c.mock_init()
+    c.url = 'http://mock.performline.test'
+    c.session.mount(c.url, c._adapter)
+    return c
+
+
+def paginated(results, calls=None, page_size=None):
+    """
+    Returns a mock response callback that serves ``results`` honoring the ``limit`` and
+    ``offset`` query string parameters.  If ``calls`` is a list, the offset of each request
+    will be appended to it.  Requests without a ``limit`` receive ``page_size`` results (or
+    all of them).
+    """
+    def respond(request, context):
+        limit = int(request.qs.get('limit', [page_size or len(results)])[0])
+        offset = int(request.qs.get('offset', [0])[0])
+
+        if isinstance(calls, list):
+            calls.append(offset)
+
+        return make_response(results[offset:offset + limit],
+                             limit=limit,
+                             offset=offset,
+                             total=len(results))
+
+    return respond
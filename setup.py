@@ -43,6 +43,13 @@ setup(
         'six',
         'requests_mock',
     ],
+    extras_require={
+        'async': ['aiohttp'],
+        'streaming': ['ijson'],
+        'export': ['pyarrow', 'numpy'],
+        'analytics': ['numpy'],
+        'tracing': ['opentelemetry-api'],
+    },
     entry_points={
         'console_scripts': [
             'performline=performline.cli:main',